@@ -0,0 +1,278 @@
+import numpy as np
+import shutil
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Callable
+from wktplot.mappers.batch import GlyphBatch
+from wktplot.mappers.osm import OpenStreetMapper, geographic_to_mercator, mercator_to_geographic
+from wktplot.mappers.standard import StandardMapper
+from wktplot.plots.options import OutputOptions
+from wktplot.plots.osm import OpenStreetMapsPlot
+from wktplot.plots.standard import WKTPlot
+
+from .datasets import DATASETS, SEED, write_fixture
+
+
+MAPPERS = {
+    "standard": StandardMapper,
+    "osm": OpenStreetMapper,
+}
+PLOTS = {
+    "standard": WKTPlot,
+    "osm": OpenStreetMapsPlot,
+}
+STYLE_KWARGS = {"color": "navy", "alpha": 0.5}
+
+# The single-shape plot path draws one renderer per shape part, and Bokeh's save time grows faster than linearly
+# with the number of renderers, so it's measured on the first few shapes of each dataset (about 200 renderers).
+SINGLE_PATH_SHAPES = {
+    "points": 200,
+    "long_linestrings": 20,
+    "holey_polygons": 50,
+    "deep_collections": 3,
+    "tessellation": 200,
+}
+
+# Output encodings compared on the saved file size, as keyword arguments of the plot.
+ENCODINGS = {
+    "plain": {},
+    "quantize": {"quantize": 10 ** 5},
+    "topology": {"topology": True},
+    "quantize_topology": {"quantize": 10 ** 5, "topology": True},
+}
+
+
+def get_shapes_per_second(count: int, func: Callable[[], object]) -> float:
+
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+class MapperSuite:
+    """ Coordinate extraction and projection, one shape at a time versus in bulk.
+    """
+
+    params = (list(DATASETS), list(MAPPERS), ["single", "bulk"])
+    param_names = ("dataset", "mapper", "path")
+    timeout = 300
+
+    def setup(self, dataset: str, mapper: str, path: str) -> None:
+        self.shapes = DATASETS[dataset]()
+        self.mapper = MAPPERS[mapper]
+        self.path = path
+
+    def extract(self) -> GlyphBatch:
+
+        batch = GlyphBatch()
+        if self.path == "single":
+            for shape in self.shapes:
+                self.mapper.add_to_batch(batch, shape)
+        else:
+            self.mapper.add_shapes_to_batch(batch, self.shapes)
+
+        batch.get_buffers()
+        return batch
+
+    def time_extract(self, *params: str) -> None:
+        self.extract()
+
+    def peakmem_extract(self, *params: str) -> None:
+        self.extract()
+
+    def track_shapes_per_second(self, *params: str) -> float:
+        return get_shapes_per_second(len(self.shapes), self.extract)
+
+    track_shapes_per_second.unit = "shapes/s"
+
+
+class PlotSuite:
+    """ Full plots, from well-known-text to the saved HTML file, adding shapes one at a time versus in bulk.
+    """
+
+    params = (list(DATASETS), list(PLOTS), ["single", "bulk"])
+    param_names = ("dataset", "plot", "path")
+    timeout = 600
+
+    def setup(self, dataset: str, plot: str, path: str) -> None:
+        self.shapes = DATASETS[dataset]()
+        if path == "single":
+            self.shapes = self.shapes[:SINGLE_PATH_SHAPES[dataset]]
+
+        self.plot_class = PLOTS[plot]
+        self.path = path
+        self.save_dir = Path(tempfile.mkdtemp())
+
+    def teardown(self, *params: str) -> None:
+        shutil.rmtree(self.save_dir, ignore_errors=True)
+
+    def render(self) -> Path:
+
+        plot = self.plot_class("benchmark", save_dir=self.save_dir)
+        if self.path == "single":
+            for shape in self.shapes:
+                plot.add_shape(shape, **STYLE_KWARGS)
+        else:
+            plot.add_shapes(self.shapes, **STYLE_KWARGS)
+
+        return plot.save()
+
+    def time_render(self, *params: str) -> None:
+        self.render()
+
+    def peakmem_render(self, *params: str) -> None:
+        self.render()
+
+    def track_shapes_per_second(self, *params: str) -> float:
+        return get_shapes_per_second(len(self.shapes), self.render)
+
+    track_shapes_per_second.unit = "shapes/s"
+
+    def track_output_bytes(self, *params: str) -> int:
+        return self.render().stat().st_size
+
+    track_output_bytes.unit = "bytes"
+
+
+class EncodingSuite:
+    """ Saving a batched plot of neighbouring polygons with each output encoding.
+    """
+
+    params = (["tessellation", "holey_polygons"], list(ENCODINGS))
+    param_names = ("dataset", "encoding")
+    timeout = 300
+
+    def setup(self, dataset: str, encoding: str) -> None:
+        self.shapes = DATASETS[dataset]()
+        self.save_dir = Path(tempfile.mkdtemp())
+
+    def teardown(self, *params: str) -> None:
+        shutil.rmtree(self.save_dir, ignore_errors=True)
+
+    def render(self, encoding: str) -> Path:
+
+        output = OutputOptions(resources="cdn", **ENCODINGS[encoding])
+        plot = WKTPlot("benchmark", save_dir=self.save_dir, output=output)
+        plot.add_shapes(self.shapes, **STYLE_KWARGS)
+        return plot.save()
+
+    def time_save(self, dataset: str, encoding: str) -> None:
+        self.render(encoding)
+
+    def track_output_bytes(self, dataset: str, encoding: str) -> int:
+        return self.render(encoding).stat().st_size
+
+    track_output_bytes.unit = "bytes"
+
+
+class FileSuite:
+    """ Streaming a line-delimited well-known-text fixture file into a batched plot.
+    """
+
+    params = (list(DATASETS), [None, 2])
+    param_names = ("dataset", "workers")
+    timeout = 300
+
+    def setup_cache(self) -> str:
+
+        # asv runs this once, in a working directory kept until the suite finishes.
+        directory = Path("fixtures").resolve()
+        directory.mkdir(exist_ok=True)
+        for name in DATASETS:
+            write_fixture(name, directory)
+
+        return str(directory)
+
+    def setup(self, directory: str, dataset: str, workers: int) -> None:
+        self.fixture = Path(directory) / f"{dataset}.wkt"
+        self.save_dir = Path(tempfile.mkdtemp())
+
+    def teardown(self, *params: str) -> None:
+        shutil.rmtree(self.save_dir, ignore_errors=True)
+
+    def time_add_file(self, directory: str, dataset: str, workers: int) -> None:
+
+        plot = WKTPlot("benchmark", save_dir=self.save_dir)
+        plot.add_file(self.fixture, chunk_size=1000, workers=workers, **STYLE_KWARGS)
+        plot.save()
+
+
+class StoreSuite:
+    """ Plotting a fixture file with coordinates held in memory versus in a memory-mapped store on disk.
+
+    Only the outputs saved chunk by chunk are measured, i.e. raster and a plain sidecar. The others, including
+    `quantize` and `topology`, reject `store_dir`.
+    """
+
+    params = (list(DATASETS), ["sidecar", "raster"], ["memory", "store"])
+    param_names = ("dataset", "output", "coordinates")
+    timeout = 300
+
+    setup_cache = FileSuite.setup_cache
+
+    def setup(self, directory: str, dataset: str, output: str, coordinates: str) -> None:
+        self.fixture = Path(directory) / f"{dataset}.wkt"
+        self.save_dir = Path(tempfile.mkdtemp())
+
+    def teardown(self, *params: str) -> None:
+        shutil.rmtree(self.save_dir, ignore_errors=True)
+
+    def render(self, output: str, coordinates: str) -> Path:
+
+        kwargs = {"output": OutputOptions(sidecar=True)} if output == "sidecar" else {"render_mode": "raster"}
+        store_dir = self.save_dir if coordinates == "store" else None
+        plot = WKTPlot("benchmark", save_dir=self.save_dir, store_dir=store_dir, **kwargs)
+        plot.add_file(self.fixture, chunk_size=1000, **STYLE_KWARGS)
+        return plot.save()
+
+    def time_render(self, directory: str, dataset: str, output: str, coordinates: str) -> None:
+        self.render(output, coordinates)
+
+    def peakmem_render(self, directory: str, dataset: str, output: str, coordinates: str) -> None:
+        self.render(output, coordinates)
+
+
+class ProjectionSuite:
+    """ Mercator projection of flat coordinate arrays, forward and inverse, into new or preallocated arrays.
+    """
+
+    params = ([10 ** 6, 10 ** 7], ["float64", "float32"])
+    param_names = ("coordinates", "dtype")
+
+    def setup(self, coordinates: int, dtype: str) -> None:
+        rng = np.random.default_rng(SEED)
+        self.lat = rng.uniform(-85.0, 85.0, coordinates)
+        self.lng = rng.uniform(-180.0, 180.0, coordinates)
+        self.merc = geographic_to_mercator(self.lat, self.lng)
+        self.out = np.empty(coordinates, dtype), np.empty(coordinates, dtype)
+        self.dtype = dtype
+
+    def time_geographic_to_mercator(self, *params: object) -> None:
+        geographic_to_mercator(self.lat, self.lng, dtype=self.dtype)
+
+    def time_geographic_to_mercator_out(self, *params: object) -> None:
+        geographic_to_mercator(self.lat, self.lng, out=self.out)
+
+    def time_mercator_to_geographic(self, *params: object) -> None:
+        mercator_to_geographic(*self.merc, dtype=self.dtype)
+
+    def peakmem_geographic_to_mercator_out(self, *params: object) -> None:
+        geographic_to_mercator(self.lat, self.lng, out=self.out)
+
+    def track_coordinates_per_second(self, coordinates: int, dtype: str) -> float:
+        return get_shapes_per_second(coordinates, lambda: geographic_to_mercator(self.lat, self.lng, out=self.out))
+
+    track_coordinates_per_second.unit = "coordinates/s"
+
+
+class ImportSuite:
+    """ Start-up cost of `import wktplot`, measured in a fresh interpreter.
+    """
+
+    def timeraw_import_wktplot(self) -> str:
+        return "import wktplot"
+
+    def timeraw_import_plot(self) -> str:
+        return "from wktplot import WKTPlot"
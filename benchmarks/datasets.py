@@ -0,0 +1,126 @@
+import numpy as np
+import shapely
+
+from pathlib import Path
+from shapely.geometry import GeometryCollection, LineString, Point, Polygon
+from typing import Callable, Dict, List
+
+
+# Every dataset is generated from a fixed seed, so results stay comparable between commits.
+SEED = 20221201
+
+# Coordinates stay within valid latitudes on both axes (the OSM mapper reads x as latitude), so the same shapes
+# can be projected to Mercator.
+COORD_RANGE = (-80.0, 80.0)
+
+
+def get_points(count: int = 2000) -> List[str]:
+    """ Get well-known-text of `count` random points.
+    """
+
+    rng = np.random.default_rng(SEED)
+    coords = _random_coords(rng, count)
+    return [Point(x, y).wkt for x, y in coords]
+
+
+def get_long_linestrings(count: int = 20, vertices: int = 5000) -> List[str]:
+    """ Get well-known-text of `count` random walks of `vertices` vertices each.
+    """
+
+    rng = np.random.default_rng(SEED)
+    lines: List[str] = []
+    for start in _random_coords(rng, count):
+        steps = rng.normal(scale=0.01, size=(vertices, 2))
+        lines.append(LineString(start + np.cumsum(steps, axis=0)).wkt)
+
+    return lines
+
+
+def get_holey_polygons(count: int = 50, holes: int = 100) -> List[str]:
+    """ Get well-known-text of `count` square polygons, each with a grid of `holes` square holes.
+    """
+
+    rng = np.random.default_rng(SEED)
+    side = int(np.ceil(np.sqrt(holes)))
+    polygons: List[str] = []
+    for x, y in _random_coords(rng, count):
+        shell = [(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)]
+        cell = 1 / (side + 1)
+        interiors = [
+            [(x + (i + 0.75) * cell, y + (j + 0.75) * cell), (x + (i + 1.25) * cell, y + (j + 0.75) * cell),
+             (x + (i + 1.25) * cell, y + (j + 1.25) * cell), (x + (i + 0.75) * cell, y + (j + 1.25) * cell)]
+            for i in range(side) for j in range(side)
+        ][:holes]
+        polygons.append(Polygon(shell, interiors).wkt)
+
+    return polygons
+
+
+def get_deep_collections(count: int = 50, depth: int = 20) -> List[str]:
+    """ Get well-known-text of `count` geometry collections, each nested `depth` levels deep with a point, a line
+    and a triangle at every level.
+    """
+
+    rng = np.random.default_rng(SEED)
+    collections: List[str] = []
+    for x, y in _random_coords(rng, count):
+        collection = GeometryCollection()
+        for level in range(depth):
+            offset = level * 0.01
+            collection = GeometryCollection([
+                Point(x + offset, y),
+                LineString([(x, y + offset), (x + 0.5, y + offset)]),
+                Polygon([(x, y), (x + offset + 0.01, y), (x, y + offset + 0.01)]),
+                collection,
+            ])
+        collections.append(collection.wkt)
+
+    return collections
+
+
+def get_tessellation(count: int = 1000, spacing: float = 0.2) -> List[str]:
+    """ Get well-known-text of the `count` Voronoi cells of random points, with a vertex every `spacing` degrees
+    along their borders. Neighbouring cells share their border vertices exactly, like county or census-tract layers.
+    """
+
+    rng = np.random.default_rng(SEED)
+    bounds = shapely.box(COORD_RANGE[0], COORD_RANGE[0], COORD_RANGE[1], COORD_RANGE[1])
+    cells = shapely.voronoi_polygons(shapely.multipoints(_random_coords(rng, count)), extend_to=bounds)
+
+    # Densify the noded borders once, rather than each cell, so neighbours get the same vertices.
+    borders = shapely.union_all(shapely.boundary(shapely.intersection(shapely.get_parts(cells), bounds)))
+    borders = shapely.segmentize(borders, spacing)
+    return [cell.wkt for cell in shapely.get_parts(shapely.polygonize(shapely.get_parts(borders)))]
+
+
+# Synthetic datasets by name, sized so the slower single-shape path still finishes within seconds.
+DATASETS: Dict[str, Callable[[], List[str]]] = {
+    "points": get_points,
+    "long_linestrings": get_long_linestrings,
+    "holey_polygons": get_holey_polygons,
+    "deep_collections": get_deep_collections,
+    "tessellation": get_tessellation,
+}
+
+
+def write_fixture(name: str, directory: Path) -> Path:
+    """ Write the named dataset to a line-delimited well-known-text file, for benchmarking file ingest.
+
+    Args:
+        name (str): Name of the dataset, see `DATASETS`.
+        directory (obj: Path): Directory to write the file to.
+
+    Returns:
+        obj: Path: Path of the written file.
+    """
+
+    path = directory / f"{name}.wkt"
+    if not path.exists():
+        path.write_text("\n".join(DATASETS[name]()))
+
+    return path
+
+
+def _random_coords(rng: np.random.Generator, count: int) -> np.ndarray:
+
+    return rng.uniform(*COORD_RANGE, size=(count, 2))
@@ -1,3 +1,29 @@
-from .plots.standard import WKTPlot  # noqa: F401
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .plots.options import OutputOptions  # noqa: F401
+    from .plots.standard import WKTPlot  # noqa: F401
 
 __version__ = "2.3.3"
+__all__ = ["OutputOptions", "WKTPlot"]
+
+# Plot classes pull in Bokeh, shapely and NumPy, so they're only imported on first access.
+_LAZY_ATTRIBUTES = {
+    "OutputOptions": "wktplot.plots.options",
+    "WKTPlot": "wktplot.plots.standard",
+}
+
+
+def __getattr__(name: str) -> Any:
+
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
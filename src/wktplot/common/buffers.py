@@ -0,0 +1,601 @@
+import numpy as np
+import shapely
+
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+
+COORDINATE_ARRAY = np.ndarray
+COORDINATE_PAIR = Tuple[COORDINATE_ARRAY, COORDINATE_ARRAY]
+
+
+def _as_coords(values: Sequence[float]) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64).reshape(-1)
+
+
+def split_xy(coords: np.ndarray) -> COORDINATE_PAIR:
+    """ Split an (N, 2) coordinate array, e.g. from `shapely.get_coordinates`, into contiguous x, y arrays.
+
+    Both arrays are views into a single transposed copy, so Bokeh can encode them as binary typed arrays.
+
+    Args:
+        coords (obj: np.ndarray): Array of x, y coordinate pairs.
+
+    Returns:
+        tuple[obj: np.ndarray, obj: np.ndarray]: Tuple with contiguous float64 x, y arrays.
+    """
+
+    x, y = np.ascontiguousarray(coords[:, :2].T, dtype=np.float64)
+    return x, y
+
+
+def join_bounds(bounds: Iterable[Tuple[float, float, float, float]]) -> Tuple[float, float, float, float]:
+    """ Get the bounding box of the given bounding boxes, skipping empty (NaN) ones.
+            e.g. [(0, 0, 1, 1), (nan, nan, nan, nan), (2, -1, 3, 0)] --> (0, -1, 3, 1)
+
+    Args:
+        bounds (iterable[tuple[float, float, float, float]]): Bounding boxes as (min x, min y, max x, max y).
+
+    Returns:
+        tuple[float, float, float, float]: Joined bounding box, or NaNs when every box is empty.
+    """
+
+    boxes = np.array(list(bounds), dtype=np.float64).reshape(-1, 4)
+    boxes = boxes[~np.isnan(boxes).any(axis=1)]
+    if not len(boxes):
+        return (np.nan, np.nan, np.nan, np.nan)
+
+    min_x, min_y = boxes[:, :2].min(axis=0)
+    max_x, max_y = boxes[:, 2:].max(axis=0)
+    return (float(min_x), float(min_y), float(max_x), float(max_y))
+
+
+def _offsets(lengths: Sequence[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _group_bounds(x: np.ndarray, y: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    return np.column_stack((
+        np.minimum.reduceat(x, starts),
+        np.minimum.reduceat(y, starts),
+        np.maximum.reduceat(x, starts),
+        np.maximum.reduceat(y, starts),
+    ))
+
+
+# Shapely geometry type ids, see `shapely.get_type_id`.
+POINT_TYPE_ID: int = 0
+LINE_TYPE_IDS: Tuple[int, int] = (1, 2)
+POLYGON_TYPE_ID: int = 3
+MULTIPART_TYPE_IDS: Tuple[int, ...] = (4, 5, 6, 7)
+
+
+def flatten_geometries(geoms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Split multipart geometries and collections into their single-part geometries, in bulk.
+
+    Parts keep the order they would have if every collection was walked depth-first. Empty and missing parts
+    are dropped.
+
+    Args:
+        geoms (obj: np.ndarray): 1D array of shapely geometries.
+
+    Returns:
+        tuple[obj: np.ndarray, obj: np.ndarray]: Single-part geometries, and the index of the given geometry
+            each part came from.
+    """
+
+    parts = np.asarray(geoms, dtype=object)
+    index = np.arange(len(parts), dtype=np.int64)
+
+    while True:
+        multi = np.isin(shapely.get_type_id(parts), MULTIPART_TYPE_IDS)
+        if not multi.any():
+            break
+
+        counts = np.ones(len(parts), dtype=np.int64)
+        counts[multi] = shapely.get_num_geometries(parts[multi])
+        dest = _offsets(counts)[:-1]
+
+        sub_parts, sub_index = shapely.get_parts(parts[multi], return_index=True)
+        sub_rank = np.arange(len(sub_parts)) - _offsets(counts[multi])[sub_index]
+
+        flat = np.empty(counts.sum(), dtype=object)
+        flat[dest[~multi]] = parts[~multi]
+        flat[dest[multi][sub_index] + sub_rank] = sub_parts
+
+        parts, index = flat, np.repeat(index, counts)
+
+    keep = ~(shapely.is_missing(parts) | shapely.is_empty(parts))
+    return parts[keep], index[keep]
+
+
+class GeometryBuffers:
+    """ Flat coordinate buffers for a batch of shapes, split by glyph type.
+
+    Coordinates of each glyph type are held in contiguous float64 arrays, with offset arrays marking where each
+    part starts. Every part keeps the index of the shape it came from, so parts can be grouped back into one
+    Bokeh data source row per shape.
+
+    Attributes:
+        num_shapes (int): Number of shapes stored in the buffers.
+        point_x, point_y (obj: np.ndarray): Point coordinates.
+        point_index (obj: np.ndarray): Shape index of each point.
+        line_x, line_y (obj: np.ndarray): LineString / LinearRing coordinates.
+        line_offsets (obj: np.ndarray): Start offset of each line in `line_x` / `line_y`, plus the total length.
+        line_index (obj: np.ndarray): Shape index of each line.
+        poly_x, poly_y (obj: np.ndarray): Polygon ring coordinates, without the closing coordinate.
+        ring_offsets (obj: np.ndarray): Start offset of each ring in `poly_x` / `poly_y`, plus the total length.
+        ring_index (obj: np.ndarray): Polygon index of each ring, exterior ring first.
+        poly_index (obj: np.ndarray): Shape index of each polygon.
+    """
+
+    # Names of the array attributes, in constructor order.
+    ARRAYS: Tuple[str, ...] = (
+        "point_x", "point_y", "point_index",
+        "line_x", "line_y", "line_offsets", "line_index",
+        "poly_x", "poly_y", "ring_offsets", "ring_index", "poly_index",
+    )
+
+    def __init__(
+        self,
+        num_shapes: int,
+        point_x: np.ndarray,
+        point_y: np.ndarray,
+        point_index: np.ndarray,
+        line_x: np.ndarray,
+        line_y: np.ndarray,
+        line_offsets: np.ndarray,
+        line_index: np.ndarray,
+        poly_x: np.ndarray,
+        poly_y: np.ndarray,
+        ring_offsets: np.ndarray,
+        ring_index: np.ndarray,
+        poly_index: np.ndarray,
+    ) -> None:
+
+        self.num_shapes = num_shapes
+        self.point_x = point_x
+        self.point_y = point_y
+        self.point_index = point_index
+        self.line_x = line_x
+        self.line_y = line_y
+        self.line_offsets = line_offsets
+        self.line_index = line_index
+        self.poly_x = poly_x
+        self.poly_y = poly_y
+        self.ring_offsets = ring_offsets
+        self.ring_index = ring_index
+        self.poly_index = poly_index
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.point_x) + len(self.line_x) + len(self.poly_x)
+
+    @property
+    def num_parts(self) -> int:
+        return len(self.point_index) + len(self.line_index) + len(self.poly_index)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """ Bounding box of every coordinate, as (min x, min y, max x, max y), or NaNs when empty.
+        """
+
+        x = np.concatenate((self.point_x, self.line_x, self.poly_x))
+        y = np.concatenate((self.point_y, self.line_y, self.poly_y))
+        if not len(x):
+            return (np.nan, np.nan, np.nan, np.nan)
+
+        return (float(np.nanmin(x)), float(np.nanmin(y)), float(np.nanmax(x)), float(np.nanmax(y)))
+
+    @classmethod
+    def empty(cls, num_shapes: int = 0) -> "GeometryBuffers":
+        """ Create buffers that hold no coordinates.
+
+        Args:
+            num_shapes (int, default = 0): Number of (empty) shapes the buffers account for.
+
+        Returns:
+            obj: GeometryBuffers: Empty buffers.
+        """
+
+        coords = np.empty(0, dtype=np.float64)
+        index = np.empty(0, dtype=np.int64)
+        offsets = np.zeros(1, dtype=np.int64)
+        return cls(
+            num_shapes,
+            coords, coords, index,
+            coords, coords, offsets, index,
+            coords, coords, offsets, index, index,
+        )
+
+    @classmethod
+    def from_parts(
+        cls,
+        points: Sequence[Tuple[float, float]] = (),
+        lines: Sequence[COORDINATE_PAIR] = (),
+        polygons: Sequence[Tuple[Sequence[np.ndarray], Sequence[np.ndarray]]] = (),
+    ) -> "GeometryBuffers":
+        """ Create buffers for a single shape from the coordinates of its parts.
+
+        Args:
+            points (list[tuple[float, float]]): x, y coordinate of each point.
+            lines (list[tuple[list[float], list[float]]]): x, y coordinates of each line.
+            polygons (list[tuple[list[list[float]], list[list[float]]]]): x, y ring coordinates of each polygon,
+                as returned by `BaseMapper._get_polygon_coords`.
+
+        Returns:
+            obj: GeometryBuffers: Buffers holding one shape.
+        """
+
+        buffers = cls.empty(num_shapes=1)
+
+        if points:
+            point_x, point_y = zip(*points)
+            buffers.point_x = _as_coords(point_x)
+            buffers.point_y = _as_coords(point_y)
+            buffers.point_index = np.zeros(len(points), dtype=np.int64)
+
+        if lines:
+            buffers.line_x = np.concatenate([_as_coords(x) for x, _ in lines])
+            buffers.line_y = np.concatenate([_as_coords(y) for _, y in lines])
+            buffers.line_offsets = _offsets([len(x) for x, _ in lines])
+            buffers.line_index = np.zeros(len(lines), dtype=np.int64)
+
+        if polygons:
+            rings_x: List[np.ndarray] = [_as_coords(x) for xs, _ in polygons for x in xs]
+            rings_y: List[np.ndarray] = [_as_coords(y) for _, ys in polygons for y in ys]
+            buffers.poly_x = np.concatenate(rings_x)
+            buffers.poly_y = np.concatenate(rings_y)
+            buffers.ring_offsets = _offsets([len(x) for x in rings_x])
+            buffers.ring_index = np.repeat(
+                np.arange(len(polygons), dtype=np.int64),
+                [len(xs) for xs, _ in polygons],
+            )
+            buffers.poly_index = np.zeros(len(polygons), dtype=np.int64)
+
+        return buffers
+
+    @classmethod
+    def from_geometries(cls, geoms: np.ndarray) -> "GeometryBuffers":
+        """ Create buffers for an array of shapely geometries using shapely's vectorized functions.
+
+        Args:
+            geoms (obj: np.ndarray): 1D array of shapely geometries, e.g. from `parse_shapes`.
+
+        Returns:
+            obj: GeometryBuffers: Buffers holding one shape per given geometry.
+        """
+
+        buffers = cls.empty(num_shapes=len(geoms))
+        parts, index = flatten_geometries(geoms)
+        type_ids = shapely.get_type_id(parts)
+
+        is_point = type_ids == POINT_TYPE_ID
+        if is_point.any():
+            buffers.point_x, buffers.point_y = split_xy(shapely.get_coordinates(parts[is_point]))
+            buffers.point_index = index[is_point]
+
+        is_line = np.isin(type_ids, LINE_TYPE_IDS)
+        if is_line.any():
+            lines = parts[is_line]
+            buffers.line_x, buffers.line_y = split_xy(shapely.get_coordinates(lines))
+            buffers.line_offsets = _offsets(shapely.get_num_coordinates(lines))
+            buffers.line_index = index[is_line]
+
+        is_polygon = type_ids == POLYGON_TYPE_ID
+        if is_polygon.any():
+            polygons = parts[is_polygon]
+            rings, ring_index = shapely.get_rings(polygons, return_index=True)
+            ring_lengths = shapely.get_num_coordinates(rings)
+            coords = shapely.get_coordinates(rings)
+
+            # Shape coordinates start and end with the same value.
+            # Chop off last coordinate of every ring for Bokeh.
+            keep = np.ones(len(coords), dtype=bool)
+            keep[_offsets(ring_lengths)[1:] - 1] = False
+
+            buffers.poly_x = coords[keep, 0]
+            buffers.poly_y = coords[keep, 1]
+            buffers.ring_offsets = _offsets(ring_lengths - 1)
+            buffers.ring_index = ring_index.astype(np.int64)
+            buffers.poly_index = index[is_polygon]
+
+        return buffers
+
+    @classmethod
+    def concat(cls, buffers_list: Sequence["GeometryBuffers"]) -> "GeometryBuffers":
+        """ Join several buffers into one, renumbering shape, polygon and offset indexes.
+
+        Args:
+            buffers_list (list[obj: GeometryBuffers]): Buffers to join, in order.
+
+        Returns:
+            obj: GeometryBuffers: Joined buffers.
+        """
+
+        if len(buffers_list) == 1:
+            return buffers_list[0]
+
+        if not buffers_list:
+            return cls.empty()
+
+        # Shifts are applied once to the joined arrays, not per chunk, so joining many small buffers stays fast.
+        def join(attr: str) -> np.ndarray:
+            return np.concatenate([getattr(b, attr) for b in buffers_list])
+
+        def chunk_shifts(counts: List[int]) -> np.ndarray:
+            return _offsets(counts)[:-1]
+
+        def join_shifted(attr: str, shifts: np.ndarray) -> np.ndarray:
+            arrays = [getattr(b, attr) for b in buffers_list]
+            return np.concatenate(arrays) + np.repeat(shifts, [len(values) for values in arrays])
+
+        def join_offsets(attr: str, shifts: np.ndarray) -> np.ndarray:
+            # Every chunk's offsets start with 0, only the first chunk keeps it.
+            joined = join_shifted(attr, shifts)
+            keep = np.ones(len(joined), dtype=bool)
+            keep[chunk_shifts([len(getattr(b, attr)) for b in buffers_list])[1:]] = False
+            return joined[keep]
+
+        shape_shift = chunk_shifts([b.num_shapes for b in buffers_list])
+        poly_index = join_shifted("poly_index", shape_shift)
+
+        return cls(
+            int(sum(b.num_shapes for b in buffers_list)),
+            join("point_x"),
+            join("point_y"),
+            join_shifted("point_index", shape_shift),
+            join("line_x"),
+            join("line_y"),
+            join_offsets("line_offsets", chunk_shifts([len(b.line_x) for b in buffers_list])),
+            join_shifted("line_index", shape_shift),
+            join("poly_x"),
+            join("poly_y"),
+            join_offsets("ring_offsets", chunk_shifts([len(b.poly_x) for b in buffers_list])),
+            join_shifted("ring_index", chunk_shifts([len(b.poly_index) for b in buffers_list])),
+            poly_index,
+        )
+
+    def map_coords(self, func: Callable[[np.ndarray, np.ndarray], COORDINATE_PAIR]) -> "GeometryBuffers":
+        """ Apply the given coordinate transform to every coordinate, in a single call.
+
+        Args:
+            func (callable): Function taking flat x, y arrays and returning transformed x, y arrays.
+
+        Returns:
+            obj: GeometryBuffers: New buffers with transformed coordinates, sharing the index arrays.
+        """
+
+        lengths = (len(self.point_x), len(self.line_x), len(self.poly_x))
+        x, y = func(
+            np.concatenate((self.point_x, self.line_x, self.poly_x)),
+            np.concatenate((self.point_y, self.line_y, self.poly_y)),
+        )
+        x_parts = np.split(np.asarray(x, dtype=np.float64), np.cumsum(lengths)[:-1])
+        y_parts = np.split(np.asarray(y, dtype=np.float64), np.cumsum(lengths)[:-1])
+
+        return GeometryBuffers(
+            self.num_shapes,
+            x_parts[0], y_parts[0], self.point_index,
+            x_parts[1], y_parts[1], self.line_offsets, self.line_index,
+            x_parts[2], y_parts[2], self.ring_offsets, self.ring_index, self.poly_index,
+        )
+
+    def split(self) -> List["GeometryBuffers"]:
+        """ Split the buffers into one set of buffers per shape, the inverse of `concat`.
+
+        Returns:
+            list[obj: GeometryBuffers]: Buffers holding one shape each, with copied (not shared) arrays.
+        """
+
+        if not self.num_shapes:
+            return []
+
+        shapes = np.arange(self.num_shapes + 1)
+        point_bounds = np.searchsorted(self.point_index, shapes)
+        line_bounds = np.searchsorted(self.line_index, shapes)
+        poly_bounds = np.searchsorted(self.poly_index, shapes)
+        ring_bounds = np.searchsorted(self.ring_index, poly_bounds)
+        line_coord_bounds = self.line_offsets[line_bounds]
+        poly_coord_bounds = self.ring_offsets[ring_bounds]
+
+        def split_at(values: np.ndarray, bounds: np.ndarray) -> List[np.ndarray]:
+            bounds = bounds.tolist()
+            return [values[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+        def split_copies(values: np.ndarray, bounds: np.ndarray) -> List[np.ndarray]:
+            bounds = bounds.tolist()
+            return [values[start:end].copy() for start, end in zip(bounds[:-1], bounds[1:])]
+
+        def split_offsets(offsets: np.ndarray, part_bounds: np.ndarray, coord_bounds: np.ndarray) -> List[np.ndarray]:
+            # Shape `s` gets the offsets of its parts relative to its first coordinate, plus its total length.
+            parts_per_shape = np.diff(part_bounds)
+            local = np.empty(len(offsets) - 1 + self.num_shapes, dtype=np.int64)
+            dest = np.arange(len(offsets) - 1) + np.repeat(np.arange(self.num_shapes), parts_per_shape)
+            local[dest] = offsets[:-1] - np.repeat(coord_bounds[:-1], parts_per_shape)
+            local[part_bounds[1:] + np.arange(self.num_shapes)] = np.diff(coord_bounds)
+            return split_at(local, part_bounds + np.arange(self.num_shapes + 1))
+
+        # Every shape index becomes 0, and ring indexes count from each shape's first polygon.
+        columns = zip(
+            split_copies(self.point_x, point_bounds),
+            split_copies(self.point_y, point_bounds),
+            split_at(np.zeros_like(self.point_index), point_bounds),
+            split_copies(self.line_x, line_coord_bounds),
+            split_copies(self.line_y, line_coord_bounds),
+            split_offsets(self.line_offsets, line_bounds, line_coord_bounds),
+            split_at(np.zeros_like(self.line_index), line_bounds),
+            split_copies(self.poly_x, poly_coord_bounds),
+            split_copies(self.poly_y, poly_coord_bounds),
+            split_offsets(self.ring_offsets, ring_bounds, poly_coord_bounds),
+            split_at(self.ring_index - poly_bounds[self.poly_index[self.ring_index]], ring_bounds),
+            split_at(np.zeros_like(self.poly_index), poly_bounds),
+        )
+
+        return [GeometryBuffers(1, *arrays) for arrays in columns]
+
+    def take(self, shapes: Sequence[int]) -> "GeometryBuffers":
+        """ Gather the given shapes into new buffers, in the given order, in a single vectorized pass.
+                e.g. take([2, 0]) --> buffers holding shape 2 then shape 0
+
+        Args:
+            shapes (list[int]): Index of each shape to gather, can repeat.
+
+        Returns:
+            obj: GeometryBuffers: Buffers holding one shape per given index, or these buffers when every shape is
+                taken in order.
+        """
+
+        shapes = np.asarray(shapes, dtype=np.int64)
+        if len(shapes) == self.num_shapes and np.array_equal(shapes, np.arange(self.num_shapes)):
+            return self
+
+        bounds = np.arange(self.num_shapes + 1)
+        point_bounds = np.searchsorted(self.point_index, bounds)
+        line_bounds = np.searchsorted(self.line_index, bounds)
+        poly_bounds = np.searchsorted(self.poly_index, bounds)
+        ring_bounds = np.searchsorted(self.ring_index, np.arange(len(self.poly_index) + 1))
+
+        def gather(bounds: np.ndarray, selected: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            # Positions of every item of the selected groups, and the number of items per selected group.
+            starts, counts = bounds[:-1][selected], np.diff(bounds)[selected]
+            shifts = np.repeat(starts - _offsets(counts)[:-1], counts)
+            return np.arange(len(shifts), dtype=np.int64) + shifts, counts
+
+        def renumber(counts: np.ndarray) -> np.ndarray:
+            return np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+
+        points, point_counts = gather(point_bounds, shapes)
+        lines, line_counts = gather(line_bounds, shapes)
+        line_coords, line_lengths = gather(self.line_offsets, lines)
+        polygons, poly_counts = gather(poly_bounds, shapes)
+        rings, ring_counts = gather(ring_bounds, polygons)
+        ring_coords, ring_lengths = gather(self.ring_offsets, rings)
+
+        return GeometryBuffers(
+            len(shapes),
+            self.point_x[points], self.point_y[points], renumber(point_counts),
+            self.line_x[line_coords], self.line_y[line_coords], _offsets(line_lengths), renumber(line_counts),
+            self.poly_x[ring_coords], self.poly_y[ring_coords], _offsets(ring_lengths), renumber(ring_counts),
+            renumber(poly_counts),
+        )
+
+    def line_geometries(self) -> np.ndarray:
+        """ Rebuild one shapely LineString per line in the buffers.
+
+        Returns:
+            obj: np.ndarray: Object array of LineStrings, aligned with `line_index`.
+        """
+
+        if not len(self.line_index):
+            return np.empty(0, dtype=object)
+
+        indices = np.repeat(np.arange(len(self.line_index)), np.diff(self.line_offsets))
+        return shapely.linestrings(np.column_stack((self.line_x, self.line_y)), indices=indices)
+
+    def polygon_geometries(self) -> np.ndarray:
+        """ Rebuild one shapely Polygon per polygon in the buffers, re-closing every ring.
+
+        Returns:
+            obj: np.ndarray: Object array of Polygons, aligned with `poly_index`.
+        """
+
+        if not len(self.poly_index):
+            return np.empty(0, dtype=object)
+
+        starts, ends = self.ring_offsets[:-1], self.ring_offsets[1:]
+        coords = np.column_stack((self.poly_x, self.poly_y))
+        closed = np.insert(coords, ends, coords[starts], axis=0)
+        ring_ids = np.repeat(np.arange(len(starts)), ends - starts + 1)
+
+        rings = shapely.linearrings(closed, indices=ring_ids)
+        return shapely.polygons(rings, indices=self.ring_index)
+
+    def line_row_bounds(self) -> np.ndarray:
+        """ Bounding box of the lines of each `line_rows` row.
+
+        Returns:
+            obj: np.ndarray: (rows, 4) array of (min x, min y, max x, max y).
+        """
+
+        if not len(self.line_index):
+            return np.empty((0, 4))
+
+        row_start = np.r_[True, self.line_index[1:] != self.line_index[:-1]]
+        return _group_bounds(self.line_x, self.line_y, self.line_offsets[:-1][row_start])
+
+    def polygon_row_bounds(self) -> np.ndarray:
+        """ Bounding box of the polygons of each `polygon_rows` row.
+
+        Returns:
+            obj: np.ndarray: (rows, 4) array of (min x, min y, max x, max y).
+        """
+
+        if not len(self.poly_index):
+            return np.empty((0, 4))
+
+        row_start = np.r_[True, self.poly_index[1:] != self.poly_index[:-1]]
+        first_ring = _offsets(np.bincount(self.ring_index, minlength=len(self.poly_index)))[:-1]
+        return _group_bounds(self.poly_x, self.poly_y, self.ring_offsets[first_ring[row_start]])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def line_rows(self) -> Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]]:
+        """ Group lines into one `multi_line` row per shape, separating the lines of a shape with NaN.
+
+        Returns:
+            tuple[obj: np.ndarray, list[obj: np.ndarray], list[obj: np.ndarray]]: Shape index of each row, and the
+                x, y coordinates of each row as views into one flat buffer.
+        """
+
+        if not len(self.line_index):
+            return np.empty(0, dtype=np.int64), [], []
+
+        lengths = np.diff(self.line_offsets)
+        row_start = np.r_[True, self.line_index[1:] != self.line_index[:-1]]
+        rows = self.line_index[row_start]
+        row_of_line = np.cumsum(row_start) - 1
+
+        # Each line is shifted right by the number of NaN separators placed before it.
+        line_shift = np.arange(len(lengths)) - row_of_line
+        coord_dest = np.arange(len(self.line_x)) + np.repeat(line_shift, lengths)
+
+        size = len(self.line_x) + len(lengths) - len(rows)
+        x = np.full(size, np.nan)
+        y = np.full(size, np.nan)
+        x[coord_dest] = self.line_x
+        y[coord_dest] = self.line_y
+
+        split_at = (self.line_offsets[:-1] + line_shift)[row_start][1:]
+        return rows, np.split(x, split_at), np.split(y, split_at)
+
+    def polygon_rows(self) -> Tuple[np.ndarray, List[List[List[np.ndarray]]], List[List[List[np.ndarray]]]]:
+        """ Group polygons into one `multi_polygons` row per shape.
+
+        Returns:
+            tuple[obj: np.ndarray, list, list]: Shape index of each row, and the nested
+                row -> polygon -> ring x, y coordinates, with rings as views into the flat buffers.
+        """
+
+        if not len(self.poly_index):
+            return np.empty(0, dtype=np.int64), [], []
+
+        ring_x = np.split(self.poly_x, self.ring_offsets[1:-1])
+        ring_y = np.split(self.poly_y, self.ring_offsets[1:-1])
+        poly_bounds = _offsets(np.bincount(self.ring_index, minlength=len(self.poly_index)))
+
+        poly_x = [ring_x[start:end] for start, end in zip(poly_bounds[:-1], poly_bounds[1:])]
+        poly_y = [ring_y[start:end] for start, end in zip(poly_bounds[:-1], poly_bounds[1:])]
+
+        row_start = np.r_[True, self.poly_index[1:] != self.poly_index[:-1]]
+        rows = self.poly_index[row_start]
+        row_bounds = np.r_[np.flatnonzero(row_start), len(self.poly_index)]
+
+        xs = [poly_x[start:end] for start, end in zip(row_bounds[:-1], row_bounds[1:])]
+        ys = [poly_y[start:end] for start, end in zip(row_bounds[:-1], row_bounds[1:])]
+        return rows, xs, ys
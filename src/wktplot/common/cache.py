@@ -0,0 +1,321 @@
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+from itertools import chain
+from pathlib import Path
+from shapely.geometry.base import BaseGeometry
+from threading import RLock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.parallel import extract_buffers
+
+
+DEFAULT_CACHE_BYTES: int = 256 * 1024 * 1024
+
+# Approximate memory held by each packed entry besides its coordinates, i.e. its array objects, and by each cached
+# shape besides its coordinates, i.e. its hex key and index entry. Counted in `nbytes`, so many tiny shapes can not
+# hold far more memory than `max_bytes`.
+ENTRY_OVERHEAD_BYTES: int = 2048
+SHAPE_OVERHEAD_BYTES: int = 200
+
+
+class GeometryCache:
+    """ Least-recently-used cache of projected coordinate buffers, keyed by raw shape input.
+
+    Entries are keyed by a hash of each shape's well-known-text / well-known-binary bytes and the mapper class
+    that projected it, so the same shape plotted with and without Mercator projection is cached twice. Shapely
+    objects and missing shapes are never cached. The cache can be shared between threads, which parse and project
+    their uncached shapes concurrently.
+
+    Shapes projected together are cached as one packed entry, so a chunk of shapes that's plotted again is served
+    as a single slice of that entry instead of being joined back shape by shape. Entries are evicted as a whole.
+
+    Attributes:
+        max_bytes (int): Upper bound on the memory held by the cache, in bytes.
+        path (obj: Path | None): Optional file the cache is loaded from and saved to.
+        nbytes (int): Approximate memory held by the cache, i.e. its coordinate arrays plus per-entry and per-shape
+            overhead, in bytes.
+        hits (int): Number of shapes found in the cache.
+        misses (int): Number of shapes parsed and projected because they were not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, path: Optional[Union[str, Path]] = None) -> None:
+        """ Create a cache, loading previously saved entries from `path` when it exists.
+
+        Args:
+            max_bytes (int, default = 256 MiB): Upper bound on the memory held by the cache, in bytes. Least
+                recently used entries are evicted first.
+            path (str | obj: Path | None, default = None): Optional `.npz` file to persist entries to, see `save`.
+
+        Raises:
+            ValueError: When given `max_bytes` is not a positive integer.
+        """
+
+        if max_bytes < 1:
+            raise ValueError(f"Given argument `max_bytes` is not a positive integer. [{max_bytes}]")
+
+        self.max_bytes = max_bytes
+        self.path = Path(path) if path is not None else None
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[GeometryBuffers, List[str], int]]" = OrderedDict()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._next_entry = 0
+        self._lock = RLock()
+
+        if self.path is not None and self.path.is_file():
+            self.load(self.path)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """ Hit / miss counters and current size of the cache.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._index),
+            "nbytes": self.nbytes,
+        }
+
+    @staticmethod
+    def get_key(value: Union[str, bytes], mapper: type, format: Optional[str] = None) -> str:
+        """ Get the cache key of a raw shape projected by the given mapper.
+
+        Args:
+            value (str | bytes): Well-known-text string or well-known-binary bytes of the shape.
+            mapper (type): Mapper class projecting the shape, e.g. `OpenStreetMapper`.
+            format (str | None, default = None): File format the value was read from, see `parse_values`.
+
+        Returns:
+            str: Hex digest identifying the shape and mapper.
+        """
+
+        return GeometryCache._get_keys([value], mapper, format)[0]
+
+    def get(self, key: str) -> Optional[GeometryBuffers]:
+        """ Get the buffers cached under `key`, marking their entry as recently used.
+
+        Args:
+            key (str): Cache key, see `get_key`.
+
+        Returns:
+            obj: GeometryBuffers | None: Buffers holding one shape, or None when not cached.
+        """
+
+        with self._lock:
+            found = self._index.get(key)
+            if found is None:
+                return None
+
+            entry, row = found
+            self._entries.move_to_end(entry)
+            return self._entries[entry][0].take([row])
+
+    def put(self, keys: Sequence[str], buffers: GeometryBuffers) -> None:
+        """ Cache the given buffers as one packed entry, shape `i` under `keys[i]`, evicting least recently used
+        entries to make room.
+
+        Entries larger than `max_bytes` are not cached.
+
+        Args:
+            keys (list[str]): Cache key of each shape, see `get_key`.
+            buffers (obj: GeometryBuffers): Buffers holding one shape per key.
+        """
+
+        nbytes = buffers.nbytes + ENTRY_OVERHEAD_BYTES + SHAPE_OVERHEAD_BYTES * len(keys)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            entry = self._next_entry
+            self._next_entry += 1
+
+            self._entries[entry] = (buffers, list(keys), nbytes)
+            self._index.update((key, (entry, row)) for row, key in enumerate(keys))
+            self.nbytes += nbytes
+
+            while self.nbytes > self.max_bytes:
+                evicted, (_, evicted_keys, evicted_nbytes) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+
+                # Shapes cached again since live in a newer entry.
+                for key in evicted_keys:
+                    if self._index.get(key, (None,))[0] == evicted:
+                        del self._index[key]
+
+    def get_buffers(self, mapper: type, shapes: Iterable[Any], format: Optional[str] = None) -> GeometryBuffers:
+        """ Get the projected coordinate buffers of the given shapes, parsing and projecting only uncached ones.
+
+        Uncached shapes are parsed and projected together in one vectorized call, then cached as one packed entry.
+        Shapes found in the cache are gathered with one slice per entry they're cached in.
+
+        Args:
+            mapper (type): Mapper class used to project the coordinates, e.g. `StandardMapper`.
+            shapes (iterable): Well-known-text strings, well-known-binary bytes or shapely objects, or raw strings
+                read from a file of the given `format`.
+            format (str | None, default = None): File format of raw `shapes`, see `parse_values`.
+
+        Returns:
+            obj: GeometryBuffers: Projected coordinate buffers, one shape per given shape.
+
+        Raises:
+            TypeError: When any of the given `shapes` is of an unsupported type.
+        """
+
+        if isinstance(shapes, (str, bytes, BaseGeometry)):
+            shapes = [shapes]
+
+        values = self._as_values(shapes)
+        if not len(values):
+            return GeometryBuffers.empty()
+
+        keys = self._get_keys(values, mapper, format)
+
+        sources: List[GeometryBuffers] = []
+        source_of = np.empty(len(values), dtype=np.int64)
+        rows = np.empty(len(values), dtype=np.int64)
+
+        # Only lookups and updates hold the lock, so threads sharing the cache parse and project concurrently.
+        with self._lock:
+            found = [self._index.get(key) for key in keys]
+
+            for entry in dict.fromkeys(hit[0] for hit in found if hit is not None):
+                self._entries.move_to_end(entry)
+
+            hit_positions = [position for position, hit in enumerate(found) if hit is not None]
+            if hit_positions:
+                hit_entries, hit_rows = np.array([found[position] for position in hit_positions], dtype=np.int64).T
+                entries, source_of[hit_positions] = np.unique(hit_entries, return_inverse=True)
+                rows[hit_positions] = hit_rows
+                sources += [self._entries[entry][0] for entry in entries.tolist()]
+                self.hits += len(hit_positions)
+
+        # Shapes repeated within the same call are only parsed once.
+        missed: Dict[Optional[str], List[int]] = {}
+        for position, key in enumerate(keys):
+            if found[position] is None:
+                missed.setdefault(key, []).append(position)
+
+        uncached = [positions for key, positions in missed.items() if key is not None]
+        uncached += [[position] for position in missed.get(None, [])]
+
+        if uncached:
+            # Threads racing on the same shape may both extract it, the later entry wins.
+            first = np.array([positions[0] for positions in uncached], dtype=np.int64)
+            extracted = extract_buffers(mapper, values[first], format)
+
+            counts = [len(positions) for positions in uncached]
+            missed_positions = np.fromiter(chain.from_iterable(uncached), dtype=np.int64, count=sum(counts))
+            source_of[missed_positions] = len(sources)
+            rows[missed_positions] = np.repeat(np.arange(len(uncached)), counts)
+
+            cached = [row for row, positions in enumerate(uncached) if keys[positions[0]] is not None]
+            if cached:
+                with self._lock:
+                    self.put([keys[uncached[row][0]] for row in cached], extracted.take(cached))
+                    self.misses += len(cached)
+                    self.hits += sum(len(uncached[row]) - 1 for row in cached)
+
+            sources.append(extracted)
+
+        if len(sources) == 1:
+            return sources[0].take(rows)
+
+        # Gather each source's rows once, then put the shapes back in the given order.
+        order = np.argsort(source_of, kind="stable")
+        gathered = GeometryBuffers.concat([
+            source.take(rows[source_of == index]) for index, source in enumerate(sources)
+        ])
+        return gathered.take(np.argsort(order, kind="stable"))
+
+    def clear(self) -> None:
+        """ Drop every cached entry and reset the hit / miss counters.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """ Write every cached entry to a single `.npz` file, so the cache survives process restarts.
+
+        Args:
+            path (str | obj: Path | None, default = None): File to write to, used as given without adding a suffix.
+                Defaults to the cache's `path`.
+
+        Raises:
+            ValueError: When neither `path` nor the cache's `path` is set.
+        """
+
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("Given argument `path` is not set, and the cache has no `path`.")
+
+        keys: List[str] = []
+        entries: List[GeometryBuffers] = []
+        with self._lock:
+            for entry, (buffers, entry_keys, _) in self._entries.items():
+                live = [row for row, key in enumerate(entry_keys) if self._index.get(key) == (entry, row)]
+                keys += [entry_keys[row] for row in live]
+                entries.append(buffers.take(live))
+
+        joined = GeometryBuffers.concat(entries)
+        arrays = {name: getattr(joined, name) for name in GeometryBuffers.ARRAYS}
+        sizes = np.array([buffers.num_shapes for buffers in entries], dtype=np.int64)
+        # Written through a file handle, as `np.savez` would otherwise add a ".npz" suffix the cache doesn't load.
+        with open(path, "wb") as file:
+            np.savez(file, keys=np.array(keys, dtype=str), entry_sizes=sizes, **arrays)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """ Add the entries saved to the given `.npz` file, see `save`.
+
+        Args:
+            path (str | obj: Path): File to read from.
+        """
+
+        with np.load(path) as data:
+            keys = data["keys"].tolist()
+            sizes = data["entry_sizes"].tolist()
+            joined = GeometryBuffers(len(keys), *(data[name] for name in GeometryBuffers.ARRAYS))
+
+        start = 0
+        for size in sizes:
+            self.put(keys[start:start + size], joined.take(np.arange(start, start + size)))
+            start += size
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    @staticmethod
+    def _get_keys(values: Iterable[Any], mapper: type, format: Optional[str]) -> List[Optional[str]]:
+
+        prefix = hashlib.blake2b(digest_size=16)
+        prefix.update(f"{mapper.__module__}.{mapper.__qualname__}:{format}:".encode())
+
+        keys: List[Optional[str]] = []
+        for value in values:
+            if not isinstance(value, (str, bytes)):
+                keys.append(None)
+                continue
+
+            digest = prefix.copy()
+            digest.update(value.encode() if isinstance(value, str) else value)
+            keys.append(digest.hexdigest())
+
+        return keys
+
+    @staticmethod
+    def _as_values(shapes: Iterable[Any]) -> np.ndarray:
+
+        if not isinstance(shapes, np.ndarray):
+            shapes = list(shapes)
+
+        values = np.empty(len(shapes), dtype=object)
+        values[:] = shapes
+        return values
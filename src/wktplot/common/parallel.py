@@ -0,0 +1,124 @@
+import numpy as np
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.parsing import parse_shapes
+from wktplot.common.readers import parse_values
+
+
+T = TypeVar("T")
+
+
+def iter_chunks(values: Iterable[Any], chunk_size: int) -> Iterator[np.ndarray]:
+    """ Split the given `values` into object arrays of at most `chunk_size` items, without materializing them all.
+
+    Args:
+        values (iterable): Values to split.
+        chunk_size (int): Maximum number of values per chunk.
+
+    Yields:
+        obj: np.ndarray: 1D object array with the next chunk of values.
+    """
+
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        yield _to_object_array(chunk)
+
+
+async def aiter_chunks(
+    values: Union[AsyncIterable[Any], Iterable[Any]],
+    chunk_size: int,
+) -> AsyncIterator[np.ndarray]:
+    """ Split the given async or regular iterable into object arrays of at most `chunk_size` items.
+
+    Values are only pulled from `values` while a chunk is being filled, so a slow consumer holds back the producer.
+
+    Args:
+        values (async iterable | iterable): Values to split.
+        chunk_size (int): Maximum number of values per chunk.
+
+    Yields:
+        obj: np.ndarray: 1D object array with the next chunk of values.
+    """
+
+    if not hasattr(values, "__aiter__"):
+        for chunk in iter_chunks(values, chunk_size):
+            yield chunk
+        return
+
+    chunk: List[Any] = []
+    async for value in values:
+        chunk.append(value)
+        if len(chunk) == chunk_size:
+            yield _to_object_array(chunk)
+            chunk = []
+
+    if chunk:
+        yield _to_object_array(chunk)
+
+
+def extract_buffers(mapper: type, values: np.ndarray, format: Optional[str] = None) -> GeometryBuffers:
+    """ Parse the given shapes and extract their projected coordinate buffers. Runs inside worker processes.
+
+    Args:
+        mapper (type): Mapper class used to project the coordinates, e.g. `StandardMapper`.
+        values (obj: np.ndarray): Shapes to parse, see `parse_shapes`, or raw strings read from a file.
+        format (str | None, default = None): File format of raw `values`, see `parse_values`.
+
+    Returns:
+        obj: GeometryBuffers: Projected coordinate buffers of the given shapes.
+    """
+
+    geoms = parse_shapes(values) if format is None else parse_values(values, format)
+    return mapper.get_buffers(geoms)
+
+
+def iter_extract_buffers(
+    mapper: type,
+    chunks: Iterable[Tuple[np.ndarray, T]],
+    workers: int,
+    format: Optional[str] = None,
+) -> Iterator[Tuple[GeometryBuffers, T]]:
+    """ Extract coordinate buffers for each chunk of shapes on a pool of `workers` processes.
+
+    Results are yielded in input order. At most two chunks per worker are in flight at once, so memory stays
+    bounded when `chunks` is a stream.
+
+    Args:
+        mapper (type): Mapper class used to project the coordinates, e.g. `StandardMapper`.
+        chunks (iterable[tuple[obj: np.ndarray, Any]]): Chunks of shapes, each paired with a value passed through
+            to the result unchanged (e.g. the chunk's style columns).
+        workers (int): Number of worker processes.
+        format (str | None, default = None): File format of raw chunk values, see `parse_values`.
+
+    Yields:
+        tuple[obj: GeometryBuffers, Any]: Coordinate buffers of each chunk, with its passed-through value.
+    """
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Tuple[Future, T]] = deque()
+
+        for values, extra in chunks:
+            pending.append((executor.submit(extract_buffers, mapper, values, format), extra))
+
+            if len(pending) >= 2 * workers:
+                future, extra = pending.popleft()
+                yield future.result(), extra
+
+        while pending:
+            future, extra = pending.popleft()
+            yield future.result(), extra
+
+
+def _to_object_array(values: List[Any]) -> np.ndarray:
+
+    values_arr = np.empty(len(values), dtype=object)
+    values_arr[:] = values
+    return values_arr
@@ -0,0 +1,54 @@
+import numpy as np
+import shapely
+
+from shapely.geometry.base import BaseGeometry
+from typing import Iterable, Union
+
+
+SHAPE_INPUT = Union[str, bytes, BaseGeometry]
+
+
+def parse_shapes(shapes: Union[SHAPE_INPUT, Iterable[SHAPE_INPUT], np.ndarray]) -> np.ndarray:
+    """ Parse the given well-known-text strings, well-known-binary bytes and shapely objects in bulk.
+            e.g. ["POINT (1 2)", Point(3, 4), b"\\x01\\x01..."] --> array([<POINT (1 2)>, <POINT (3 4)>, ...])
+
+    Strings and bytes are parsed with shapely's vectorized `from_wkt` / `from_wkb`, so no Python call is made per
+    shape. `None` values are kept as missing shapes.
+
+    Args:
+        shapes (str | bytes | obj: BaseGeometry | iterable | obj: np.ndarray): Shape or shapes to parse.
+
+    Returns:
+        obj: np.ndarray: 1D object array of shapely geometries.
+
+    Raises:
+        TypeError: When any of the given `shapes` is of an unsupported type.
+    """
+
+    if isinstance(shapes, (str, bytes, BaseGeometry)):
+        shapes = [shapes]
+
+    if not isinstance(shapes, np.ndarray):
+        shapes = list(shapes)
+
+    values = np.empty(len(shapes), dtype=object)
+    values[:] = shapes
+
+    types = np.frompyfunc(type, 1, 1)(values)
+    is_str = types == str
+    is_bytes = types == bytes
+    is_geom = shapely.is_geometry(values)
+    is_missing = shapely.is_missing(values)
+
+    unsupported = ~(is_str | is_bytes | is_geom | is_missing)
+    if unsupported.any():
+        raise TypeError(
+            f"Given argument `shapes` contains an unsupported type [{values[unsupported][0].__class__.__name__}]"
+        )
+
+    geoms = np.empty(len(values), dtype=object)
+    geoms[is_geom] = values[is_geom]
+    geoms[is_str] = shapely.from_wkt(values[is_str])
+    geoms[is_bytes] = shapely.from_wkb(values[is_bytes])
+
+    return geoms
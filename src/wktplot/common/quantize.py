@@ -0,0 +1,64 @@
+import numpy as np
+
+from typing import Tuple
+
+
+# Largest number of grid steps, so every delta between steps fits an int32.
+MAX_QUANTIZE_STEPS: int = 2 ** 31 - 1
+
+
+def quantize_coords(values: np.ndarray, steps: int) -> Tuple[np.ndarray, float, float, np.ndarray]:
+    """ Quantize coordinates to a grid spanning their bounds, and delta-encode them.
+            e.g. ([10.0, 10.5, 11.0], steps 3) --> (int16 [0, 1, 1], 10.0, 0.5, [])
+
+    Coordinates snap to the nearest of `steps` evenly spaced values between their minimum and maximum, so the
+    error is at most half a step. The first coordinate is stored as its grid step, and every other coordinate as
+    the difference from the previous one, which is small for nearby vertices. Deltas run on across lines and
+    rings, since consecutive lines, rings or arcs usually start close to where the previous one ended. Deltas are
+    stored as int16 when they all fit, int32 otherwise. NaN coordinates (e.g. line separators) get a delta of 0,
+    and their positions are returned separately.
+
+    Args:
+        values (obj: np.ndarray): Flat coordinates of one axis.
+        steps (int): Number of grid steps spanning the bounds, e.g. 1e6 for 1 cm precision across 10 km.
+
+    Returns:
+        tuple[obj: np.ndarray, float, float, obj: np.ndarray]: Delta-encoded grid steps, the grid origin and step
+            size, so a coordinate is `origin + step * cumsum(deltas)`, and the indexes of NaN coordinates.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    nan = np.isnan(values)
+    finite = values[~nan]
+
+    origin = float(finite.min()) if len(finite) else 0.0
+    extent = float(finite.max()) - origin if len(finite) else 0.0
+    scale = extent / (steps - 1) if extent > 0 else 1.0
+
+    grid = np.zeros(len(values), dtype=np.int64)
+    grid[~nan] = np.rint((finite - origin) / scale)
+
+    # NaN coordinates repeat the previous grid step, so their delta is 0.
+    previous = np.maximum.accumulate(np.where(nan, 0, np.arange(len(values))))
+    deltas = np.diff(grid[previous], prepend=0)
+
+    fits_int16 = not len(deltas) or np.abs(deltas).max() <= np.iinfo(np.int16).max
+    return deltas.astype(np.int16 if fits_int16 else np.int32), origin, scale, np.flatnonzero(nan)
+
+
+def dequantize_coords(deltas: np.ndarray, origin: float, scale: float, nan_index: np.ndarray) -> np.ndarray:
+    """ Decode coordinates encoded by `quantize_coords`, as the browser does.
+
+    Args:
+        deltas (obj: np.ndarray): Delta-encoded grid steps.
+        origin (float): Grid origin.
+        scale (float): Grid step size.
+        nan_index (obj: np.ndarray): Indexes of NaN coordinates.
+
+    Returns:
+        obj: np.ndarray: Decoded float64 coordinates.
+    """
+
+    values = origin + np.cumsum(deltas, dtype=np.int64) * scale
+    values[nan_index] = np.nan
+    return values
@@ -0,0 +1,155 @@
+import numpy as np
+
+from typing import Sequence, Tuple
+from wktplot.common.buffers import GeometryBuffers
+
+
+def rasterize_buffers(
+    buffers: GeometryBuffers,
+    bounds: Tuple[float, float, float, float],
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """ Count how many shapes cover each pixel of a `width` x `height` grid spanning `bounds`.
+
+    Points are binned with a 2D histogram, lines are sampled once per pixel along each segment, and polygons
+    are filled with an even-odd scanline fill at pixel centers, so holes stay empty.
+
+    Args:
+        buffers (obj: GeometryBuffers): Coordinate buffers to rasterize.
+        bounds (tuple[float, float, float, float]): Extent of the grid, as (min x, min y, max x, max y).
+        width (int): Number of pixel columns.
+        height (int): Number of pixel rows.
+
+    Returns:
+        obj: np.ndarray: (height, width) float64 array of counts, row 0 at `min y`.
+    """
+
+    min_x, min_y, max_x, max_y = bounds
+    scale_x = width / max(max_x - min_x, 1e-12)
+    scale_y = height / max(max_y - min_y, 1e-12)
+
+    def to_pixels(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return (x - min_x) * scale_x, (y - min_y) * scale_y
+
+    grid = np.zeros((height, width), dtype=np.float64)
+    grid += _bin_points(*to_pixels(buffers.point_x, buffers.point_y), width, height)
+
+    line_x, line_y = to_pixels(buffers.line_x, buffers.line_y)
+    grid += _rasterize_segments(line_x, line_y, buffers.line_offsets, width, height)
+
+    poly_x, poly_y = to_pixels(buffers.poly_x, buffers.poly_y)
+    grid += _fill_polygons(poly_x, poly_y, buffers.ring_offsets, buffers.ring_index, width, height)
+
+    return grid
+
+
+def to_rgba(grid: np.ndarray, palette: Sequence[str]) -> np.ndarray:
+    """ Color a density grid with a palette on a log scale, leaving empty pixels transparent.
+
+    Args:
+        grid (obj: np.ndarray): (height, width) array of counts, e.g. from `rasterize_buffers`.
+        palette (list[str]): Hex colors, lowest density first, e.g. `bokeh.palettes.Viridis256`.
+
+    Returns:
+        obj: np.ndarray: (height, width) uint32 array of packed RGBA values, as used by `figure.image_rgba`.
+    """
+
+    colors = np.array(
+        [[int(color[i:i + 2], 16) for i in (1, 3, 5)] + [255] for color in palette],
+        dtype=np.uint8,
+    )
+
+    levels = np.log1p(grid)
+    peak = levels.max()
+    index = np.zeros(grid.shape, dtype=np.int64)
+    if peak > 0:
+        index = np.minimum((levels / peak * len(colors)).astype(np.int64), len(colors) - 1)
+
+    rgba = colors[index]
+    rgba[grid == 0] = 0
+
+    return rgba.view(np.uint32).reshape(grid.shape)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def _bin_points(x: np.ndarray, y: np.ndarray, width: int, height: int) -> np.ndarray:
+
+    counts, _, _ = np.histogram2d(y, x, bins=(height, width), range=((0, height), (0, width)))
+    return counts
+
+
+def _rasterize_segments(
+    x: np.ndarray,
+    y: np.ndarray,
+    offsets: np.ndarray,
+    width: int,
+    height: int,
+) -> np.ndarray:
+
+    if len(x) < 2:
+        return 0.0
+
+    # Segments join consecutive coordinates within the same line.
+    is_last = np.zeros(len(x), dtype=bool)
+    is_last[offsets[1:] - 1] = True
+    start = np.flatnonzero(~is_last)
+
+    x0, y0, x1, y1 = x[start], y[start], x[start + 1], y[start + 1]
+    steps = np.maximum(np.ceil(np.maximum(np.abs(x1 - x0), np.abs(y1 - y0))), 1).astype(np.int64)
+
+    # Each segment is sampled at the middle of `steps` equal pieces, at most one pixel long.
+    segment = np.repeat(np.arange(len(start)), steps)
+    step = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = (step + 0.5) / steps[segment]
+    sample_x = x0[segment] + (x1 - x0)[segment] * t
+    sample_y = y0[segment] + (y1 - y0)[segment] * t
+
+    return _bin_points(sample_x, sample_y, width, height)
+
+
+def _fill_polygons(
+    x: np.ndarray,
+    y: np.ndarray,
+    ring_offsets: np.ndarray,
+    ring_index: np.ndarray,
+    width: int,
+    height: int,
+) -> np.ndarray:
+
+    if not len(x):
+        return 0.0
+
+    # Rings are stored without their closing coordinate, so every edge ends at the next coordinate of its ring,
+    # wrapping back to the ring's first coordinate.
+    ring_lengths = np.diff(ring_offsets)
+    next_index = np.arange(1, len(x) + 1)
+    next_index[ring_offsets[1:] - 1] = ring_offsets[:-1]
+    edge_polygon = np.repeat(ring_index, ring_lengths)
+
+    x0, y0, x1, y1 = x, y, x[next_index], y[next_index]
+
+    # Pixel rows whose centers (row + 0.5) lie within each edge's half-open y span.
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+    first_row = np.clip(np.ceil(low - 0.5), 0, height).astype(np.int64)
+    end_row = np.clip(np.ceil(high - 0.5), 0, height).astype(np.int64)
+    num_rows = np.maximum(end_row - first_row, 0)
+
+    edge = np.repeat(np.arange(len(x0)), num_rows)
+    row = np.arange(num_rows.sum()) - np.repeat(np.cumsum(num_rows) - num_rows, num_rows) + first_row[edge]
+    center_y = row + 0.5
+    cross_x = x0[edge] + (center_y - y0[edge]) * (x1 - x0)[edge] / (y1 - y0)[edge]
+
+    # Even-odd rule: sorted crossings of a polygon on a row pair up into filled spans.
+    order = np.lexsort((cross_x, row, edge_polygon[edge]))
+    row, cross_x = row[order], cross_x[order]
+    span_start = np.clip(np.ceil(cross_x[0::2] - 0.5), 0, width).astype(np.int64)
+    span_end = np.clip(np.ceil(cross_x[1::2] - 0.5), 0, width).astype(np.int64)
+    span_row = row[0::2]
+
+    marks = np.zeros((height, width + 1), dtype=np.float64)
+    np.add.at(marks, (span_row, span_start), 1)
+    np.add.at(marks, (span_row, span_end), -1)
+
+    return np.cumsum(marks, axis=1)[:, :width]
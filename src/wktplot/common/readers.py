@@ -0,0 +1,170 @@
+import csv
+import numpy as np
+import shapely
+
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+DEFAULT_CHUNK_SIZE: int = 65536
+SHAPE_CHUNK = Tuple[np.ndarray, Dict[str, np.ndarray]]
+
+# Vectorized parser used for each line-delimited file format.
+LINE_PARSERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "wkt": shapely.from_wkt,
+    "wkb": shapely.from_wkb,
+    "geojsonl": shapely.from_geojson,
+}
+FILE_FORMATS: Tuple[str, ...] = (*LINE_PARSERS, "csv")
+
+
+def parse_values(values: np.ndarray, format: str) -> np.ndarray:
+    """ Parse raw values read from a file of the given `format` with shapely's vectorized readers.
+
+    Args:
+        values (obj: np.ndarray): Object array of raw strings, e.g. from `read_raw_chunks`.
+        format (str): File format the values were read from, one of `FILE_FORMATS`.
+
+    Returns:
+        obj: np.ndarray: 1D object array of shapely geometries.
+    """
+
+    return LINE_PARSERS.get(format, shapely.from_wkt)(values)
+
+
+def read_shape_chunks(
+    path: Union[str, Path],
+    format: str = "wkt",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    geometry_column: str = "geometry",
+) -> Iterator[SHAPE_CHUNK]:
+    """ Stream shapes from a file in fixed-size chunks, so memory use is bounded by `chunk_size`.
+
+    See `read_raw_chunks` for supported formats and arguments.
+
+    Yields:
+        tuple[obj: np.ndarray, dict[str, obj: np.ndarray]]: Parsed shapely geometries of each chunk, and the other
+            CSV columns of the chunk (empty for other formats).
+    """
+
+    for values, columns in read_raw_chunks(path, format, chunk_size, geometry_column):
+        yield parse_values(values, format), columns
+
+
+def read_raw_chunks(
+    path: Union[str, Path],
+    format: str = "wkt",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    geometry_column: str = "geometry",
+) -> Iterator[SHAPE_CHUNK]:
+    """ Stream unparsed shapes from a file in fixed-size chunks, so memory use is bounded by `chunk_size`.
+
+    Supported formats are line-delimited well-known-text ("wkt"), line-delimited hex well-known-binary ("wkb"),
+    newline-delimited GeoJSON geometries or features ("geojsonl"), and CSV with a well-known-text geometry
+    column ("csv"). Blank lines are skipped.
+
+    Args:
+        path (str | obj: Path): Path of the file to read.
+        format (str, default = "wkt"): File format, one of `FILE_FORMATS`.
+        chunk_size (int, default = 65536): Number of shapes read at a time.
+        geometry_column (str, default = "geometry"): Name of the geometry column, for CSV files.
+
+    Yields:
+        tuple[obj: np.ndarray, dict[str, obj: np.ndarray]]: Object array of raw shape strings of each chunk, to be
+            parsed with `parse_values`, and the other CSV columns of the chunk (empty for other formats). CSV
+            columns whose values in the first chunk are all numbers or blank are read as floats in every chunk,
+            with blanks as NaN, other columns as strings.
+
+    Raises:
+        ValueError: When given `format` is not supported, `chunk_size` is not positive, `geometry_column` is
+            missing from a CSV file, or a CSV row doesn't have one field per header column or has a non-numeric
+            value in a numeric column.
+    """
+
+    if format not in FILE_FORMATS:
+        raise ValueError(f"Given argument `format` is not one of {FILE_FORMATS}. [{format}]")
+
+    if chunk_size < 1:
+        raise ValueError(f"Given argument `chunk_size` is not a positive integer. [{chunk_size}]")
+
+    if format == "csv":
+        yield from _read_csv_chunks(Path(path), chunk_size, geometry_column)
+        return
+
+    with open(path, "r") as fp:
+        lines = (line.strip() for line in fp)
+        non_blank = (line for line in lines if line)
+
+        while True:
+            chunk: List[str] = list(islice(non_blank, chunk_size))
+            if not chunk:
+                return
+
+            yield np.array(chunk, dtype=object), {}
+
+
+def _read_csv_chunks(path: Path, chunk_size: int, geometry_column: str) -> Iterator[SHAPE_CHUNK]:
+
+    with open(path, "r", newline="") as fp:
+        reader = csv.reader(fp)
+        header: List[str] = next(reader, [])
+
+        if geometry_column not in header:
+            raise ValueError(f"Given argument `geometry_column` is not a column of the CSV file. [{geometry_column}]")
+
+        geometry_index = header.index(geometry_column)
+
+        # Column types are fixed by the first chunk, so a column never switches between floats and strings.
+        numeric: Optional[List[bool]] = None
+
+        while True:
+            rows: List[List[str]] = []
+            lines: List[int] = []
+            for row in reader:
+                if not row:
+                    continue
+
+                if len(row) != len(header):
+                    raise ValueError(
+                        f"Line {reader.line_num} of the CSV file has {len(row)} fields, not {len(header)}. [{path}]"
+                    )
+
+                rows.append(row)
+                lines.append(reader.line_num)
+                if len(rows) == chunk_size:
+                    break
+
+            if not rows:
+                return
+
+            fields = list(zip(*rows))
+            if numeric is None:
+                numeric = [_is_numeric(field) for field in fields]
+
+            values = np.array(fields[geometry_index], dtype=object)
+            columns: Dict[str, np.ndarray] = {
+                name: _to_floats(field, name, lines) if is_numeric else np.array(field, dtype=str)
+                for name, field, is_numeric in zip(header, fields, numeric) if name != geometry_column
+            }
+            yield values, columns
+
+
+def _is_numeric(values: Sequence[str]) -> bool:
+
+    try:
+        np.array([value or "nan" for value in values], dtype=np.float64)
+    except ValueError:
+        return False
+
+    return True
+
+
+def _to_floats(values: Sequence[str], name: str, lines: Sequence[int]) -> np.ndarray:
+
+    # Blank values are missing, read as NaN.
+    try:
+        return np.array([value or "nan" for value in values], dtype=np.float64)
+    except ValueError:
+        line, value = next((line, value) for line, value in zip(lines, values) if not _is_numeric([value]))
+        raise ValueError(f"Line {line} of the CSV file has a non-numeric value in numeric column `{name}`. [{value}]")
@@ -0,0 +1,72 @@
+import numpy as np
+import shapely
+
+from typing import Tuple
+from wktplot.common.buffers import GeometryBuffers
+
+
+def get_tolerance(
+    bounds: Tuple[float, float, float, float],
+    width: int,
+    height: int,
+    pixel_tolerance: float = 0.5,
+) -> float:
+    """ Get the simplification tolerance, in data units, matching `pixel_tolerance` screen pixels.
+            e.g. bounds spanning 6000 units over a 600 pixel wide figure, 0.5 pixels --> 5.0 units
+
+    Args:
+        bounds (tuple[float, float, float, float]): Data extent, as (min x, min y, max x, max y).
+        width (int): Figure width in pixels.
+        height (int): Figure height in pixels.
+        pixel_tolerance (float, default = 0.5): Largest allowed deviation, in pixels.
+
+    Returns:
+        float: Tolerance in data units, 0.0 when the extent is empty.
+    """
+
+    min_x, min_y, max_x, max_y = bounds
+    units_per_pixel = max((max_x - min_x) / width, (max_y - min_y) / height)
+
+    if not np.isfinite(units_per_pixel):
+        return 0.0
+
+    return pixel_tolerance * units_per_pixel
+
+
+def simplify_buffers(buffers: GeometryBuffers, tolerance: float) -> GeometryBuffers:
+    """ Simplify every line and polygon in `buffers` with topology-preserving Douglas-Peucker.
+
+    Shapes keep their index, so per-shape style columns stay aligned. Points are left as is.
+
+    Args:
+        buffers (obj: GeometryBuffers): Coordinate buffers to simplify.
+        tolerance (float): Largest allowed deviation, in data units.
+
+    Returns:
+        obj: GeometryBuffers: Simplified coordinate buffers.
+    """
+
+    if tolerance <= 0:
+        return buffers
+
+    lines = shapely.simplify(buffers.line_geometries(), tolerance, preserve_topology=True)
+    polygons = shapely.simplify(buffers.polygon_geometries(), tolerance, preserve_topology=True)
+
+    simple_lines = GeometryBuffers.from_geometries(lines)
+    simple_polygons = GeometryBuffers.from_geometries(polygons)
+
+    return GeometryBuffers(
+        buffers.num_shapes,
+        buffers.point_x,
+        buffers.point_y,
+        buffers.point_index,
+        simple_lines.line_x,
+        simple_lines.line_y,
+        simple_lines.line_offsets,
+        buffers.line_index[simple_lines.line_index],
+        simple_polygons.poly_x,
+        simple_polygons.poly_y,
+        simple_polygons.ring_offsets,
+        simple_polygons.ring_index,
+        buffers.poly_index[simple_polygons.poly_index],
+    )
@@ -0,0 +1,158 @@
+import logging
+
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Pipeline stages, in the order a shape goes through them.
+STAGES = ("parse", "extract", "project", "glyph", "save")
+COUNTERS = ("shapes", "parts", "vertices", "renderers", "output_bytes")
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStats:
+    """ Wall time spent in each stage of the plotting pipeline, and counts of what went through it.
+
+    Stages are timed once per call or chunk of shapes, not per shape, so stats are cheap enough to leave enabled.
+    Times and counts accumulate until `reset`, and can be shared between plots and threads.
+
+    Stages:
+        parse: Parsing well-known-text / well-known-binary into shapely geometries.
+        extract: Extracting coordinates from geometries. Includes parsing and projection for cached or parallel
+            extraction, which happen in one step.
+        project: Projecting coordinates, e.g. to Mercator.
+        glyph: Creating Bokeh glyphs and data sources.
+        save: Serializing the plot to HTML.
+
+    Attributes:
+        timings (dict[str, float]): Seconds spent in each stage.
+        calls (dict[str, int]): Number of times each stage ran.
+        counts (dict[str, int]): Number of shapes, shape parts and vertices added, and of renderers and bytes
+            written by the last save.
+        callback (callable | None): Optional function called with the stage name and seconds after each stage.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float], None]] = None) -> None:
+        """ Create empty stats.
+
+        Args:
+            callback (callable | None, default = None): Optional function called with the stage name and seconds
+                after each stage, e.g. to forward timings to a metrics client.
+        """
+
+        self.callback = callback
+        self.timings: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._lock = Lock()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """ Time the enclosed block as one run of the given `stage`.
+            e.g. with stats.time("parse"): geoms = parse_shapes(shapes)
+
+        Args:
+            stage (str): Name of the stage, one of `STAGES`.
+        """
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, perf_counter() - start)
+
+    def time_iter(self, stage: str, values: Iterable[T]) -> Iterator[T]:
+        """ Time every step of the given iterator as one run of the given `stage`, e.g. waiting on workers.
+
+        Args:
+            stage (str): Name of the stage, one of `STAGES`.
+            values (iterable): Values to time the iteration of.
+
+        Yields:
+            Any: Each value of `values`.
+        """
+
+        iterator = iter(values)
+        while True:
+            with self.time(stage):
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    return
+
+            yield value
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """ Record one run of the given `stage`.
+
+        Args:
+            stage (str): Name of the stage, one of `STAGES`.
+            seconds (float): Wall time of the run.
+        """
+
+        with self._lock:
+            self.timings[stage] += seconds
+            self.calls[stage] += 1
+
+        if self.callback is not None:
+            self.callback(stage, seconds)
+
+    def add_counts(self, **counts: int) -> None:
+        """ Add to the given counters.
+            e.g. stats.add_counts(shapes=10, vertices=250)
+        """
+
+        with self._lock:
+            for name, count in counts.items():
+                self.counts[name] += count
+
+    def set_counts(self, **counts: int) -> None:
+        """ Overwrite the given counters, e.g. the renderer count of the latest save.
+        """
+
+        with self._lock:
+            self.counts.update(counts)
+
+    def reset(self) -> None:
+        """ Zero every timing and counter.
+        """
+
+        with self._lock:
+            self.timings = dict.fromkeys(STAGES, 0.0)
+            self.calls = dict.fromkeys(STAGES, 0)
+            self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ Get a JSON-serializable copy of the stats.
+
+        Returns:
+            dict[str, Any]: Seconds and calls per stage, total seconds, and counters.
+        """
+
+        with self._lock:
+            return {
+                "timings": dict(self.timings),
+                "calls": dict(self.calls),
+                "total_seconds": sum(self.timings.values()),
+                "counts": dict(self.counts),
+            }
+
+    def log(self, level: int = logging.INFO, log: Optional[logging.Logger] = None) -> None:
+        """ Log a one-line summary of the stats.
+
+        Args:
+            level (int, default = logging.INFO): Level to log at.
+            log (obj: Logger | None, default = None): Logger to use, defaults to this module's logger.
+        """
+
+        stats = self.as_dict()
+        timings = " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in stats["timings"].items())
+        counts = " ".join(f"{name}={count}" for name, count in stats["counts"].items())
+        (log or logger).log(
+            level, "WKTPlot pipeline: %s total=%.1fms %s", timings, stats["total_seconds"] * 1000, counts,
+        )
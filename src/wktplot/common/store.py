@@ -0,0 +1,188 @@
+import numpy as np
+import shutil
+import struct
+import tempfile
+import weakref
+
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from wktplot.common.buffers import GeometryBuffers, join_bounds
+
+
+# Size of the header of every appendable `.npy` file, rewritten in place as the file grows. A multiple of 64, so
+# the data stays aligned as `np.save` aligns it.
+NPY_HEADER_SIZE: int = 128
+
+NPY_MAGIC: bytes = b"\x93NUMPY\x01\x00"
+
+
+class NpyArrayFile:
+    """ One-dimensional `.npy` file that values can be appended to, read back memory-mapped as it grows.
+
+    The file is a regular version 1.0 `.npy` file at any time, e.g. loadable by `np.load(path, mmap_mode="r")`.
+    Slicing the file maps only the sliced range, so reading a large file slice by slice never keeps more than one
+    slice resident.
+
+    Attributes:
+        path (obj: Path): File the values are stored in.
+        dtype (obj: np.dtype): Data type of the stored values.
+    """
+
+    def __init__(self, path: Union[str, Path], dtype: np.dtype) -> None:
+        """ Create an empty file, replacing any existing file at `path`.
+
+        Args:
+            path (str | obj: Path): File to store the values in, e.g. "x.npy".
+            dtype (obj: np.dtype): Data type of the stored values, e.g. np.float64.
+        """
+
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        self._length = 0
+
+        with self.path.open("wb") as file:
+            self._write_header(file)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+
+        # Empty ranges can not be memory-mapped.
+        start, stop, step = index.indices(self._length)
+        if stop <= start:
+            return np.empty(0, dtype=self.dtype)
+
+        offset = NPY_HEADER_SIZE + start * self.dtype.itemsize
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=offset, shape=(stop - start,))[::step]
+
+    @property
+    def nbytes(self) -> int:
+        return self._length * self.dtype.itemsize
+
+    def append(self, values: np.ndarray) -> Tuple[int, int]:
+        """ Append the given values to the end of the file.
+
+        Args:
+            values (obj: np.ndarray): 1D array of values, cast to the file's data type.
+
+        Returns:
+            tuple[int, int]: Start and stop index of the appended values in the file.
+        """
+
+        values = np.ascontiguousarray(values, dtype=self.dtype).reshape(-1)
+        start = self._length
+
+        with self.path.open("r+b") as file:
+            file.seek(NPY_HEADER_SIZE + self.nbytes)
+            file.write(memoryview(values).cast("B"))
+            self._length += len(values)
+            self._write_header(file)
+
+        return start, self._length
+
+    def load(self) -> np.ndarray:
+        """ Get the values stored so far, memory-mapped read-only so they're only read from disk when accessed.
+
+        Returns:
+            obj: np.ndarray: Stored values.
+        """
+
+        return self[:]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def _write_header(self, file: BinaryIO) -> None:
+
+        header = f"{{'descr': {np.lib.format.dtype_to_descr(self.dtype)!r}, 'fortran_order': False, "
+        header += f"'shape': ({self._length},), }}"
+        header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+
+        file.seek(0)
+        file.write(NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+
+class CoordinateStore:
+    """ Disk-backed store of coordinate buffers, appended to memory-mapped `.npy` files as shapes are added.
+
+    Every `GeometryBuffers` array is stored in its own `NpyArrayFile`, chunk after chunk, with shape indexes and
+    offsets kept relative to their chunk. Chunks are read back one at a time as views into the memory-mapped files,
+    so datasets larger than memory can be drawn or saved chunk by chunk. The files are deleted once the store is
+    closed or garbage collected.
+
+    Attributes:
+        directory (obj: Path): Directory holding the store's files, created for the store.
+        arrays (dict[str, obj: NpyArrayFile]): File of each `GeometryBuffers` array, by array name.
+        bounds (tuple[float, float, float, float]): Bounding box of every stored coordinate, NaNs when empty.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None) -> None:
+        """ Create an empty store in a new directory.
+
+        Args:
+            directory (str | obj: Path | None, default = None): Optional parent directory of the store's own
+                directory, defaults to the system's temporary directory. Can be shared between stores.
+        """
+
+        self.directory = Path(tempfile.mkdtemp(prefix="wktplot-", dir=directory))
+        self.arrays: Dict[str, NpyArrayFile] = {
+            name: NpyArrayFile(self.directory / f"{name}.npy", np.float64 if name[-2:] in ("_x", "_y") else np.int64)
+            for name in GeometryBuffers.ARRAYS
+        }
+        self.bounds: Tuple[float, float, float, float] = (np.nan, np.nan, np.nan, np.nan)
+        self._chunks: List[Tuple[int, Dict[str, Tuple[int, int]]]] = []
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    @property
+    def num_shapes(self) -> int:
+        return sum(num_shapes for num_shapes, _ in self._chunks)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def num_vertices(self) -> int:
+        return sum(len(self.arrays[name]) for name in ("point_x", "line_x", "poly_x"))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def append(self, buffers: GeometryBuffers) -> None:
+        """ Append the given coordinate buffers to the store's files, as one chunk.
+
+        Args:
+            buffers (obj: GeometryBuffers): Coordinates of one or more shapes.
+        """
+
+        spans = {name: array.append(getattr(buffers, name)) for name, array in self.arrays.items()}
+        self._chunks.append((buffers.num_shapes, spans))
+        self.bounds = join_bounds([self.bounds, buffers.bounds])
+
+    def iter_buffers(self) -> Iterator[GeometryBuffers]:
+        """ Iterate over the stored chunks, in the order they were appended.
+
+        Returns:
+            iterator[obj: GeometryBuffers]: Buffers of each chunk, read-only and memory-mapped from the files.
+        """
+
+        for num_shapes, spans in self._chunks:
+            arrays = (self.arrays[name][slice(*spans[name])] for name in GeometryBuffers.ARRAYS)
+            yield GeometryBuffers(num_shapes, *arrays)
+
+    def get_buffers(self) -> GeometryBuffers:
+        """ Read every stored chunk into memory, joined into one set of buffers.
+
+        Returns:
+            obj: GeometryBuffers: Joined coordinate buffers.
+        """
+
+        chunks = list(self.iter_buffers())
+        return GeometryBuffers.concat(chunks) if chunks else GeometryBuffers.empty()
+
+    def close(self) -> None:
+        """ Delete the store's directory and files. The store can not be used afterwards.
+        """
+
+        self._finalizer()
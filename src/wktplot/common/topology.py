@@ -0,0 +1,143 @@
+import numpy as np
+
+from typing import Dict, List, Tuple
+
+
+def encode_arcs(
+    x: np.ndarray,
+    y: np.ndarray,
+    lengths: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """ Split polygon rings into arcs, storing each arc shared by neighbouring rings only once, TopoJSON-style.
+            e.g. two squares sharing a side --> 3 arcs, the shared side referenced by both rings
+
+    Rings are cut wherever the set of rings sharing the boundary changes, so a border between two polygons becomes
+    one arc, referenced by both. Arcs are matched on their exact vertices, in either direction. Rings without cuts
+    become a single closed arc, started at their smallest vertex, so a hole filled by another polygon is stored
+    once too.
+
+    Arcs are numbered in the order rings first reference them, so a first reference is stored as 0, and later ones
+    as `index + 1`, or as the one's complement `~index` when the arc is walked in reverse. New arcs, about half of
+    the references, then compress down to almost nothing.
+
+    Args:
+        x (obj: np.ndarray): Flat x coordinates of every ring, without closing coordinates (as drawn by Bokeh).
+        y (obj: np.ndarray): Flat y coordinates of every ring.
+        lengths (obj: np.ndarray): Number of coordinates in each ring, summing to the number of coordinates.
+
+    Returns:
+        tuple[obj: np.ndarray, ...]: x and y coordinates of every arc, the number of coordinates in each arc, the
+            arc references of every ring, and the number of arc references of each ring.
+    """
+
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if not len(x):
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty(0), np.empty(0), empty, empty, np.zeros(len(lengths), dtype=np.int64)
+
+    vertices, ids = np.unique(np.column_stack([x, y]), axis=0, return_inverse=True)
+    ids = ids.reshape(-1)
+
+    # Edge i runs from vertex i to the next vertex of its ring, wrapping around to the ring's first vertex.
+    starts = np.cumsum(lengths) - lengths
+    ring_index = np.repeat(np.arange(len(lengths)), lengths)
+    following = np.arange(len(ids)) + 1
+    ends = starts + lengths - 1
+    following[ends[lengths > 0]] = starts[lengths > 0]
+
+    lo = np.minimum(ids, ids[following])
+    hi = np.maximum(ids, ids[following])
+    _, edge_ids = np.unique(lo * len(vertices) + hi, return_inverse=True)
+    edge_ids = edge_ids.reshape(-1)
+
+    # Edges bordering the same rings share a signature; rings are cut where the signature changes.
+    num_edges = edge_ids.max() + 1
+    first_ring = np.full(num_edges, len(lengths))
+    last_ring = np.full(num_edges, -1)
+    np.minimum.at(first_ring, edge_ids, ring_index)
+    np.maximum.at(last_ring, edge_ids, ring_index)
+    signature = np.column_stack([np.bincount(edge_ids), first_ring, last_ring])[edge_ids]
+
+    preceding = np.arange(len(ids)) - 1
+    preceding[starts[lengths > 0]] = ends[lengths > 0]
+    cuts = np.any(signature != signature[preceding], axis=1)
+
+    arc_index: Dict[Tuple[int, ...], int] = {}
+    arcs: List[np.ndarray] = []
+    refs: List[int] = []
+    counts = np.zeros(len(lengths), dtype=np.int64)
+
+    for ring, (start, length) in enumerate(zip(starts, lengths)):
+        if not length:
+            continue
+
+        ring_ids = ids[start:start + length]
+        ring_cuts = np.flatnonzero(cuts[start:start + length])
+        if not len(ring_cuts):
+            ring_cuts = np.array([np.argmin(ring_ids)])
+
+        # Walk the ring once from its first cut back around to it, so every arc is a slice of `closed`.
+        closed = np.roll(ring_ids, -ring_cuts[0])
+        closed = np.append(closed, closed[0])
+        bounds = np.append(ring_cuts - ring_cuts[0], length)
+
+        for arc_start, arc_end in zip(bounds[:-1], bounds[1:]):
+            arc = closed[arc_start:arc_end + 1]
+            key = tuple(arc.tolist())
+            if key in arc_index:
+                refs.append(arc_index[key] + 1)
+            elif key[::-1] in arc_index:
+                refs.append(~arc_index[key[::-1]])
+            else:
+                arc_index[key] = len(arcs)
+                refs.append(0)
+                arcs.append(arc)
+
+        counts[ring] = len(bounds) - 1
+
+    arc_ids = np.concatenate(arcs)
+    arc_lengths = np.array([len(arc) for arc in arcs], dtype=np.int64)
+
+    return vertices[arc_ids, 0], vertices[arc_ids, 1], arc_lengths, np.array(refs, dtype=np.int64), counts
+
+
+def decode_arcs(
+    arc_x: np.ndarray,
+    arc_y: np.ndarray,
+    arc_lengths: np.ndarray,
+    refs: np.ndarray,
+    counts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Rebuild the rings encoded by `encode_arcs`, as the browser does.
+
+    Each ring starts at its first cut, which may differ from its original first coordinate.
+
+    Args:
+        arc_x (obj: np.ndarray): Flat x coordinates of every arc.
+        arc_y (obj: np.ndarray): Flat y coordinates of every arc.
+        arc_lengths (obj: np.ndarray): Number of coordinates in each arc.
+        refs (obj: np.ndarray): Arc references of every ring, see `encode_arcs`.
+        counts (obj: np.ndarray): Number of arc references of each ring.
+
+    Returns:
+        tuple[obj: np.ndarray, obj: np.ndarray, obj: np.ndarray]: Flat x and y coordinates of every ring, and the
+            number of coordinates in each ring.
+    """
+
+    arc_lengths = np.asarray(arc_lengths, dtype=np.int64)
+    refs = np.asarray(refs, dtype=np.int64)
+    arc_starts = np.cumsum(arc_lengths) - arc_lengths
+
+    # Consecutive arcs share their end points, so each arc contributes all but its last coordinate.
+    new = refs == 0
+    reversed_ = refs < 0
+    arcs = np.where(new, np.cumsum(new) - 1, np.where(reversed_, ~refs, refs - 1))
+    sizes = arc_lengths[arcs] - 1
+    steps = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    steps = np.where(np.repeat(reversed_, sizes), np.repeat(sizes, sizes) - steps, steps)
+    index = np.repeat(arc_starts[arcs], sizes) + steps
+
+    ring_index = np.repeat(np.arange(len(counts)), counts)
+    ring_lengths = np.bincount(ring_index, weights=sizes, minlength=len(counts)).astype(np.int64)
+
+    return np.asarray(arc_x)[index], np.asarray(arc_y)[index], ring_lengths
@@ -1,3 +1,5 @@
+import numpy as np
+
 from abc import ABC, abstractclassmethod
 from shapely.geometry import Point, LineString, LinearRing, Polygon
 from typing import List, Tuple, Union
@@ -17,23 +19,36 @@ class BaseMapper(ABC):
         """
 
     @abstractclassmethod
-    def _get_line_string_coords(cls, shape: Union[LineString, LinearRing]) -> Tuple[List[int], List[int]]:
+    def _get_line_string_coords(cls, shape: Union[LineString, LinearRing]) -> Tuple[np.ndarray, np.ndarray]:
         """ Get x, y coordinates of the given `shape` geometry.
 
         Args:
             shape (obj: LineString | obj: LinearRing): LineString or LinearRing shape.
 
         Returns:
-            tuple[list[float], list[float]]: Tuple with x, y coordinate value lists.
+            tuple[obj: np.ndarray, obj: np.ndarray]: Tuple with contiguous float64 x, y coordinate arrays.
         """
 
     @abstractclassmethod
-    def _get_polygon_coords(cls, shape: Polygon) -> Tuple[List[List[float]], List[List[float]]]:
-        """ Get x, y coordinates of the given `shape` geometry.
+    def _get_polygon_coords(cls, shape: Polygon) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """ Get x, y coordinates of the given `shape` geometry, exterior ring first.
 
         Args:
             shape (obj: Polygon): Polygon shape.
 
         Returns:
-            tuple[list[list[float]], list[list[float]]]: Tuple with x, y coordinate values as 2D lists.
+            tuple[list[obj: np.ndarray], list[obj: np.ndarray]]: Tuple with x, y coordinate arrays per ring, as
+                contiguous float64 views into one buffer.
+        """
+
+    @abstractclassmethod
+    def _project_coords(cls, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Project the given flat x, y coordinate arrays into the plot's coordinate system.
+
+        Args:
+            x (obj: np.ndarray): x coordinate values.
+            y (obj: np.ndarray): y coordinate values.
+
+        Returns:
+            tuple[obj: np.ndarray, obj: np.ndarray]: Tuple with projected x, y coordinate arrays.
         """
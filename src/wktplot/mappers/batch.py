@@ -0,0 +1,381 @@
+import numpy as np
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from wktplot.common.buffers import GeometryBuffers, join_bounds
+from wktplot.common.store import CoordinateStore
+
+# Bokeh is only needed to draw batches, so worker processes extracting coordinates never import it.
+if TYPE_CHECKING:
+    from bokeh.models import ColumnDataSource, CustomJS, GlyphRenderer
+    from bokeh.plotting import Figure
+
+
+# Style properties whose shared value is itself a list, e.g. `line_dash=[4, 4]`, matched by suffix so prefixed
+# variants like `hover_line_dash` are included. Bokeh can't vary these per shape.
+LIST_STYLE_PROPERTIES: Tuple[str, ...] = ("line_dash",)
+
+
+def split_style_kwargs(
+    style_kwargs: Dict[str, Any],
+    data: Optional[Mapping[str, Sequence[Any]]] = None,
+    num_shapes: Optional[int] = None,
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """ Split style attributes into ones shared by every shape and ones given per shape.
+            e.g. {"fill_alpha": 0.5, "fill_color": ["red", "blue"]} --> ({"fill_alpha": 0.5}, {"fill_color": [...]})
+
+    Lists and arrays holding one value per shape are per-shape values, as are strings naming a column of `data`.
+    Tuples, values of list-valued properties like `line_dash`, and lists whose length doesn't match `num_shapes`
+    are kept as shared values, since Bokeh accepts them as RGB(A) colors or dash patterns.
+
+    Args:
+        style_kwargs (dict[str, Any]): Dictionary of style attributes.
+        data (dict[str, list] | None, default = None): Optional table of per-shape values, e.g. a pandas DataFrame.
+        num_shapes (int | None, default = None): Number of shapes the attributes apply to, when known.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, obj: np.ndarray]]: Shared style attributes and per-shape style columns.
+    """
+
+    shared: Dict[str, Any] = {}
+    columns: Dict[str, np.ndarray] = {}
+
+    for key, value in style_kwargs.items():
+        if isinstance(value, str) and data is not None and value in data:
+            columns[key] = np.asarray(data[value])
+        elif _is_style_column(key, value, num_shapes):
+            columns[key] = np.asarray(value)
+        else:
+            shared[key] = value
+
+    return shared, columns
+
+
+class GlyphBatch:
+    """ Collects shapes sharing the same style and emits them as one renderer per glyph type.
+
+    Points are drawn with a single `scatter`, lines with a single `multi_line` (one row per shape, lines separated
+    by NaN), and polygons with a single `multi_polygons` call, each backed by its own `ColumnDataSource`.
+    Per-shape style values are stored as extra source columns, so differently styled shapes still share one
+    renderer. Coordinates are kept in memory, or appended to an optional `CoordinateStore` on disk.
+    """
+
+    # Coordinate columns of each glyph type, in the order renderers are created.
+    GLYPH_COORDS: Dict[str, Tuple[str, str]] = {
+        "scatter": ("x", "y"),
+        "multi_line": ("xs", "ys"),
+        "multi_polygons": ("xs", "ys"),
+    }
+
+    def __init__(
+        self,
+        columns: Sequence[str] = (),
+        store: Optional[CoordinateStore] = None,
+        **style_kwargs: Dict[str, Any],
+    ) -> None:
+        """ Create an empty batch.
+
+        Args:
+            columns (list[str], default = ()): Names of style attributes given per shape, see `add_buffers`.
+            store (obj: CoordinateStore | None, default = None): Optional disk-backed store to append added
+                coordinates to, instead of holding them in memory.
+            **style_kwargs (dict): Dictionary of attributes to style every shape in the batch.
+                See this guide for available style attributes:
+                https://docs.bokeh.org/en/latest/docs/user_guide/styling.html
+        """
+
+        self.columns = tuple(columns)
+        self.store = store
+        self.style_kwargs = style_kwargs
+        self.sources: Dict[str, "ColumnDataSource"] = {}
+        self.renderers: Dict[str, "GlyphRenderer"] = {}
+        self.level_sources: Dict[str, List["ColumnDataSource"]] = {}
+        self.tile_callbacks: Dict[str, "CustomJS"] = {}
+        self._chunks: List[GeometryBuffers] = []
+        self._column_chunks: Dict[str, List[np.ndarray]] = {name: [] for name in self.columns}
+
+    @property
+    def num_shapes(self) -> int:
+        if self.store is not None:
+            return self.store.num_shapes
+
+        return sum(chunk.num_shapes for chunk in self._chunks)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """ Bounding box of every coordinate added so far, as (min x, min y, max x, max y), or NaNs when empty.
+        """
+
+        if self.store is not None:
+            return self.store.bounds
+
+        return join_bounds(chunk.bounds for chunk in self._chunks)
+
+    def add_buffers(self, buffers: GeometryBuffers, columns: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """ Queue the given coordinate buffers to be drawn on the next `flush`.
+
+        Args:
+            buffers (obj: GeometryBuffers): Coordinates of one or more shapes.
+            columns (dict[str, obj: np.ndarray] | None, default = None): Per-shape style values, one value per
+                shape in `buffers`, for every name in the batch's `columns`.
+
+        Raises:
+            ValueError: When the given `columns` don't match the batch's columns or number of shapes.
+        """
+
+        for name, values in self.check_columns(buffers, columns).items():
+            self._column_chunks[name].append(values)
+
+        if self.store is not None:
+            self.store.append(buffers)
+            return
+
+        self._chunks.append(buffers)
+
+    def check_columns(
+        self,
+        buffers: GeometryBuffers,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """ Check the given per-shape style values match the batch's columns and the shapes in `buffers`.
+
+        Args:
+            buffers (obj: GeometryBuffers): Coordinates of one or more shapes.
+            columns (dict[str, obj: np.ndarray] | None, default = None): Per-shape style values, see `add_buffers`.
+
+        Returns:
+            dict[str, obj: np.ndarray]: The given style values, as arrays.
+
+        Raises:
+            ValueError: When the given `columns` don't match the batch's columns or number of shapes.
+        """
+
+        columns = columns or {}
+
+        if set(columns) != set(self.columns):
+            raise ValueError(
+                f"Given argument `columns` does not match the batch's style columns. [{sorted(columns)}]"
+            )
+
+        for name, values in columns.items():
+            if len(values) != buffers.num_shapes:
+                raise ValueError(
+                    f"Style column `{name}` has {len(values)} values for {buffers.num_shapes} shapes."
+                )
+
+        return {name: np.asarray(values) for name, values in columns.items()}
+
+    def get_buffers(self) -> GeometryBuffers:
+        """ Get all coordinates added to the batch so far, joined into one set of buffers.
+
+        Returns:
+            obj: GeometryBuffers: Joined coordinate buffers, read into memory when the batch has a store.
+        """
+
+        if self.store is not None:
+            return self.store.get_buffers()
+
+        if len(self._chunks) > 1:
+            self._chunks = [GeometryBuffers.concat(self._chunks)]
+
+        return self._chunks[0] if self._chunks else GeometryBuffers.empty()
+
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """ Get all per-shape style values added to the batch so far, aligned with `get_buffers`.
+
+        Returns:
+            dict[str, obj: np.ndarray]: Per-shape style values by attribute name.
+        """
+
+        for name, chunks in self._column_chunks.items():
+            if len(chunks) > 1:
+                self._column_chunks[name] = [np.concatenate(chunks)]
+
+        return {name: chunks[0] for name, chunks in self._column_chunks.items() if chunks}
+
+    def iter_chunks(self) -> Iterator[Tuple[GeometryBuffers, Dict[str, np.ndarray]]]:
+        """ Iterate over the coordinates and per-shape style values added to the batch so far, chunk by chunk,
+        without joining them, e.g. to draw or save a batch larger than memory from its store.
+
+        Returns:
+            iterator[tuple[obj: GeometryBuffers, dict[str, obj: np.ndarray]]]: Buffers of each chunk, and the
+                style values of its shapes.
+        """
+
+        chunks = self.store.iter_buffers() if self.store is not None else iter(self._chunks)
+        columns = self.get_columns()
+        start = 0
+
+        for buffers in chunks:
+            stop = start + buffers.num_shapes
+            yield buffers, {name: values[start:stop] for name, values in columns.items()}
+            start = stop
+
+    def iter_glyph_data(self, glyph: str) -> Iterator[Dict[str, Any]]:
+        """ Iterate over the `ColumnDataSource` data of the given glyph type, chunk by chunk, see `iter_chunks`.
+
+        Args:
+            glyph (str): Glyph method name, e.g. "multi_polygons".
+
+        Returns:
+            iterator[dict[str, Any]]: Source data of each chunk with shapes of the glyph type.
+        """
+
+        for buffers, columns in self.iter_chunks():
+            glyph_data = self.get_glyph_data(buffers, columns)
+            if glyph in glyph_data:
+                yield glyph_data[glyph]
+
+    def get_empty_glyph_data(self) -> Dict[str, Dict[str, Any]]:
+        """ Get empty `ColumnDataSource` data for each glyph type the batch has shapes of, with every column of
+        `get_glyph_data`, e.g. to create renderers whose data is filled in later.
+
+        Returns:
+            dict[str, dict[str, Any]]: Source data with empty columns, by glyph method name.
+        """
+
+        glyphs = set()
+        for buffers, _ in self.iter_chunks():
+            for glyph, index in zip(self.GLYPH_COORDS, (buffers.point_x, buffers.line_index, buffers.poly_index)):
+                if len(index):
+                    glyphs.add(glyph)
+
+        return {
+            glyph: {name: [] for name in (*coords, *self.columns)}
+            for glyph, coords in self.GLYPH_COORDS.items() if glyph in glyphs
+        }
+
+    def flush(self, figure: "Figure", buffers: Optional[GeometryBuffers] = None) -> None:
+        """ Draw the batch onto the given figure.
+
+        Renderers are created the first time a glyph type has data; later flushes only replace the data of the
+        existing sources, so flushing repeatedly never duplicates glyphs.
+
+        Args:
+            figure (obj: Figure): Figure to draw onto.
+            buffers (obj: GeometryBuffers | None, default = None): Optional replacement for the batch's buffers,
+                e.g. a simplified copy. Must keep the shape indexes of `get_buffers`.
+        """
+
+        if buffers is None:
+            buffers = self.get_buffers()
+
+        self.draw(figure, self.get_glyph_data(buffers))
+
+    def draw(self, figure: "Figure", glyph_data: Dict[str, Dict[str, Any]]) -> None:
+        """ Draw the given source data onto the figure, creating renderers or replacing their source data.
+
+        Args:
+            figure (obj: Figure): Figure to draw onto.
+            glyph_data (dict[str, dict[str, Any]]): Source data by glyph method name, see `get_glyph_data`.
+        """
+
+        for glyph, data in glyph_data.items():
+            self._update(figure, glyph, data)
+
+    def get_glyph_data(
+        self,
+        buffers: Optional[GeometryBuffers] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """ Get the `ColumnDataSource` data of each glyph type with data, including per-shape style columns.
+
+        Args:
+            buffers (obj: GeometryBuffers | None, default = None): Optional replacement for the batch's buffers,
+                see `flush`.
+            columns (dict[str, obj: np.ndarray] | None, default = None): Optional per-shape style values aligned
+                with `buffers`, defaults to the batch's.
+
+        Returns:
+            dict[str, dict[str, Any]]: Source data by glyph method name, e.g. "multi_line".
+        """
+
+        return {glyph: data for glyph, (_, data) in self.get_glyph_rows(buffers, columns).items()}
+
+    def get_glyph_rows(
+        self,
+        buffers: Optional[GeometryBuffers] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, Tuple[np.ndarray, Dict[str, Any]]]:
+        """ Get the `ColumnDataSource` data of each glyph type with data, with the shape index of each row.
+
+        Points are drawn one row per point, and lines and polygons one row per shape.
+
+        Args:
+            buffers (obj: GeometryBuffers | None, default = None): Optional replacement for the batch's buffers.
+            columns (dict[str, obj: np.ndarray] | None, default = None): Optional per-shape style values aligned
+                with `buffers`, defaults to the batch's.
+
+        Returns:
+            dict[str, tuple[obj: np.ndarray, dict[str, Any]]]: Shape index of each row and source data, by glyph
+                method name.
+        """
+
+        if buffers is None:
+            buffers = self.get_buffers()
+
+        if columns is None:
+            columns = self.get_columns()
+
+        glyph_rows: Dict[str, Tuple[np.ndarray, Dict[str, Any]]] = {}
+
+        if len(buffers.point_x):
+            rows = buffers.point_index
+            glyph_rows["scatter"] = rows, self._add_columns({"x": buffers.point_x, "y": buffers.point_y}, columns, rows)
+
+        if len(buffers.line_index):
+            rows, xs, ys = buffers.line_rows()
+            glyph_rows["multi_line"] = rows, self._add_columns({"xs": xs, "ys": ys}, columns, rows)
+
+        if len(buffers.poly_index):
+            rows, xs, ys = buffers.polygon_rows()
+            glyph_rows["multi_polygons"] = rows, self._add_columns({"xs": xs, "ys": ys}, columns, rows)
+
+        return glyph_rows
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    @staticmethod
+    def _add_columns(data: Dict[str, Any], columns: Dict[str, np.ndarray], rows: np.ndarray) -> Dict[str, Any]:
+
+        # Fixed-width strings would be truncated by longer values streamed or patched into the source later.
+        data.update({
+            name: values[rows].astype(object) if values.dtype.kind in "US" else values[rows]
+            for name, values in columns.items()
+        })
+        return data
+
+    def _update(self, figure: "Figure", glyph: str, data: Dict[str, Any]) -> None:
+
+        if glyph in self.sources:
+            self.sources[glyph].data = data
+            return
+
+        coord_fields = list(data)[:2]
+        column_fields = {name: {"field": name} for name in self.columns}
+
+        from bokeh.models import ColumnDataSource
+
+        # Shared list values, e.g. dash patterns, are wrapped as values so Bokeh doesn't take them for columns.
+        style_kwargs = {
+            name: {"value": value} if isinstance(value, list) or hasattr(value, "__array__") else value
+            for name, value in self.style_kwargs.items()
+        }
+
+        source = ColumnDataSource(data=data)
+        self.sources[glyph] = source
+        self.renderers[glyph] = getattr(figure, glyph)(
+            *coord_fields,
+            source=source,
+            **style_kwargs,
+            **column_fields,
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def _is_style_column(key: str, value: Any, num_shapes: Optional[int]) -> bool:
+
+    if not (isinstance(value, list) or hasattr(value, "__array__")) or key.endswith(LIST_STYLE_PROPERTIES):
+        return False
+
+    return num_shapes is None or len(value) == num_shapes
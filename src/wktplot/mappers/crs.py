@@ -0,0 +1,191 @@
+import copyreg
+import numpy as np
+
+from abc import ABCMeta
+from functools import lru_cache
+from typing import Callable, Dict, Set, Tuple, Union
+from wktplot.mappers.osm import geographic_to_mercator, mercator_to_geographic
+from wktplot.mappers.standard import StandardMapper
+
+
+# Longitude / latitude in degrees, and the Web Mercator coordinates drawn by map tiles.
+WGS84: str = "EPSG:4326"
+WEB_MERCATOR: str = "EPSG:3857"
+
+CRS = Union[str, int]
+TRANSFORM = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+# Vectorized transforms between pairs of coordinate reference systems, taking and returning x, y arrays in each
+# CRS's own axis order, e.g. latitude first for "EPSG:4326" as `OpenStreetMapper` reads it, and easting first for
+# "EPSG:3857". Pairs not registered here are transformed with pyproj, when it's installed.
+TRANSFORMS: Dict[Tuple[str, str], TRANSFORM] = {
+    (WGS84, WEB_MERCATOR): lambda x, y: geographic_to_mercator(lat_deg=x, lng_deg=y),
+    (WEB_MERCATOR, WGS84): lambda x, y: mercator_to_geographic(x, y),
+}
+
+# Pairs registered with `register_transform`, whose transforms are sent along with their mappers to worker
+# processes.
+_REGISTERED: Set[Tuple[str, str]] = set()
+
+
+def normalize_crs(crs: CRS) -> str:
+    """ Get the canonical name of the given coordinate reference system.
+            e.g. 32633 --> "EPSG:32633", "epsg:4326" --> "EPSG:4326"
+
+    Args:
+        crs (str | int): EPSG code, or any CRS string understood by pyproj, e.g. "EPSG:27700".
+
+    Returns:
+        str: Canonical CRS name.
+    """
+
+    if isinstance(crs, int):
+        return f"EPSG:{crs}"
+
+    name = crs.strip()
+    return name.upper() if name.lower().startswith("epsg:") else name
+
+
+def register_transform(source_crs: CRS, target_crs: CRS, transform: TRANSFORM) -> None:
+    """ Register a vectorized transform between two coordinate reference systems, used instead of pyproj.
+
+    Mappers already created for the pair by `get_crs_mapper` keep their transform. Mappers used with `workers`
+    pickle their transform, so it must be picklable, e.g. a module-level function rather than a lambda.
+
+    Args:
+        source_crs (str | int): CRS of the input coordinates, e.g. "EPSG:27700".
+        target_crs (str | int): CRS of the output coordinates, e.g. "EPSG:3857".
+        transform (callable): Function taking flat x, y arrays and returning transformed x, y arrays, in each
+            CRS's axis order.
+    """
+
+    key = normalize_crs(source_crs), normalize_crs(target_crs)
+    TRANSFORMS[key] = transform
+    _REGISTERED.add(key)
+
+
+def get_transform(source_crs: CRS, target_crs: CRS) -> TRANSFORM:
+    """ Get a vectorized transform between two coordinate reference systems.
+
+    Registered transforms are used first, see `TRANSFORMS`. Other pairs are transformed by a pyproj `Transformer`,
+    built by this call. Coordinates are in each CRS's axis order as defined by its authority, e.g. latitude first
+    for "EPSG:4326" (as read by `OpenStreetMapper`) and easting first for UTM zones.
+
+    Args:
+        source_crs (str | int): CRS of the input coordinates, e.g. "EPSG:32633".
+        target_crs (str | int): CRS of the output coordinates, e.g. "EPSG:3857".
+
+    Returns:
+        callable: Function taking flat x, y arrays and returning transformed x, y arrays.
+
+    Raises:
+        ImportError: When the pair isn't registered and pyproj is not installed.
+    """
+
+    source_crs, target_crs = normalize_crs(source_crs), normalize_crs(target_crs)
+
+    if source_crs == target_crs:
+        return lambda x, y: (x, y)
+
+    if (source_crs, target_crs) in TRANSFORMS:
+        return TRANSFORMS[source_crs, target_crs]
+
+    try:
+        from pyproj import Transformer
+    except ImportError as error:
+        raise ImportError(
+            f"Transforming from {source_crs} to {target_crs} requires pyproj, e.g. `pip install wktplot[crs]`."
+        ) from error
+
+    return Transformer.from_crs(source_crs, target_crs).transform
+
+
+class CRSMeta(ABCMeta):
+    """ Metaclass of mappers created by `get_crs_mapper`, pickled by their CRS pair so worker processes can
+    rebuild them.
+    """
+
+
+class CRSMapper(StandardMapper, metaclass=CRSMeta):
+    """ Base class of mappers transforming coordinates between two coordinate reference systems.
+
+    Subclasses for a CRS pair are created, with their transform, by `get_crs_mapper`.
+    """
+
+    source_crs: str = WGS84
+    target_crs: str = WGS84
+    _transform: TRANSFORM = staticmethod(lambda x, y: (x, y))
+
+    @classmethod
+    def _project_coords(cls, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return cls._transform(x, y)
+
+
+def get_crs_mapper(source_crs: CRS, target_crs: CRS = WEB_MERCATOR) -> CRSMeta:
+    """ Get the mapper transforming coordinates from `source_crs` to `target_crs`, in one call per batch.
+            e.g. get_crs_mapper("EPSG:32633") --> CRSMapper[EPSG:32633->EPSG:3857]
+
+    The transform is built once per CRS pair and process, and shared by every plot using the mapper.
+
+    Args:
+        source_crs (str | int): CRS of the shapes' coordinates, e.g. "EPSG:32633" for UTM zone 33N.
+        target_crs (str | int, default = "EPSG:3857"): CRS to draw the shapes in. Web Mercator matches the map
+            tiles of `OpenStreetMapsPlot`.
+
+    Returns:
+        type: Mapper class, e.g. to pass as the `mapper` of a `WKTPlot`.
+
+    Raises:
+        ImportError: When the pair isn't registered and pyproj is not installed.
+    """
+
+    return _create_crs_mapper(normalize_crs(source_crs), normalize_crs(target_crs))
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+@lru_cache(maxsize=None)
+def _create_crs_mapper(source_crs: str, target_crs: str) -> CRSMeta:
+    return _build_crs_mapper(source_crs, target_crs, get_transform(source_crs, target_crs))
+
+
+def _build_crs_mapper(source_crs: str, target_crs: str, transform: TRANSFORM) -> CRSMeta:
+
+    # The name keys `GeometryCache` entries, so it differs for every CRS pair.
+    name = f"CRSMapper[{source_crs}->{target_crs}]"
+    return CRSMeta(name, (CRSMapper,), {
+        "__module__": __name__,
+        "__qualname__": name,
+        "source_crs": source_crs,
+        "target_crs": target_crs,
+        "_transform": staticmethod(transform),
+    })
+
+
+def _restore_crs_mapper(source_crs: str, target_crs: str, transform: TRANSFORM) -> CRSMeta:
+
+    # Worker processes don't share the registry, so registered transforms are registered again on arrival. A
+    # mapper created for the pair before then keeps its own transform.
+    if TRANSFORMS.get((source_crs, target_crs)) is not transform:
+        register_transform(source_crs, target_crs, transform)
+
+    mapper = get_crs_mapper(source_crs, target_crs)
+    if mapper._transform is not transform:
+        return _build_crs_mapper(source_crs, target_crs, transform)
+
+    return mapper
+
+
+def _reduce_crs_mapper(mapper: CRSMeta) -> Union[str, Tuple[Callable[..., CRSMeta], Tuple[object, ...]]]:
+
+    if mapper is CRSMapper:
+        return mapper.__qualname__
+
+    key = mapper.source_crs, mapper.target_crs
+    if key in _REGISTERED and TRANSFORMS[key] is mapper._transform:
+        return _restore_crs_mapper, (*key, mapper._transform)
+
+    return get_crs_mapper, key
+
+
+copyreg.pickle(CRSMeta, _reduce_crs_mapper)
@@ -0,0 +1,128 @@
+import numpy as np
+
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from wktplot.mappers.batch import GlyphBatch
+
+if TYPE_CHECKING:
+    from bokeh.document import Document
+    from bokeh.plotting import Figure
+
+
+class LiveUpdates:
+    """ Delivers new and changed rows of batched glyphs to a Bokeh server document.
+
+    New rows are sent with `ColumnDataSource.stream` and changed rows with `ColumnDataSource.patch`, so only the
+    changes are sent to the browser instead of the whole figure. Updates are queued, and every update queued before
+    the document's next tick is sent as one `stream` / `patch` call per source, so many small updates a second
+    don't turn into as many messages. Updates can be queued from any thread.
+    """
+
+    def __init__(self, document: "Document", figure: "Figure", rollover: Optional[int] = None) -> None:
+        """ Create live updates for the given figure, already added to `document`.
+
+        Args:
+            document (obj: Document): Bokeh server document showing the figure, e.g. the `doc` given to an app's
+                handler function, or `bokeh.plotting.curdoc()`.
+            figure (obj: Figure): Figure to update.
+            rollover (int | None, default = None): Optional maximum number of rows kept in each source. The
+                oldest rows are dropped first.
+        """
+
+        self.document = document
+        self.figure = figure
+        self.rollover = rollover
+        self._streams: Dict[Tuple[int, str], Tuple[GlyphBatch, List[Dict[str, Any]]]] = {}
+        self._patches: Dict[Tuple[int, str], Tuple[GlyphBatch, Dict[str, List[Tuple[int, Any]]]]] = {}
+        self._scheduled = False
+        self._lock = Lock()
+
+    def stream(self, batch: GlyphBatch, glyph_data: Dict[str, Dict[str, Any]]) -> None:
+        """ Queue new rows to append to the sources of `batch`.
+
+        Args:
+            batch (obj: GlyphBatch): Batch the rows belong to.
+            glyph_data (dict[str, dict[str, Any]]): New source data by glyph method name, see
+                `GlyphBatch.get_glyph_data`.
+        """
+
+        with self._lock:
+            for glyph, data in glyph_data.items():
+                self._streams.setdefault((id(batch), glyph), (batch, []))[1].append(data)
+
+        self._schedule()
+
+    def patch(self, batch: GlyphBatch, glyph: str, rows: Sequence[int], data: Dict[str, Any]) -> None:
+        """ Queue changed rows of the source of a glyph type of `batch`.
+
+        Args:
+            batch (obj: GlyphBatch): Batch the rows belong to.
+            glyph (str): Glyph method name, e.g. "scatter".
+            rows (list[int]): Index of each changed row in the source, counting from its oldest row.
+            data (dict[str, Any]): New source data, one value per row in `rows`.
+        """
+
+        with self._lock:
+            _, patches = self._patches.setdefault((id(batch), glyph), (batch, {}))
+            for name, values in data.items():
+                patches.setdefault(name, []).extend(zip(map(int, rows), values))
+
+        self._schedule()
+
+    def flush(self) -> None:
+        """ Send every queued update now. Must be called while holding the document lock, e.g. in a callback.
+        """
+
+        with self._lock:
+            streams, self._streams = self._streams, {}
+            patches, self._patches = self._patches, {}
+            self._scheduled = False
+
+        for (_, glyph), (batch, chunks) in streams.items():
+            data = join_glyph_data(chunks)
+            if glyph in batch.sources:
+                batch.sources[glyph].stream(data, self.rollover)
+                continue
+
+            # The first rows of a glyph type create its renderer.
+            if self.rollover is not None:
+                data = {name: values[-self.rollover:] for name, values in data.items()}
+            batch.draw(self.figure, {glyph: data})
+
+        for (_, glyph), (batch, patch) in patches.items():
+            batch.sources[glyph].patch(patch)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def _schedule(self) -> None:
+
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        self.document.add_next_tick_callback(self.flush)
+
+
+def join_glyph_data(chunks: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """ Join the given source data chunks, with the same columns, into one.
+            e.g. [{"x": array([1]), "xs": [a1]}, {"x": array([2]), "xs": [a2]}] --> {"x": array([1, 2]), "xs": [a1, a2]}
+
+    Args:
+        chunks (list[dict[str, Any]]): Source data chunks, each column an array or a list of rows.
+
+    Returns:
+        dict[str, Any]: Joined source data.
+    """
+
+    if len(chunks) == 1:
+        return chunks[0]
+
+    joined: Dict[str, Any] = {}
+    for name, first in chunks[0].items():
+        if isinstance(first, np.ndarray):
+            joined[name] = np.concatenate([chunk[name] for chunk in chunks])
+        else:
+            joined[name] = [row for chunk in chunks for row in chunk[name]]
+
+    return joined
@@ -1,84 +1,130 @@
 import numpy as np
 
-from shapely.geometry import Point, LineString, LinearRing, Polygon
-from typing import List, Tuple, Union
+from numpy.typing import DTypeLike
+from typing import Callable, Optional, Tuple, Union
 from wktplot.mappers.standard import StandardMapper
 
 
 EARTH_RADIUS: float = 6378137.0
 COORDINATES = Union[float, np.float64, np.ndarray]
 
+# Latitude limit of Web Mercator, where the projected map is square. Latitudes beyond it (up to the poles, which
+# project to infinity) are clamped, so no inf / NaN values reach the document.
+MAX_LATITUDE: float = float(np.degrees(np.arctan(np.sinh(np.pi))))
 
-def geographic_to_mercator(lat_deg: COORDINATES, lng_deg: COORDINATES) -> Tuple[COORDINATES, COORDINATES]:
+# Number of coordinates projected at a time, so intermediate values stay in cache and are computed in place.
+PROJECTION_CHUNK_SIZE: int = 2 ** 16
+
+# Scale factors of each projection step, computed once.
+_LNG_TO_X: float = EARTH_RADIUS * np.pi / 180.0
+_LAT_TO_HALF_RAD: float = np.pi / 360.0
+_Y_TO_RAD: float = 1.0 / EARTH_RADIUS
+
+
+def geographic_to_mercator(
+    lat_deg: COORDINATES,
+    lng_deg: COORDINATES,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    dtype: DTypeLike = np.float64,
+) -> Tuple[COORDINATES, COORDINATES]:
     """ Convert given lat / long coordinates to mercator coordinates.
         - https://en.wikipedia.org/wiki/Mercator_projection#Derivation
         - https://en.wikipedia.org/wiki/Transverse_Mercator_projection#Formulae_for_the_spherical_transverse_Mercator
 
+    Coordinates are projected in chunks of `PROJECTION_CHUNK_SIZE`, through one reused buffer, so large inputs
+    don't allocate a temporary array per step. Latitudes are clamped to +/- `MAX_LATITUDE`.
+
     Args:
         lat_deg (float | obj: np.ndarray): Latitude coordinates in degrees.
         lng_deg (float | obj: np.ndarray): Longitude coordinates in degrees.
+        out (tuple[obj: np.ndarray, obj: np.ndarray] | None, default = None): Optional arrays to write the
+            longitude and latitude mercator coordinates into, shaped like the inputs. May be the input arrays.
+        dtype (dtype, default = np.float64): Type of the returned coordinates when `out` is unset, e.g. np.float32
+            to halve their size. Computed in float64 either way.
 
     Return:
         tuple[float | obj: np.ndarray, float | obj: np.ndarray]: Tuple containing longitude and latitude mercator
             coordinates.
     """
 
-    φ = np.radians(lat_deg)
-    λ = np.radians(lng_deg)
+    def project(lat: np.ndarray, lng: np.ndarray, merc_lng: np.ndarray, merc_lat: np.ndarray) -> None:
+        np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE, out=merc_lat)
+        np.multiply(merc_lat, _LAT_TO_HALF_RAD, out=merc_lat)
+        np.add(merc_lat, np.pi / 4.0, out=merc_lat)
+        np.tan(merc_lat, out=merc_lat)
+        np.log(merc_lat, out=merc_lat)
+        np.multiply(merc_lat, EARTH_RADIUS, out=merc_lat)
+        np.multiply(lng, _LNG_TO_X, out=merc_lng)
 
-    merc_lat = EARTH_RADIUS * np.log(np.tan((np.pi / 4.0) + (φ / 2.0)))
-    merc_lng = EARTH_RADIUS * λ
+    return _map_chunks(project, lat_deg, lng_deg, out, dtype)
 
-    return merc_lng, merc_lat
 
+def mercator_to_geographic(
+    merc_lng: COORDINATES,
+    merc_lat: COORDINATES,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    dtype: DTypeLike = np.float64,
+) -> Tuple[COORDINATES, COORDINATES]:
+    """ Convert given mercator coordinates back to lat / long coordinates, the inverse of `geographic_to_mercator`.
+            e.g. mercator_to_geographic(*geographic_to_mercator(lat, lng)) --> (lat, lng)
 
-class OpenStreetMapper(StandardMapper):
+    Args:
+        merc_lng (float | obj: np.ndarray): Longitude mercator coordinates.
+        merc_lat (float | obj: np.ndarray): Latitude mercator coordinates.
+        out (tuple[obj: np.ndarray, obj: np.ndarray] | None, default = None): Optional arrays to write the
+            latitude and longitude coordinates into, shaped like the inputs. May be the input arrays.
+        dtype (dtype, default = np.float64): Type of the returned coordinates when `out` is unset.
 
-    @classmethod
-    def _get_point_coords(cls, shape: Point) -> Tuple[float, float]:
+    Return:
+        tuple[float | obj: np.ndarray, float | obj: np.ndarray]: Tuple containing latitude and longitude
+            coordinates in degrees.
+    """
 
-        geo_x, geo_y = super()._get_point_coords(shape)
-        merc_x, merc_y = map(
-            float,
-            geographic_to_mercator(
-                lat_deg=geo_x,
-                lng_deg=geo_y,
-            )
-        )
+    def unproject(x: np.ndarray, y: np.ndarray, lat: np.ndarray, lng: np.ndarray) -> None:
+        np.multiply(y, _Y_TO_RAD, out=lat)
+        np.sinh(lat, out=lat)
+        np.arctan(lat, out=lat)
+        np.degrees(lat, out=lat)
+        np.divide(x, _LNG_TO_X, out=lng)
 
-        return merc_x, merc_y
+    return _map_chunks(unproject, merc_lng, merc_lat, out, dtype)
 
-    @classmethod
-    def _get_line_string_coords(cls, shape: Union[LineString, LinearRing]) -> Tuple[List[float], List[float]]:
 
-        geo_x_list, geo_y_list = super()._get_line_string_coords(shape)
+def _map_chunks(
+    func: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], None],
+    a: COORDINATES,
+    b: COORDINATES,
+    out: Optional[Tuple[np.ndarray, np.ndarray]],
+    dtype: DTypeLike,
+) -> Tuple[COORDINATES, COORDINATES]:
 
-        merc_x, merc_y = map(
-            list,
-            geographic_to_mercator(
-                lat_deg=np.array(geo_x_list, dtype=float),
-                lng_deg=np.array(geo_y_list, dtype=float),
-            )
-        )
-        return merc_x, merc_y
+    a_arr = np.asarray(a, dtype=np.float64)
+    b_arr = np.asarray(b, dtype=np.float64)
+    first, second = out if out is not None else (np.empty(a_arr.shape, dtype), np.empty(b_arr.shape, dtype))
 
-    @classmethod
-    def _get_polygon_coords(cls, shape: Polygon) -> Tuple[List[List[float]], List[List[float]]]:
+    a_flat, b_flat = a_arr.reshape(-1), b_arr.reshape(-1)
+    first_flat, second_flat = first.reshape(-1), second.reshape(-1)
+    size = min(len(a_flat), PROJECTION_CHUNK_SIZE)
+    buffers = np.empty(size), np.empty(size)
+
+    # Each chunk is transformed into the float64 buffers and then copied out, so outputs can alias the inputs and
+    # be of a narrower type.
+    for start in range(0, len(a_flat), PROJECTION_CHUNK_SIZE):
+        chunk = slice(start, start + PROJECTION_CHUNK_SIZE)
+        count = len(a_flat[chunk])
+        buf_first, buf_second = buffers[0][:count], buffers[1][:count]
+        func(a_flat[chunk], b_flat[chunk], buf_first, buf_second)
+        first_flat[chunk] = buf_first
+        second_flat[chunk] = buf_second
 
-        merc_x_nested_list: List[List[float]] = []
-        merc_y_nested_list: List[List[float]] = []
+    if out is None and not a_arr.ndim:
+        return first[()], second[()]
 
-        geo_x_nested_list, geo_y_nested_list = super()._get_polygon_coords(shape)
+    return first, second
 
-        for geo_x_list, geo_y_list in zip(geo_x_nested_list, geo_y_nested_list):
-            merc_x_arr, merc_y_arr = map(
-                list,
-                geographic_to_mercator(
-                    lat_deg=np.array(geo_x_list, dtype=float),
-                    lng_deg=np.array(geo_y_list, dtype=float),
-                )
-            )
-            merc_x_nested_list.append(merc_x_arr)
-            merc_y_nested_list.append(merc_y_arr)
 
-        return merc_x_nested_list, merc_y_nested_list
+class OpenStreetMapper(StandardMapper):
+
+    @classmethod
+    def _project_coords(cls, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return geographic_to_mercator(lat_deg=x, lng_deg=y)
@@ -0,0 +1,92 @@
+from bokeh.models import ColumnDataSource, CustomJS
+from bokeh.plotting import Figure
+from typing import Dict, List, Sequence
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.mappers.batch import GlyphBatch
+
+
+# Glyphs whose coordinates change between detail levels, points are never simplified.
+PYRAMID_GLYPHS = ("multi_line", "multi_polygons")
+
+# Picks the coarsest level whose tolerance is within `pixel_tolerance` pixels at the current zoom. The coarsest level
+# is the drawn source itself, its data is kept aside whenever a finer level is swapped in, e.g. once loaded from a
+# sidecar.
+SWAP_LEVEL_JS = """
+if (!levels.slice(1).some((finer) => finer.data === source.data)) {
+    source.coarsest_data = source.data;
+}
+const units_per_pixel = Math.max(
+    (x_range.end - x_range.start) / plot.inner_width,
+    (y_range.end - y_range.start) / plot.inner_height,
+);
+let level = levels.length - 1;
+for (let i = 0; i < levels.length; i++) {
+    if (tolerances[i] <= pixel_tolerance * units_per_pixel) {
+        level = i;
+        break;
+    }
+}
+const data = level == 0 ? source.coarsest_data : levels[level].data;
+if (source.data !== data) {
+    source.data = data;
+}
+"""
+
+
+def flush_pyramid(
+    figure: Figure,
+    batch: GlyphBatch,
+    levels: Sequence[GeometryBuffers],
+    tolerances: Sequence[float],
+    pixel_tolerance: float,
+) -> Dict[str, List[ColumnDataSource]]:
+    """ Draw `batch` with several levels of detail, swapped in the browser as the figure is zoomed.
+
+    The coarsest level is drawn first, and stored only in the batch's sources. Every finer level is stored in its
+    own `ColumnDataSource`, and a `CustomJS` callback on the figure's x / y ranges swaps the level matching the
+    current zoom into the batch's sources.
+
+    Args:
+        figure (obj: Figure): Figure to draw onto.
+        batch (obj: GlyphBatch): Batch to draw.
+        levels (list[obj: GeometryBuffers]): Simplified copies of the batch's buffers, coarsest first.
+        tolerances (list[float]): Simplification tolerance of each level in data units, decreasing.
+        pixel_tolerance (float): Largest allowed deviation of the active level, in screen pixels.
+
+    Returns:
+        dict[str, list[obj: ColumnDataSource]]: Level sources by glyph method name, coarsest first. The coarsest
+            level's source is the batch's own source.
+    """
+
+    batch.flush(figure, levels[0])
+    level_data = [batch.get_glyph_data(level) for level in levels[1:]]
+
+    for glyph in PYRAMID_GLYPHS:
+        if glyph not in batch.sources:
+            continue
+
+        if glyph in batch.level_sources:
+            for source, data in zip(batch.level_sources[glyph][1:], level_data):
+                source.data = data[glyph]
+            continue
+
+        level_sources = [batch.sources[glyph]] + [ColumnDataSource(data=data[glyph]) for data in level_data]
+        batch.level_sources[glyph] = level_sources
+
+        callback = CustomJS(
+            args={
+                "source": batch.sources[glyph],
+                "levels": level_sources,
+                "tolerances": list(tolerances),
+                "pixel_tolerance": pixel_tolerance,
+                "plot": figure,
+                "x_range": figure.x_range,
+                "y_range": figure.y_range,
+            },
+            code=SWAP_LEVEL_JS,
+        )
+        for axis_range in (figure.x_range, figure.y_range):
+            axis_range.js_on_change("start", callback)
+            axis_range.js_on_change("end", callback)
+
+    return batch.level_sources
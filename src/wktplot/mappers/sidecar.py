@@ -0,0 +1,382 @@
+import base64
+import gzip
+import io
+import json
+import numpy as np
+import tempfile
+
+from bokeh.core.templates import get_env
+from bokeh.models import ColumnDataSource, Model
+from contextlib import ExitStack
+from jinja2 import Template
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from wktplot.common.quantize import quantize_coords
+from wktplot.common.store import NpyArrayFile
+from wktplot.common.topology import encode_arcs
+
+
+# Columns written to the sidecar file when a source has them, coordinates of every batched glyph.
+SIDECAR_COLUMNS = ("x", "y", "xs", "ys")
+
+# Typed arrays the page reads numeric columns into, by dtype name. 64-bit integers, e.g. counts and indexes, are
+# written as int32 and must fit in it. Columns of other dtypes can't be written.
+ARRAY_DTYPES = ("float64", "float32", "int8", "uint8", "int16", "uint16", "int32", "uint32")
+
+# Number of values converted and compressed at a time while writing a column, so large (e.g. memory-mapped)
+# columns are never copied whole.
+WRITE_BLOCK_SIZE: int = 2**20
+
+# Fetches the gzip-compressed sidecar (or decodes it from the page) once the document is embedded, and fills in
+# every source's columns. Numeric arrays are typed-array views into the decompressed buffer, quantized coordinates
+# are summed back up from their deltas, polygon rings are joined back from their shared arcs, and nested columns
+# are rebuilt from their counts.
+LOAD_SIDECAR_JS = """
+(function() {
+    const manifest = %(manifest)s;
+    const ARRAY_TYPES = {
+        float64: Float64Array, float32: Float32Array, int8: Int8Array, uint8: Uint8Array,
+        int16: Int16Array, uint16: Uint16Array, int32: Int32Array, uint32: Uint32Array,
+    };
+
+    function unflatten(flat, counts) {
+        let items = flat;
+        for (let level = counts.length - 1; level >= 0; level--) {
+            const grouped = [];
+            let start = 0;
+            const take = ArrayBuffer.isView(items) ? items.subarray.bind(items) : items.slice.bind(items);
+            for (const count of counts[level]) {
+                grouped.push(take(start, start + count));
+                start += count;
+            }
+            items = grouped;
+        }
+        return items;
+    }
+
+    function dequantize(deltas, column, array) {
+        const values = new Float64Array(deltas.length);
+        let step = 0;
+        for (let i = 0; i < deltas.length; i++) {
+            step += deltas[i];
+            values[i] = column.origin + step * column.scale;
+        }
+        for (const index of array(column.nan)) {
+            values[index] = NaN;
+        }
+        return values;
+    }
+
+    function read_coords(column, array) {
+        const flat = array(column.array);
+        return "scale" in column ? dequantize(flat, column, array) : flat;
+    }
+
+    function decode_arcs(arcs, array) {
+        const lengths = array(arcs.lengths);
+        const starts = new Int32Array(lengths.length);
+        for (let arc = 1; arc < lengths.length; arc++) {
+            starts[arc] = starts[arc - 1] + lengths[arc - 1];
+        }
+        const arc_x = read_coords(arcs.x, array);
+        const arc_y = read_coords(arcs.y, array);
+        const refs = array(arcs.refs);
+        const counts = array(arcs.counts);
+
+        // Consecutive arcs share their end points, so each arc contributes all but its last coordinate.
+        let next = 0;
+        const arc_index = refs.map((ref) => ref === 0 ? next++ : ref < 0 ? ~ref : ref - 1);
+        const size = arc_index.reduce((total, arc) => total + lengths[arc] - 1, 0);
+        const rings = {x: new Float64Array(size), y: new Float64Array(size), lengths: new Int32Array(counts.length)};
+        let i = 0;
+        let r = 0;
+        counts.forEach((count, ring) => {
+            const ring_start = i;
+            for (let a = r; a < r + count; a++) {
+                const arc = arc_index[a];
+                const ref = refs[a];
+                const last = lengths[arc] - 1;
+                for (let k = 0; k < last; k++, i++) {
+                    const j = starts[arc] + (ref < 0 ? last - k : k);
+                    rings.x[i] = arc_x[j];
+                    rings.y[i] = arc_y[j];
+                }
+            }
+            r += count;
+            rings.lengths[ring] = i - ring_start;
+        });
+        return rings;
+    }
+
+    async function load() {
+        const docs = window.Bokeh ? window.Bokeh.documents : [];
+        if (!docs.length) {
+            setTimeout(load, 10);
+            return;
+        }
+        const body = manifest.url
+            ? (await fetch(manifest.url)).body
+            : new Blob([Uint8Array.from(atob(manifest.data), (char) => char.charCodeAt(0))]).stream();
+        const buffer = await new Response(body.pipeThrough(new DecompressionStream("gzip"))).arrayBuffer();
+        const array = ([offset, length, dtype]) => new ARRAY_TYPES[dtype](buffer, offset, length);
+
+        for (const entry of manifest.sources) {
+            const source = docs[0].get_model_by_id(entry.id);
+            const rings = entry.arcs ? decode_arcs(entry.arcs, array) : null;
+            const data = {};
+            for (const [name, column] of Object.entries(entry.columns)) {
+                if ("values" in column) {
+                    data[name] = column.values;
+                    continue;
+                }
+                const counts = column.counts.map(array);
+                if ("arcs" in column) {
+                    data[name] = unflatten(rings[column.arcs], [...counts, rings.lengths]);
+                    continue;
+                }
+                data[name] = unflatten(read_coords(column, array), counts);
+            }
+            source.data = data;
+        }
+    }
+
+    window.addEventListener("load", load);
+})();
+"""
+
+
+def externalize_sources(
+    models: Iterator[Model],
+    path: Optional[Path],
+    quantize: Optional[int] = None,
+    topology: bool = False,
+    streams: Optional[Mapping[str, Iterable[Dict[str, Any]]]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """ Move the columns of every `ColumnDataSource` among the given models into a compressed binary sidecar file.
+
+    Numeric columns, including nested coordinate lists of `multi_line` / `multi_polygons` sources, are written to
+    `path` as flat arrays plus per-level counts, and other columns (e.g. color names) are kept in the manifest.
+    Sources with columns of 2D arrays (e.g. `image_rgba` images) are left in the page whole, as Bokeh already
+    encodes their arrays as binary.
+    Sources with coordinate columns are left with empty columns, to be filled in by `get_sidecar_template`'s
+    loader once the sidecar is fetched. Without a `path`, the compressed sidecar is embedded in the manifest.
+
+    Sources too large to hold in memory can be given as `streams` of data chunks instead, e.g. from
+    `GlyphBatch.iter_glyph_data`. Their flattened chunks are spilled to temporary files next to `path`, and copied
+    into the sidecar block by block.
+
+    Args:
+        models (iterable[obj: Model]): Models to search for sources, e.g. `figure.references()`.
+        path (obj: Path | None): Sidecar file to write, e.g. "plot.bin", or None to embed it in the manifest.
+        quantize (int | None, default = None): Optional number of grid steps spanning the bounds of each
+            coordinate column, to quantize and delta-encode coordinates to, see `quantize_coords`.
+        topology (bool, default = False): Store the rings of `multi_polygons` sources as arcs, each border shared
+            by neighbouring polygons written once, see `encode_arcs`.
+        streams (dict[str, iterable[dict[str, Any]]] | None, default = None): Optional data chunks by source id,
+            written instead of the data of those sources, which should have every column of the chunks.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, dict[str, Any]]]: Manifest describing the sidecar, and the original data
+            of every emptied source by source id, to restore with `restore_sources`.
+
+    Raises:
+        ValueError: When a numeric column's dtype is not one of `ARRAY_DTYPES`, or 64-bit integers don't fit in
+            int32.
+    """
+
+    streams = streams or {}
+    manifest: Dict[str, Any] = {"sources": []}
+    originals: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+
+    with ExitStack() as stack:
+        output: BinaryIO = stack.enter_context(io.BytesIO() if path is None else path.open("wb"))
+        compressed = stack.enter_context(gzip.GzipFile(fileobj=output, mode="wb"))
+        if streams:
+            spill_dir = stack.enter_context(tempfile.TemporaryDirectory(dir=path.parent if path else None))
+
+        def write(values: np.ndarray) -> List[Any]:
+            nonlocal offset
+            dtype = _get_array_dtype(values.dtype)
+            for start in range(0, len(values), WRITE_BLOCK_SIZE):
+                block = values[start:start + WRITE_BLOCK_SIZE]
+                if block.dtype != dtype:
+                    _check_int32(block)
+                compressed.write(np.ascontiguousarray(block, dtype=dtype).tobytes())
+
+            size = len(values) * np.dtype(dtype).itemsize
+            padding = -size % 8
+            compressed.write(bytes(padding))
+
+            location = [offset, len(values), dtype]
+            offset += size + padding
+            return location
+
+        def write_coords(values: np.ndarray) -> Dict[str, Any]:
+            if not quantize or values.dtype.kind != "f":
+                return {"array": write(values)}
+
+            deltas, origin, scale, nan_index = quantize_coords(values[:], quantize)
+            return {"array": write(deltas), "origin": origin, "scale": scale, "nan": write(nan_index)}
+
+        for source in models:
+            if not isinstance(source, ColumnDataSource) or not set(SIDECAR_COLUMNS) & set(source.data):
+                continue
+
+            entry: Dict[str, Any] = {"id": source.id, "columns": {}}
+            columns = entry["columns"]
+            streamed = source.id in streams
+            if streamed:
+                flattened = _spill_chunks(streams[source.id], Path(tempfile.mkdtemp(dir=spill_dir)))
+            else:
+                flattened = {name: flatten_column(values) for name, values in source.data.items()}
+
+            # Sources of images and other 2D columns stay in the page.
+            if any(getattr(flat, "ndim", 1) > 1 for flat, _ in flattened.values()):
+                continue
+
+            # Rings of polygon sources, nested as rows of polygons of rings, are joined from arcs shared between
+            # them.
+            if topology and all(len(flattened.get(name, ((), ()))[1]) == 3 for name in ("xs", "ys")):
+                (x, counts), (y, _) = flattened.pop("xs"), flattened.pop("ys")
+                arc_x, arc_y, arc_lengths, refs, ring_counts = encode_arcs(x[:], y[:], counts[-1][:])
+                entry["arcs"] = {
+                    "x": write_coords(arc_x),
+                    "y": write_coords(arc_y),
+                    "lengths": write(arc_lengths),
+                    "refs": write(refs),
+                    "counts": write(ring_counts),
+                }
+                for name in ("xs", "ys"):
+                    columns[name] = {"arcs": name[0], "counts": [write(count) for count in counts[:-1]]}
+
+            for name, (flat, counts) in flattened.items():
+                if flat.dtype.kind not in "fiu":
+                    columns[name] = {"values": np.asarray(flat if streamed else source.data[name]).tolist()}
+                elif name in SIDECAR_COLUMNS:
+                    columns[name] = {**write_coords(flat), "counts": [write(count) for count in counts]}
+                else:
+                    columns[name] = {"array": write(flat), "counts": [write(count) for count in counts]}
+
+            manifest["sources"].append(entry)
+            originals[source.id] = dict(source.data)
+            source.data = {name: [] for name in source.data}
+
+        compressed.close()
+        if path is None:
+            manifest["data"] = base64.b64encode(output.getvalue()).decode("ascii")
+        else:
+            manifest["url"] = path.name
+
+    return manifest, originals
+
+
+def restore_sources(models: Iterator[Model], originals: Dict[str, Dict[str, Any]]) -> None:
+    """ Put back the data of sources emptied by `externalize_sources`.
+
+    Args:
+        models (iterable[obj: Model]): Models the sources were taken from.
+        originals (dict[str, dict[str, Any]]): Original data by source id.
+    """
+
+    for source in models:
+        if isinstance(source, ColumnDataSource) and source.id in originals:
+            source.data = originals[source.id]
+
+
+def get_sidecar_template(manifest: Dict[str, Any]) -> Template:
+    """ Get a Bokeh file template that loads the sidecar described by `manifest` after the document is embedded.
+
+    A sidecar file is fetched relative to the HTML file, so the page must be served over HTTP(S). Embedded
+    sidecars work from a local file too.
+
+    Args:
+        manifest (dict[str, Any]): Manifest returned by `externalize_sources`.
+
+    Returns:
+        obj: Template: Template to pass to `bokeh.io.save`.
+    """
+
+    script = LOAD_SIDECAR_JS % {"manifest": json.dumps(manifest).replace("</", "<\\/")}
+    return get_env().from_string(
+        '{% extends "file.html" %}{% block postamble %}'
+        f'<script type="text/javascript">{{% raw %}}{script}{{% endraw %}}</script>'
+        '{% endblock %}'
+    )
+
+
+def flatten_column(values: Any) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """ Flatten a source column into one array plus the item count of each nesting level, outermost first.
+            e.g. [[a1, a2], [a3]] (arrays) --> (concat(a1, a2, a3), [[2, 1], [len(a1), len(a2), len(a3)]])
+
+    Args:
+        values (list | obj: np.ndarray): Source column, flat or nested lists of arrays.
+
+    Returns:
+        tuple[obj: np.ndarray, list[obj: np.ndarray]]: Flat values, and the counts of each nesting level.
+    """
+
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values, []
+
+    counts: List[np.ndarray] = []
+    level = list(values)
+    while level and isinstance(level[0], (list, tuple, np.ndarray)):
+        counts.append(np.array([len(item) for item in level], dtype=np.int64))
+        if isinstance(level[0], np.ndarray) and level[0].dtype != object:
+            return np.concatenate(level), counts
+
+        level = [sub for item in level for sub in item]
+
+    return np.asarray(level), counts
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def _get_array_dtype(dtype: np.dtype) -> str:
+
+    if dtype.name in ARRAY_DTYPES:
+        return dtype.name
+
+    if dtype.kind in "iu" and dtype.itemsize == 8:
+        return "int32"
+
+    raise ValueError(f"Columns of dtype {dtype} can not be written to the sidecar, use one of {ARRAY_DTYPES}.")
+
+
+def _check_int32(values: np.ndarray) -> None:
+
+    limits = np.iinfo(np.int32)
+    if len(values) and (values.min() < limits.min or values.max() > limits.max):
+        raise ValueError(f"Column values between {values.min()} and {values.max()} do not fit in int32.")
+
+
+def _spill_chunks(chunks: Iterable[Dict[str, Any]], directory: Path) -> Dict[str, Tuple[Any, List[Any]]]:
+
+    # Numeric columns and their counts are appended to files chunk by chunk, and written from the files slice by
+    # slice. Other columns, one value per row, are joined in memory.
+    files: Dict[str, Tuple[NpyArrayFile, List[NpyArrayFile]]] = {}
+    values: Dict[str, List[np.ndarray]] = {}
+
+    for data in chunks:
+        for name, column in data.items():
+            flat, counts = flatten_column(column)
+            if flat.dtype.kind not in "fiu":
+                values.setdefault(name, []).append(flat.astype(object))
+                continue
+
+            if name not in files:
+                prefix = directory / str(len(files))
+                files[name] = (
+                    NpyArrayFile(prefix.with_suffix(".npy"), flat.dtype),
+                    [NpyArrayFile(prefix.with_suffix(f".{level}.npy"), np.int64) for level in range(len(counts))],
+                )
+
+            flat_file, count_files = files[name]
+            flat_file.append(flat)
+            for count_file, level_counts in zip(count_files, counts):
+                count_file.append(level_counts)
+
+    flattened: Dict[str, Tuple[Any, List[Any]]] = dict(files)
+    flattened.update({name: (np.concatenate(chunks), []) for name, chunks in values.items()})
+    return flattened
@@ -1,16 +1,34 @@
-from bokeh.plotting import Figure
+import numpy as np
+import shapely
+
 from shapely import wkt
-from shapely.geometry import Point, LineString, LinearRing, Polygon
+from shapely.geometry import GeometryCollection, Point, LineString, LinearRing, Polygon
 from shapely.geometry.base import BaseGeometry, BaseMultipartGeometry
-from typing import Any, Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+from wktplot.common.buffers import GeometryBuffers, split_xy
+from wktplot.common.parsing import SHAPE_INPUT, parse_shapes
 from wktplot.common.types import SUPPORTED_GEOMS
 from wktplot.mappers.base import BaseMapper
+from wktplot.mappers.batch import GlyphBatch
+
+if TYPE_CHECKING:
+    from bokeh.plotting import Figure
 
 
 class StandardMapper(BaseMapper):
 
     @classmethod
-    def add_shape(cls, figure: Figure, shape: Union[str, BaseGeometry], **style_kwargs: Dict[str, Any]) -> None:
+    def add_shape(
+        cls,
+        figure: "Figure",
+        shape: Union[str, BaseGeometry],
+        batched: bool = False,
+        **style_kwargs: Dict[str, Any],
+    ) -> None:
+
+        if batched:
+            cls._draw_batched(figure, shape, **style_kwargs)
+            return
 
         if isinstance(shape, str):
             shape = wkt.loads(shape)
@@ -23,47 +41,123 @@ class StandardMapper(BaseMapper):
         if shape.is_empty:
             return
 
-        if isinstance(shape, BaseMultipartGeometry):
-            for poly in shape.geoms:
-                cls.add_shape(figure, poly, **style_kwargs)
+        # Collections may be nested arbitrarily deep or hold many parts. They're flattened in one vectorized pass
+        # into typed point, line and polygon buffers, and drawn as one glyph per type instead of one per part.
+        if isinstance(shape, GeometryCollection):
+            cls._draw_batched(figure, shape, **style_kwargs)
+            return
+
+        parts = shape.geoms if isinstance(shape, BaseMultipartGeometry) else [shape]
+        for part in parts:
+            if part.is_empty:
+                continue
+
+            if isinstance(part, Point):
+                x, y = cls._get_point_coords(part)
+                figure.circle(x, y, **style_kwargs)
 
-        elif isinstance(shape, Point):
-            x, y = cls._get_point_coords(shape)
-            figure.circle(x, y, **style_kwargs)
+            elif isinstance(part, (LineString, LinearRing)):
+                x, y = cls._get_line_string_coords(part)
+                figure.line(x, y, **style_kwargs)
 
-        elif isinstance(shape, (LineString, LinearRing)):
-            x, y = cls._get_line_string_coords(shape)
-            figure.line(x, y, **style_kwargs)
+            elif isinstance(part, Polygon):
+                x, y = cls._get_polygon_coords(part)
+                figure.multi_polygons([[x]], [[y]], **style_kwargs)
+
+    @classmethod
+    def add_to_batch(cls, batch: GlyphBatch, shape: Union[str, BaseGeometry]) -> None:
+        """ Add every part of the given `shape` to `batch` as a single shape.
+
+        Args:
+            batch (obj: GlyphBatch): Batch to add the shape to.
+            shape (str | obj: BaseGeometry): Shape to add.
+
+        Raises:
+            TypeError: When given `shape` type is not currently supported.
+        """
+
+        cls.add_shapes_to_batch(batch, [shape])
+
+    @classmethod
+    def add_shapes_to_batch(
+        cls,
+        batch: GlyphBatch,
+        shapes: Union[Iterable[SHAPE_INPUT], np.ndarray],
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        """ Add the given `shapes` to `batch`, parsing and extracting coordinates in bulk.
+
+        Args:
+            batch (obj: GlyphBatch): Batch to add the shapes to.
+            shapes (iterable | obj: np.ndarray): Well-known-text strings, well-known-binary bytes or shapely objects.
+            columns (dict[str, obj: np.ndarray] | None, default = None): Per-shape style values for the batch.
+
+        Raises:
+            TypeError: When any of the given `shapes` is of an unsupported type.
+            ValueError: When the given `columns` don't have one value per shape.
+        """
+
+        batch.add_buffers(cls.get_buffers(parse_shapes(shapes)), columns)
+
+    @classmethod
+    def get_buffers(cls, geoms: np.ndarray) -> GeometryBuffers:
+        """ Extract the coordinate buffers of the given geometries, projected in a single call.
 
-        elif isinstance(shape, Polygon):
-            x, y = cls._get_polygon_coords(shape)
-            figure.multi_polygons([[x]], [[y]], **style_kwargs)
+        Args:
+            geoms (obj: np.ndarray): 1D array of shapely geometries, e.g. from `parse_shapes`.
+
+        Returns:
+            obj: GeometryBuffers: Projected coordinate buffers, one shape per given geometry.
+        """
+
+        return cls.project_buffers(GeometryBuffers.from_geometries(geoms))
+
+    @classmethod
+    def project_buffers(cls, buffers: GeometryBuffers) -> GeometryBuffers:
+        """ Project the coordinates of the given unprojected buffers, e.g. from `GeometryBuffers.from_geometries`.
+
+        Args:
+            buffers (obj: GeometryBuffers): Coordinate buffers to project.
+
+        Returns:
+            obj: GeometryBuffers: Projected coordinate buffers.
+        """
+
+        return buffers.map_coords(cls._project_coords)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
     @classmethod
-    def _get_point_coords(cls, shape: Point) -> Tuple[float, float]:
-        return shape.x, shape.y
+    def _draw_batched(cls, figure: "Figure", shape: SHAPE_INPUT, **style_kwargs: Dict[str, Any]) -> None:
+
+        batch = GlyphBatch(**style_kwargs)
+        cls.add_to_batch(batch, shape)
+        batch.flush(figure)
 
     @classmethod
-    def _get_line_string_coords(cls, shape: Union[LineString, LinearRing]) -> Tuple[List[float], List[float]]:
-        x, y = map(list, shape.xy)
+    def _get_point_coords(cls, shape: Point) -> Tuple[float, float]:
+        x, y = map(float, cls._project_coords(shape.x, shape.y))
         return x, y
 
     @classmethod
-    def _get_polygon_coords(self, shape: Polygon) -> Tuple[List[List[float]], List[List[float]]]:
+    def _get_line_string_coords(cls, shape: Union[LineString, LinearRing]) -> Tuple[np.ndarray, np.ndarray]:
+        return cls._project_coords(*split_xy(shapely.get_coordinates(shape)))
 
-        ext_x, ext_y = map(list, shape.exterior.xy)
+    @classmethod
+    def _get_polygon_coords(cls, shape: Polygon) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+
+        # Project every ring in one call, then split the flat result back into per-ring views.
+        rings = shapely.get_rings(shape)
+        split_at = np.cumsum(shapely.get_num_coordinates(rings))[:-1]
+        x, y = cls._project_coords(*split_xy(shapely.get_coordinates(rings)))
 
         # Shape coordinates start and end with the same value.
         # Chop off last coordinate for Bokeh.
-        x: List[float] = [ext_x[:-1]]
-        y: List[float] = [ext_y[:-1]]
-
-        for intr_shape in shape.interiors:
-            intr_x, intr_y = map(list, intr_shape.xy)
+        x_rings: List[np.ndarray] = [ring[:-1] for ring in np.split(x, split_at)]
+        y_rings: List[np.ndarray] = [ring[:-1] for ring in np.split(y, split_at)]
 
-            x.append(intr_x[:-1])
-            y.append(intr_y[:-1])
+        return x_rings, y_rings
 
+    @classmethod
+    def _project_coords(cls, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         return x, y
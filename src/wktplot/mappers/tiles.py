@@ -0,0 +1,144 @@
+import numpy as np
+
+from bokeh.models import CDSView, CustomJS, IndexFilter
+from bokeh.plotting import Figure
+from typing import Any, Dict, Tuple
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.mappers.batch import GlyphBatch
+
+
+# Shows only the rows of tiles whose bounding box intersects the visible ranges.
+CULL_TILES_JS = """
+const x0 = Math.min(x_range.start, x_range.end);
+const x1 = Math.max(x_range.start, x_range.end);
+const y0 = Math.min(y_range.start, y_range.end);
+const y1 = Math.max(y_range.start, y_range.end);
+const indices = [];
+for (let tile = 0; tile < offsets.length - 1; tile++) {
+    if (min_x[tile] <= x1 && max_x[tile] >= x0 && min_y[tile] <= y1 && max_y[tile] >= y0) {
+        for (let i = offsets[tile]; i < offsets[tile + 1]; i++) {
+            indices.push(i);
+        }
+    }
+}
+filter.indices = indices;
+"""
+
+
+def get_tile_order(
+    row_bounds: np.ndarray,
+    bounds: Tuple[float, float, float, float],
+    grid_size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Sort rows by the grid cell holding the center of their bounding box.
+
+    Args:
+        row_bounds (obj: np.ndarray): (rows, 4) array of (min x, min y, max x, max y) per row.
+        bounds (tuple[float, float, float, float]): Extent the grid covers, as (min x, min y, max x, max y).
+        grid_size (int): Number of cells along each axis.
+
+    Returns:
+        tuple[obj: np.ndarray, obj: np.ndarray, obj: np.ndarray]: Row order grouping rows by tile, the row offset
+            of each non-empty tile (plus the total), and the (tiles, 4) bounding box of each tile's rows.
+    """
+
+    min_x, min_y, max_x, max_y = bounds
+    center_x = (row_bounds[:, 0] + row_bounds[:, 2]) / 2
+    center_y = (row_bounds[:, 1] + row_bounds[:, 3]) / 2
+
+    cell_x = np.clip(((center_x - min_x) / max(max_x - min_x, 1e-12) * grid_size).astype(np.int64), 0, grid_size - 1)
+    cell_y = np.clip(((center_y - min_y) / max(max_y - min_y, 1e-12) * grid_size).astype(np.int64), 0, grid_size - 1)
+    cells = cell_y * grid_size + cell_x
+
+    order = np.argsort(cells, kind="stable")
+    sorted_cells = cells[order]
+    tile_start = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    offsets = np.r_[tile_start, len(order)]
+
+    sorted_bounds = row_bounds[order]
+    tile_bounds = np.column_stack((
+        np.minimum.reduceat(sorted_bounds[:, 0], tile_start),
+        np.minimum.reduceat(sorted_bounds[:, 1], tile_start),
+        np.maximum.reduceat(sorted_bounds[:, 2], tile_start),
+        np.maximum.reduceat(sorted_bounds[:, 3], tile_start),
+    ))
+
+    return order, offsets, tile_bounds
+
+
+def flush_tiles(
+    figure: Figure,
+    batch: GlyphBatch,
+    buffers: GeometryBuffers,
+    bounds: Tuple[float, float, float, float],
+    grid_size: int,
+) -> Dict[str, np.ndarray]:
+    """ Draw `batch` tiled on a grid, so the browser only draws the tiles intersecting the current viewport.
+
+    Rows of every source are sorted by grid cell, so each tile is a contiguous block of rows, stored once. A
+    `CustomJS` callback on the figure's x / y ranges sets the renderer's `IndexFilter` to the rows of the tiles
+    whose bounding box intersects the visible area.
+
+    Args:
+        figure (obj: Figure): Figure to draw onto.
+        batch (obj: GlyphBatch): Batch to draw.
+        buffers (obj: GeometryBuffers): Buffers to draw, e.g. the batch's buffers or a simplified copy.
+        bounds (tuple[float, float, float, float]): Extent of the grid, usually the extent of all plotted data.
+        grid_size (int): Number of cells along each axis.
+
+    Returns:
+        dict[str, obj: np.ndarray]: (tiles, 4) bounding box of each tile, by glyph method name.
+    """
+
+    glyph_data = batch.get_glyph_data(buffers)
+    row_bounds = {
+        "scatter": np.column_stack((buffers.point_x, buffers.point_y, buffers.point_x, buffers.point_y)),
+        "multi_line": buffers.line_row_bounds(),
+        "multi_polygons": buffers.polygon_row_bounds(),
+    }
+
+    tile_offsets: Dict[str, np.ndarray] = {}
+    tile_bounds: Dict[str, np.ndarray] = {}
+
+    for glyph, data in glyph_data.items():
+        order, tile_offsets[glyph], tile_bounds[glyph] = get_tile_order(row_bounds[glyph], bounds, grid_size)
+        glyph_data[glyph] = {name: _take_rows(column, order) for name, column in data.items()}
+
+    batch.draw(figure, glyph_data)
+
+    for glyph in glyph_data:
+        args = {
+            "offsets": tile_offsets[glyph].tolist(),
+            "min_x": tile_bounds[glyph][:, 0].tolist(),
+            "min_y": tile_bounds[glyph][:, 1].tolist(),
+            "max_x": tile_bounds[glyph][:, 2].tolist(),
+            "max_y": tile_bounds[glyph][:, 3].tolist(),
+        }
+
+        if glyph in batch.tile_callbacks:
+            batch.tile_callbacks[glyph].args.update(args)
+            batch.tile_callbacks[glyph].args["filter"].indices = None
+            continue
+
+        index_filter = IndexFilter()
+        batch.renderers[glyph].view = CDSView(source=batch.sources[glyph], filters=[index_filter])
+
+        callback = CustomJS(
+            args={**args, "filter": index_filter, "x_range": figure.x_range, "y_range": figure.y_range},
+            code=CULL_TILES_JS,
+        )
+        for axis_range in (figure.x_range, figure.y_range):
+            axis_range.js_on_change("start", callback)
+            axis_range.js_on_change("end", callback)
+
+        batch.tile_callbacks[glyph] = callback
+
+    return tile_bounds
+
+
+def _take_rows(column: Any, order: np.ndarray) -> Any:
+
+    if isinstance(column, np.ndarray):
+        return column[order]
+
+    return [column[i] for i in order]
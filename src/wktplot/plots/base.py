@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod, abstractclassmethod
 from bokeh import plotting as plt
+from concurrent.futures import Executor
+from pathlib import Path
 from shapely.geometry.base import BaseGeometry
-from typing import Any, Dict, Union
+from typing import TYPE_CHECKING, Any, AsyncIterable, Dict, Iterable, Mapping, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from bokeh.document import Document
 
 
 class BasePlot(ABC):
@@ -21,11 +26,78 @@ class BasePlot(ABC):
         """
 
     @abstractmethod
-    def save(self) -> None:
-        """ Wrapper method around `bokeh.plotting.save`.
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """ Render the plot to a standalone HTML file.
 
-        See source for more info:
-        https://docs.bokeh.org/en/latest/docs/reference/io.html#bokeh.io.save
+        Unlike `bokeh.plotting.save`, no global Bokeh output state is used, so plots can be saved from several
+        threads at once, e.g. with `wktplot.plots.batch.render_plots`.
+
+        Args:
+            path (str | obj: Path | None, default = None): Optional file to write, defaults to the plot's title in
+                its `save_dir`.
+
+        Returns:
+            obj: Path: Path of the written file.
+        """
+
+    @abstractmethod
+    async def save_async(self, path: Optional[Union[str, Path]] = None, executor: Optional[Executor] = None) -> Path:
+        """ Save the plot without blocking the running event loop, see `save`.
+
+        Args:
+            path (str | obj: Path | None, default = None): Optional file to save to.
+            executor (obj: Executor | None, default = None): Thread pool to serialize the plot on, defaults to the
+                event loop's default executor.
+
+        Returns:
+            obj: Path: Path of the saved file.
+        """
+
+    @abstractmethod
+    def bind(self, document: "Document", rollover: Optional[int] = None) -> None:
+        """ Show the plot in a Bokeh server document, and stream shapes added from now on to the browser.
+            e.g. plot.bind(curdoc(), rollover=10000)
+
+        Shapes added so far are drawn, and the figure is added to `document`. Shapes added afterwards are always
+        batched, and are appended to the shown glyphs' data sources with `ColumnDataSource.stream` instead of
+        re-sending the figure. Every shape added before the document's next tick is sent at once, so shapes can
+        be added from any thread, thousands of times a second.
+
+        Args:
+            document (obj: Document): Bokeh server document, e.g. the `doc` given to a `bokeh serve` app's handler.
+            rollover (int | None, default = None): Optional maximum number of rows kept in each glyph's data
+                source, dropping the oldest rows first. Points take one row each, lines and polygons one row per
+                shape.
+
+        Raises:
+            ValueError: When the plot is already bound, or uses `render_mode` "raster" or detail options.
+        """
+
+    @abstractmethod
+    def patch_shapes(
+        self,
+        rows: Sequence[int],
+        shapes: Iterable[Union[str, bytes, BaseGeometry]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        **style_kwargs: dict,
+    ) -> None:
+        """ Replace shapes shown in the bound document, with `ColumnDataSource.patch`, e.g. to move a vehicle.
+            e.g. plot.patch_shapes([3], ["POINT (4 2)"], fill_color="red")
+
+        Each new shape replaces the row at the matching index of the data source of its glyph type, among the
+        shapes added with the same style attributes. Rows count from the oldest row still shown, see `bind`.
+
+        Args:
+            rows (list[int]): Row index of each shape to replace.
+            shapes (iterable): New shapes, each drawn as one row, e.g. a point, a line or a polygon.
+            data (dict[str, list] | None, default = None): Optional table of per-shape style values, see
+                `add_shapes`.
+            **style_kwargs (dict): Style attributes the replaced shapes were added with.
+
+        Raises:
+            TypeError: When any of the given `shapes` is of an unsupported type.
+            ValueError: When the plot isn't bound, `rows` doesn't have one value per shape, a shape is drawn as
+                several rows, or no shapes are shown with the given style.
         """
 
     @abstractmethod
@@ -49,3 +121,98 @@ class BasePlot(ABC):
         Raises:
             TypeError: When given `shape` type is not currently supported.
         """
+
+    @abstractmethod
+    def add_shapes(
+        self,
+        shapes: Iterable[Union[str, bytes, BaseGeometry]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        workers: Optional[int] = None,
+        **style_kwargs: dict,
+    ) -> None:
+        """ Plot many well-known-text strings, well-known-binary bytes or shapely objects at once.
+
+        Shapes are parsed and their coordinates extracted in bulk, then drawn with one renderer per glyph type
+        when the plot is saved or shown. Style attributes given as lists or arrays with one value per shape, or as
+        the name of a column in `data`, are applied per shape. Other lists, e.g. `line_dash=[4, 4]`, are shared.
+            e.g. plot.add_shapes(shapes, data={"width": [1, 2]}, fill_color=["red", "blue"], line_width="width")
+
+        Args:
+            shapes (iterable | obj: np.ndarray): List, generator or NumPy object array of shapes to plot.
+            data (dict[str, list] | None, default = None): Optional table of per-shape style values, e.g. a
+                pandas DataFrame, with one value per shape in each column.
+            workers (int | None, default = None): Optional number of processes to parse shapes and extract their
+                coordinates on in parallel. Results are merged in input order.
+            **style_kwargs (dict): Dictionary of attributes to style the given shapes.
+                See this guide for available style attributes:
+                https://docs.bokeh.org/en/latest/docs/user_guide/styling.html
+
+        Raises:
+            TypeError: When any of the given `shapes` is of an unsupported type.
+            ValueError: When a per-shape style attribute doesn't have one value per shape.
+        """
+
+    @abstractmethod
+    async def add_shapes_async(
+        self,
+        shapes: Union[AsyncIterable[Union[str, bytes, BaseGeometry]], Iterable[Union[str, bytes, BaseGeometry]]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        chunk_size: int = 65536,
+        executor: Optional[Executor] = None,
+        max_pending: int = 2,
+        **style_kwargs: dict,
+    ) -> None:
+        """ Plot the shapes of an async iterator without blocking the running event loop, see `add_shapes`.
+            e.g. await plot.add_shapes_async(feed(), chunk_size=1000, fill_color="red")
+
+        Shapes are pulled from `shapes` in chunks, and each chunk is parsed and projected on `executor`. Once
+        `max_pending` chunks are being processed, no more shapes are pulled until the oldest one is done, so memory
+        stays bounded however fast the producer is. Chunks are added to the plot in input order.
+
+        Args:
+            shapes (async iterable | iterable): Shapes to plot.
+            data (dict[str, list] | None, default = None): Optional table of per-shape style values, see `add_shapes`.
+            chunk_size (int, default = 65536): Number of shapes parsed at a time.
+            executor (obj: Executor | None, default = None): Pool to parse chunks on, defaults to the event loop's
+                default thread pool. Plots with a cache need a thread pool.
+            max_pending (int, default = 2): Maximum number of chunks being parsed at once.
+            **style_kwargs (dict): Dictionary of attributes to style the given shapes.
+                See this guide for available style attributes:
+                https://docs.bokeh.org/en/latest/docs/user_guide/styling.html
+
+        Raises:
+            TypeError: When any of the given `shapes` is of an unsupported type.
+            ValueError: When a per-shape style attribute doesn't have one value per shape.
+        """
+
+    @abstractmethod
+    def add_file(
+        self,
+        path: Union[str, Path],
+        format: str = "wkt",
+        chunk_size: int = 65536,
+        geometry_column: str = "geometry",
+        workers: Optional[int] = None,
+        **style_kwargs: dict,
+    ) -> None:
+        """ Plot every shape in the given file, streamed in chunks so memory use stays bounded.
+
+        Supported formats are line-delimited well-known-text ("wkt"), line-delimited hex well-known-binary
+        ("wkb"), newline-delimited GeoJSON ("geojsonl"), and CSV with a well-known-text geometry column ("csv").
+        Style attributes naming another CSV column are applied per shape, as with `add_shapes`.
+
+        Args:
+            path (str | obj: Path): Path of the file to plot.
+            format (str, default = "wkt"): File format.
+            chunk_size (int, default = 65536): Number of shapes parsed at a time.
+            geometry_column (str, default = "geometry"): Name of the geometry column, for CSV files.
+            workers (int | None, default = None): Optional number of processes to parse chunks on in parallel.
+                Chunks are merged in file order.
+            **style_kwargs (dict): Dictionary of attributes to style the shapes.
+                See this guide for available style attributes:
+                https://docs.bokeh.org/en/latest/docs/user_guide/styling.html
+
+        Raises:
+            ValueError: When given `format` is not supported, or `geometry_column` is missing from a CSV file.
+            OSError: When the file can not be read.
+        """
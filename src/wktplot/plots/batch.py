@@ -0,0 +1,105 @@
+import os
+
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+from wktplot.plots.standard import WKTPlot
+
+
+class PlotSpec:
+    """ Description of one plot to render with `render_plots`.
+
+    Specs only hold plain data, so they can be sent to worker processes.
+
+    Attributes:
+        title (str): Title of the plot.
+        layers (list[tuple[iterable, dict[str, Any]]]): Shapes added to the plot with `add_shapes`, each paired
+            with its style attributes.
+        path (obj: Path | None): Optional file to save the plot to, see `WKTPlot.save`.
+        plot_class (type): Plot class to create, e.g. `OpenStreetMapsPlot`.
+        plot_kwargs (dict[str, Any]): Other arguments to create the plot with, e.g. `save_dir`.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        layers: Sequence[Tuple[Iterable[Any], Dict[str, Any]]] = (),
+        path: Optional[Union[str, Path]] = None,
+        plot_class: Type[WKTPlot] = WKTPlot,
+        **plot_kwargs: Dict[str, Any],
+    ) -> None:
+
+        self.title = title
+        self.layers = list(layers)
+        self.path = path
+        self.plot_class = plot_class
+        self.plot_kwargs = plot_kwargs
+
+
+def render_plot(spec: PlotSpec) -> Path:
+    """ Create, fill and save the plot described by `spec`.
+
+    Args:
+        spec (obj: PlotSpec): Plot to render.
+
+    Returns:
+        obj: Path: Path of the saved plot.
+    """
+
+    plot = spec.plot_class(title=spec.title, **spec.plot_kwargs)
+    for shapes, style_kwargs in spec.layers:
+        plot.add_shapes(shapes, **style_kwargs)
+
+    return plot.save(spec.path)
+
+
+def iter_render_plots(
+    specs: Iterable[PlotSpec],
+    workers: Optional[int] = None,
+    processes: bool = False,
+) -> Iterator[Path]:
+    """ Render many plots concurrently, yielding the path of each saved plot in input order.
+
+    Plots are saved without Bokeh's global output state, and every worker reuses the same BokehJS resources and
+    script bundle. At most two specs per worker are in flight at once, so memory stays bounded when `specs` is a
+    stream.
+
+    Args:
+        specs (iterable[obj: PlotSpec]): Plots to render.
+        workers (int | None, default = None): Number of worker threads or processes, defaults to the CPU count.
+        processes (bool, default = False): Render on a pool of processes instead of threads, so shapes are
+            parsed and plots serialized in parallel.
+
+    Yields:
+        obj: Path: Path of each saved plot.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    executor_class: Type[Executor] = ProcessPoolExecutor if processes else ThreadPoolExecutor
+
+    with executor_class(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+
+        for spec in specs:
+            pending.append(executor.submit(render_plot, spec))
+
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def render_plots(
+    specs: Iterable[PlotSpec],
+    workers: Optional[int] = None,
+    processes: bool = False,
+) -> List[Path]:
+    """ Render many plots concurrently, see `iter_render_plots`.
+
+    Returns:
+        list[obj: Path]: Path of each saved plot, in input order.
+    """
+
+    return list(iter_render_plots(specs, workers, processes))
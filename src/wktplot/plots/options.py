@@ -0,0 +1,73 @@
+from typing import Optional
+from wktplot.common.quantize import MAX_QUANTIZE_STEPS
+
+
+# Ways BokehJS can be included in the saved HTML, see `bokeh.resources.Resources`.
+RESOURCE_MODES = ("inline", "cdn", "relative", "absolute")
+
+
+class OutputOptions:
+    """ How a plot's saved HTML file includes BokehJS and encodes glyph coordinates, see `WKTPlot`.
+
+    Options only hold plain data, so they can be shared between plots or sent to worker processes with a `PlotSpec`.
+
+    Attributes:
+        resources (str): How BokehJS is included in the saved HTML, one of `RESOURCE_MODES`.
+        sidecar (bool): Whether coordinates are saved to a binary file next to the HTML file.
+        quantize (int | None): Optional number of grid steps coordinates are snapped to.
+        topology (bool): Whether borders shared by neighbouring batched polygons are saved once.
+    """
+
+    def __init__(
+        self,
+        resources: str = "inline",
+        sidecar: bool = False,
+        quantize: Optional[int] = None,
+        topology: bool = False,
+    ) -> None:
+        """ Create output options, defaulting to one self-contained HTML file.
+
+        Args:
+            resources (str, default = "inline"): How BokehJS is included in the saved HTML, one of
+                `RESOURCE_MODES`. "cdn" links to the Bokeh CDN, "relative" / "absolute" to the installed Bokeh
+                package's files, and "inline" embeds them.
+            sidecar (bool, default = False): Save glyph coordinates and numeric style columns to a gzip-compressed
+                binary file next to the HTML file, with the same name and a ".bin" suffix, loaded by the page once
+                it is shown. The page must be served over HTTP(S) to load it.
+            quantize (int | None, default = None): Optional number of grid steps spanning the bounds of each
+                coordinate column, e.g. 1e5. Saved glyph coordinates are snapped to the grid and stored as
+                compressed int16 / int32 deltas, decoded by the page once it is shown. Embedded in the HTML file
+                unless `sidecar` is set.
+            topology (bool, default = False): Save the rings of batched polygons as arcs, storing each border shared
+                by neighbouring polygons (e.g. counties or census tracts) once, and join them back up in the page.
+                Borders are matched on their exact coordinates. Embedded in the HTML file unless `sidecar` is set.
+
+        Raises:
+            ValueError: If value for `resources` is not supported, or `quantize` is out of range.
+        """
+
+        if resources not in RESOURCE_MODES:
+            raise ValueError(f"Given argument `resources` is not one of {RESOURCE_MODES}. [{resources}]")
+
+        if quantize is not None and not 2 <= quantize <= MAX_QUANTIZE_STEPS:
+            raise ValueError(f"Given argument `quantize` is not between 2 and {MAX_QUANTIZE_STEPS}. [{quantize}]")
+
+        self.resources = resources
+        self.sidecar = sidecar
+        self.quantize = int(quantize) if quantize is not None else None
+        self.topology = topology
+
+    @property
+    def encoded(self) -> bool:
+        """ Whether saved coordinates are encoded or moved out of the page, rather than embedded by Bokeh as is.
+        """
+
+        return bool(self.sidecar or self.quantize or self.topology)
+
+    @property
+    def streamable(self) -> bool:
+        """ Whether saved coordinates can be written chunk by chunk, i.e. to a sidecar without `quantize` or
+        `topology`, which encode each column as a whole.
+        """
+
+        return bool(self.sidecar and not (self.quantize or self.topology))
@@ -1,6 +1,6 @@
 from bokeh import plotting as plt
-from bokeh.tile_providers import Vendors, get_provider
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from wktplot.mappers.crs import CRS, WEB_MERCATOR, get_crs_mapper
 from wktplot.mappers.osm import OpenStreetMapper
 from wktplot.mappers.standard import StandardMapper
 from wktplot.plots.standard import WKTPlot
@@ -10,24 +10,54 @@ class OpenStreetMapsPlot(WKTPlot):
     """ OpenStreetMaps WKTPlot Bokeh wrapper class.
     """
 
-    def __init__(self, *args, disable_mercator: bool = False, **kwargs) -> None:
+    def __init__(self, *args, disable_mercator: bool = False, crs: Optional[CRS] = None, **kwargs) -> None:
         """ Create figure with given arguments.
 
         Args:
             title (str): Title for graph and output filename, defaults to random string if unset.
             save_dir (str | obj: Path | None, default = None): Optional path to save output file to.
+            batched (bool, default = False): Collect shapes added with the same style into one renderer per glyph
+                type, drawn when the plot is saved or shown, instead of one renderer per shape part.
+            simplify (float | None, default = None): Optional level-of-detail tolerance, in screen pixels, for
+                batched lines and polygons.
+            lod_levels (int, default = 1): Number of zoom-dependent detail levels to precompute for batched lines
+                and polygons.
+            tile_grid (int | None, default = None): Optional number of grid cells along each axis to tile batched
+                shapes into, so the browser only draws tiles intersecting the viewport.
+            render_mode (str, default = "vector"): How shapes are drawn, "vector" glyphs or one server-side
+                "raster" density image.
+            cache (obj: GeometryCache | None, default = None): Optional cache of projected coordinates of batched
+                shapes, keyed by their well-known-text / well-known-binary input and the projection.
+            output (obj: OutputOptions | None, default = None): Optional options for how the saved HTML file
+                includes BokehJS and encodes coordinates.
+            mapper (type | None, default = None): Optional mapper class projecting shape coordinates to Mercator.
+            store_dir (str | obj: Path | None, default = None): Optional directory to store batched coordinates in
+                on disk, as memory-mapped `.npy` files, instead of memory.
+            stats (obj: PipelineStats | None, default = None): Optional stats to record stage timings and counts into.
             disable_mercator (bool, default=False): Disable mercator proction calculation for shape data.
+            crs (str | int | None, default = None): Optional coordinate reference system of the shape data, e.g.
+                "EPSG:32633", transformed to Web Mercator in one call per batch, see `get_crs_mapper`. Coordinates
+                are read in the CRS's axis order, e.g. latitude first for "EPSG:4326" as without `crs`, and easting
+                first for UTM zones. Requires pyproj, other than for "EPSG:4326" and "EPSG:3857".
             **figure_style_kwargs (dict[str, Any]): Dictionary of attributes to style the created figure.
                 See this guide for available style attributes:
                 https://docs.bokeh.org/en/2.4.3/docs/reference/plotting/figure.html
 
         Raises:
-            ValueError: If value for `title` is not a string or None.
+            ValueError: If value for `title` is not a string or None, `render_mode` or `resources` is not supported,
+                `quantize` is out of range, or incompatible detail or projection options are combined.
             OSError: If value for `save_dir` is not a directory.
+            ImportError: If `crs` needs pyproj, and it is not installed.
         """
 
+        if crs is not None and disable_mercator:
+            raise ValueError("Given argument `crs` can not be combined with `disable_mercator`.")
+
         super().__init__(*args, **kwargs)
-        self.mapper = StandardMapper if disable_mercator else OpenStreetMapper
+        if crs is not None:
+            self.mapper = get_crs_mapper(crs, WEB_MERCATOR)
+        elif kwargs.get("mapper") is None:
+            self.mapper = StandardMapper if disable_mercator else OpenStreetMapper
 
     @classmethod
     def _create_figure(cls, title: str, **style_kwargs: Dict[str, Any]) -> plt.Figure:
@@ -40,6 +70,9 @@ class OpenStreetMapsPlot(WKTPlot):
             "y_axis_type": "mercator",
         }
 
+        # Deferred, so the tile provider registry is only loaded when a map is created.
+        from bokeh.tile_providers import Vendors, get_provider
+
         tile_provider = get_provider(Vendors.OSM)
         fig = super()._create_figure(title=title, **default_kwargs)
         fig.add_tile(tile_provider)
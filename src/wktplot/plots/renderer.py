@@ -0,0 +1,111 @@
+from bokeh.core.templates import FILE
+from bokeh.document import Document
+from bokeh.embed.bundle import Bundle, bundle_for_objs_and_resources
+from bokeh.embed.elements import html_page_for_render_items
+from bokeh.embed.util import OutputDocumentFor, standalone_docs_json_and_render_items
+from bokeh.models import Plot
+from bokeh.resources import Resources
+from jinja2 import Template
+from pathlib import Path
+from threading import Lock
+from typing import Dict, FrozenSet, Optional, Tuple, Union
+
+
+class HTMLRenderer:
+    """ Renders figures to standalone HTML files without Bokeh's global output state.
+
+    Unlike `bokeh.plotting.save`, no `output_file` call is needed, so figures can be rendered from several threads
+    at once. The BokehJS resources, and the script bundle built from them, are created once per renderer and reused
+    for every figure made of the same kinds of models.
+    """
+
+    _instances: Dict[str, "HTMLRenderer"] = {}
+    _instances_lock = Lock()
+
+    def __init__(self, resources: str = "inline") -> None:
+        """ Create a renderer.
+
+        Args:
+            resources (str, default = "inline"): How BokehJS is included in rendered pages, e.g. "cdn".
+                See `bokeh.resources.Resources` for available modes.
+        """
+
+        self.resources = Resources(mode=resources)
+        self._bundles: Dict[Tuple[FrozenSet[type], Tuple[str, ...]], Bundle] = {}
+        self._lock = Lock()
+
+    @classmethod
+    def get(cls, resources: str = "inline") -> "HTMLRenderer":
+        """ Get the renderer shared by every plot using the given `resources` mode, creating it on first use.
+
+        Args:
+            resources (str, default = "inline"): How BokehJS is included in rendered pages.
+
+        Returns:
+            obj: HTMLRenderer: Shared renderer.
+        """
+
+        with cls._instances_lock:
+            if resources not in cls._instances:
+                cls._instances[resources] = cls(resources)
+
+            return cls._instances[resources]
+
+    def render(self, figure: Plot, title: str, template: Optional[Template] = None) -> str:
+        """ Render the given figure to a standalone HTML page.
+
+        Args:
+            figure (obj: Plot): Figure to render.
+            title (str): Title of the page.
+            template (obj: Template | None, default = None): Optional page template, defaults to Bokeh's file
+                template. See `bokeh.core.templates.FILE` for the parameters it receives.
+
+        Returns:
+            str: HTML page.
+        """
+
+        with OutputDocumentFor([figure]) as doc:
+            docs_json, render_items = standalone_docs_json_and_render_items([figure])
+            bundle = self._get_bundle(doc, figure)
+
+        return html_page_for_render_items(
+            bundle,
+            docs_json,
+            render_items,
+            title=title,
+            template=template or FILE,
+        )
+
+    def save(
+        self,
+        figure: Plot,
+        path: Union[str, Path],
+        title: str,
+        template: Optional[Template] = None,
+    ) -> Path:
+        """ Render the given figure and write it to `path`, see `render`.
+
+        Returns:
+            obj: Path: Path of the written file.
+        """
+
+        path = Path(path)
+        path.write_text(self.render(figure, title, template), encoding="utf-8")
+        return path
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def _get_bundle(self, doc: Document, figure: Plot) -> Bundle:
+
+        # Bokeh picks script components (widgets, WebGL, extensions, ...) from the kinds of models in a document.
+        models = figure.references()
+        key = (
+            frozenset(type(model) for model in models),
+            tuple(sorted(model.output_backend for model in models if isinstance(model, Plot))),
+        )
+
+        with self._lock:
+            if key not in self._bundles:
+                self._bundles[key] = bundle_for_objs_and_resources([doc], self.resources)
+
+            return self._bundles[key]
@@ -1,10 +1,66 @@
+import asyncio
+import numpy as np
+import shapely
+
 from bokeh import plotting as plt
+from bokeh.models import ColumnDataSource
+from bokeh.palettes import Viridis256
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 from shapely.geometry.base import BaseGeometry
-from typing import Any, Dict, Union
+from math import ceil
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+from wktplot.common.buffers import GeometryBuffers, flatten_geometries, join_bounds
+from wktplot.common.cache import GeometryCache
 from wktplot.common.file_utils import get_random_string, sanitize_text
+from wktplot.common.parsing import parse_shapes
+from wktplot.common.parallel import aiter_chunks, extract_buffers, iter_chunks, iter_extract_buffers
+from wktplot.common.raster import rasterize_buffers, to_rgba
+from wktplot.common.readers import DEFAULT_CHUNK_SIZE, read_raw_chunks, read_shape_chunks
+from wktplot.common.simplify import get_tolerance, simplify_buffers
+from wktplot.common.stats import PipelineStats
+from wktplot.common.store import CoordinateStore
+from wktplot.mappers.batch import GlyphBatch, split_style_kwargs
+from wktplot.mappers.live import LiveUpdates
+from wktplot.mappers.pyramid import flush_pyramid
+from wktplot.mappers.sidecar import externalize_sources, get_sidecar_template, restore_sources
+from wktplot.mappers.tiles import flush_tiles
 from wktplot.mappers.standard import StandardMapper
 from wktplot.plots.base import BasePlot
+from wktplot.plots.options import OutputOptions
+from wktplot.plots.renderer import HTMLRenderer
+
+if TYPE_CHECKING:
+    from bokeh.document import Document
+
+
+# Ratio between the simplification tolerances of consecutive detail levels.
+LOD_LEVEL_FACTOR: int = 4
+
+# Ways shapes can be drawn, as vector glyphs or as one server-side rasterized image.
+RENDER_MODES = ("vector", "raster")
+
+# Colors of the rasterized density image, from least to most covered pixels.
+RASTER_PALETTE = Viridis256
+
+T = TypeVar("T")
 
 
 class WKTPlot(BasePlot):
@@ -15,6 +71,16 @@ class WKTPlot(BasePlot):
         self,
         title: str = get_random_string(),
         save_dir: Union[str, Path] = Path("."),
+        batched: bool = False,
+        simplify: Optional[float] = None,
+        lod_levels: int = 1,
+        tile_grid: Optional[int] = None,
+        render_mode: str = "vector",
+        cache: Optional[GeometryCache] = None,
+        output: Optional[OutputOptions] = None,
+        mapper: Optional[type] = None,
+        store_dir: Optional[Union[str, Path]] = None,
+        stats: Optional[PipelineStats] = None,
         **figure_style_kwargs: Dict[str, Any],
     ) -> None:
         """ Create figure with given arguments.
@@ -22,37 +88,290 @@ class WKTPlot(BasePlot):
         Args:
             title (str): Title for graph and output filename, defaults to random string if unset.
             save_dir (str | obj: Path, default = "."): Optional path to save output file to.
+            batched (bool, default = False): Collect shapes added with the same style into one renderer per glyph
+                type, drawn when the plot is saved or shown, instead of one renderer per shape part. Implied by
+                `simplify`, `lod_levels`, `tile_grid`, `cache`, `store_dir` and "raster" `render_mode`, which only
+                apply to batched shapes.
+            simplify (float | None, default = None): Optional level-of-detail tolerance, in screen pixels. Batched
+                lines and polygons are simplified (topology-preserving) so no vertex moves by more than this many
+                pixels at the figure's size and the extent of the data. See `simplify_stats` after drawing.
+            lod_levels (int, default = 1): Number of detail levels to precompute for batched lines and polygons.
+                Each level is 4x finer than the previous one, and the level matching the current zoom is swapped in
+                by the browser. Uses a `simplify` tolerance of 0.5 pixels when unset.
+            tile_grid (int | None, default = None): Optional number of grid cells along each axis to tile batched
+                shapes into. Shapes are indexed by the cell holding their center, and the browser only draws the
+                tiles intersecting the current viewport. Can not be combined with `lod_levels`.
+            render_mode (str, default = "vector"): How shapes are drawn, one of `RENDER_MODES`. "raster" counts the
+                shapes covering each pixel of a grid the size of the figure, spanning the extent of the data, and
+                draws the counts as one colored image. Shapes are always batched, style attributes are ignored, and
+                it can not be combined with `simplify`, `lod_levels` or `tile_grid`.
+            cache (obj: GeometryCache | None, default = None): Optional cache of projected coordinates, keyed by
+                the well-known-text / well-known-binary input of batched shapes. Can be shared between plots, so
+                shapes plotted again are not parsed or projected again. Shapes are extracted serially when set.
+            output (obj: OutputOptions | None, default = None): Optional options for how the saved HTML file
+                includes BokehJS and encodes coordinates, e.g. `OutputOptions(resources="cdn", sidecar=True)`.
+                Defaults to one self-contained HTML file.
+            mapper (type | None, default = None): Optional mapper class projecting shape coordinates, defaults to
+                `StandardMapper` (no projection). e.g. `get_crs_mapper("EPSG:32633", "EPSG:3857")` to transform
+                UTM coordinates to Web Mercator, one call per batch of shapes.
+            store_dir (str | obj: Path | None, default = None): Optional directory to append the coordinates of
+                batched shapes to as memory-mapped `.npy` files, instead of holding them in memory, for datasets
+                larger than memory. "raster" plots are drawn chunk by chunk, and plots with an `output` sidecar
+                are saved chunk by chunk, so memory use stays flat. Can not be combined with other outputs, which
+                would read every chunk back into memory, e.g. the default inline vector output, `quantize`,
+                `topology` or detail options. Each batch's files are deleted with the plot.
+            stats (obj: PipelineStats | None, default = None): Optional stats to record the wall time of each
+                pipeline stage (parsing, coordinate extraction, projection, glyph creation and saving) into, with
+                shape, part, vertex, renderer and output byte counts. Can be shared between plots.
             **figure_style_kwargs (dict[str, Any]): Dictionary of attributes to style the created figure.
                 See this guide for available style attributes:
                 https://docs.bokeh.org/en/2.4.3/docs/reference/plotting/figure.html
 
         Raises:
-            ValueError: If value for `title` is not a string or None.
-            OSError: If value for `save_dir` is not a directory.
+            ValueError: If value for `title` is not a string or None, `render_mode` is not supported, incompatible
+                detail options are combined, or `store_dir` is set for an output that can't be saved chunk by chunk.
+            OSError: If value for `save_dir` or `store_dir` is not a directory.
         """
 
         if not isinstance(title, str):
             raise ValueError(f"Given argument `title` is not a string. [{title}]")
 
+        if tile_grid and lod_levels > 1:
+            raise ValueError("Given argument `tile_grid` can not be combined with `lod_levels`.")
+
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Given argument `render_mode` is not one of {RENDER_MODES}. [{render_mode}]")
+
+        detail = bool(simplify or tile_grid or lod_levels > 1)
+        if render_mode == "raster" and detail:
+            raise ValueError("Given argument `render_mode` \"raster\" can not be combined with detail options.")
+
         if isinstance(save_dir, str):
             save_dir = Path(save_dir)
 
         if not (isinstance(save_dir, Path) and save_dir.is_dir()):
             raise OSError(f"Given argument `save_dir` is not a directory. [{save_dir}]")
 
+        if store_dir is not None and not Path(store_dir).is_dir():
+            raise OSError(f"Given argument `store_dir` is not a directory. [{store_dir}]")
+
+        # Other outputs read every stored chunk back into memory at once, defeating the store.
+        output = output or OutputOptions()
+        if store_dir is not None and render_mode != "raster" and not (output.streamable and not detail):
+            raise ValueError(
+                "Given argument `store_dir` requires `render_mode` \"raster\", or an `output` sidecar without "
+                "`quantize`, `topology` or detail options."
+            )
+
         filename: Path = save_dir / f"{sanitize_text(title)}.html"
-        plt.output_file(filename=filename, title=title, mode="inline")
 
         self.figure: plt.Figure = self._create_figure(title=title, **figure_style_kwargs)
-        self.mapper = StandardMapper
+        self.mapper = mapper or StandardMapper
+        self.batched = bool(batched or render_mode == "raster" or detail or cache is not None or store_dir is not None)
+        self.batches: Dict[str, GlyphBatch] = {}
+        self.simplify = simplify or (0.5 if lod_levels > 1 else None)
+        self.lod_levels = lod_levels
+        self.tile_grid = tile_grid
+        self.simplify_stats: Dict[str, float] = {}
+        self.render_mode = render_mode
+        self.raster_source: Optional[ColumnDataSource] = None
+        self.cache = cache
+        self.title = title
+        self.filename = filename
+        self.output = output
+        self.renderer = HTMLRenderer.get(output.resources)
+        self.store_dir = Path(store_dir) if store_dir is not None else None
+        self.stats = stats
+        self.live: Optional[LiveUpdates] = None
 
     def add_shape(self, shape: Union[str, BaseGeometry], **style_kwargs: dict) -> None:
-        self.mapper.add_shape(self.figure, shape, **style_kwargs)
 
-    def save(self) -> None:
-        plt.save(self.figure)
+        if self.batched:
+            self._add_to_batch(self._get_batch(style_kwargs), [shape])
+            return
+
+        if self.stats is None:
+            self.mapper.add_shape(self.figure, shape, **style_kwargs)
+            return
+
+        with self.stats.time("parse"):
+            geom = parse_shapes(shape)[0]
+
+        with self.stats.time("glyph"):
+            self.mapper.add_shape(self.figure, geom, **style_kwargs)
+
+        # Parts are counted as in batches, one per non-empty point, line or polygon of the flattened shape.
+        parts, _ = flatten_geometries(np.array([geom], dtype=object))
+        self.stats.add_counts(shapes=1, parts=len(parts), vertices=shapely.get_num_coordinates(geom))
+
+    def add_shapes(
+        self,
+        shapes: Iterable[Union[str, bytes, BaseGeometry]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        workers: Optional[int] = None,
+        **style_kwargs: dict,
+    ) -> None:
+
+        style_kwargs, columns = split_style_kwargs(style_kwargs, data, self._count_shapes(shapes))
+        batch = self._get_batch(style_kwargs, columns=sorted(columns))
+
+        if not workers or self.cache is not None:
+            self._add_to_batch(batch, shapes, columns)
+            return
+
+        # Spread sized inputs evenly over the workers, streams are split into default-sized chunks.
+        chunk_size = DEFAULT_CHUNK_SIZE
+        if hasattr(shapes, "__len__"):
+            chunk_size = max(1, min(chunk_size, ceil(len(shapes) / workers)))
+
+        chunks = ((values, None) for values in iter_chunks(shapes, chunk_size))
+        offset = 0
+        for buffers, _ in self._time_iter("extract", iter_extract_buffers(self.mapper, chunks, workers)):
+            count = buffers.num_shapes
+            self._add_buffers(batch, buffers, {name: values[offset:offset + count] for name, values in columns.items()})
+            offset += count
+
+    async def add_shapes_async(
+        self,
+        shapes: Union[AsyncIterable[Union[str, bytes, BaseGeometry]], Iterable[Union[str, bytes, BaseGeometry]]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        executor: Optional[Executor] = None,
+        max_pending: int = 2,
+        **style_kwargs: dict,
+    ) -> None:
+
+        style_kwargs, columns = split_style_kwargs(style_kwargs, data, self._count_shapes(shapes))
+        batch = self._get_batch(style_kwargs, columns=sorted(columns))
+
+        if self.cache is None:
+            extract = partial(extract_buffers, self.mapper)
+        else:
+            extract = partial(self.cache.get_buffers, self.mapper)
+
+        if self.stats is not None:
+            extract = partial(self._time_call, "extract", extract)
+
+        loop = asyncio.get_running_loop()
+        pending: Deque[asyncio.Future] = deque()
+        offset = 0
+
+        async def add_oldest() -> None:
+            nonlocal offset
+            buffers = await pending.popleft()
+            count = buffers.num_shapes
+            self._add_buffers(batch, buffers, {name: values[offset:offset + count] for name, values in columns.items()})
+            offset += count
+
+        try:
+            async for values in aiter_chunks(shapes, chunk_size):
+                pending.append(loop.run_in_executor(executor, extract, values))
+
+                # Stop pulling shapes until the oldest chunk is done, so at most `max_pending` chunks are held.
+                if len(pending) >= max_pending:
+                    await add_oldest()
+
+            while pending:
+                await add_oldest()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def add_file(
+        self,
+        path: Union[str, Path],
+        format: str = "wkt",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        geometry_column: str = "geometry",
+        workers: Optional[int] = None,
+        **style_kwargs: dict,
+    ) -> None:
+
+        if self.cache is not None:
+            for values, data in read_raw_chunks(path, format, chunk_size, geometry_column):
+                shared_kwargs, columns = split_style_kwargs(style_kwargs, data, len(values))
+                self._add_to_batch(self._get_batch(shared_kwargs, columns=sorted(columns)), values, columns, format)
+            return
+
+        if not workers:
+            for geoms, data in read_shape_chunks(path, format, chunk_size, geometry_column):
+                self.add_shapes(geoms, data=data, **style_kwargs)
+            return
+
+        chunks = read_raw_chunks(path, format, chunk_size, geometry_column)
+        for buffers, data in self._time_iter("extract", iter_extract_buffers(self.mapper, chunks, workers, format)):
+            shared_kwargs, columns = split_style_kwargs(style_kwargs, data, buffers.num_shapes)
+            self._add_buffers(self._get_batch(shared_kwargs, columns=sorted(columns)), buffers, columns)
+
+    def bind(self, document: "Document", rollover: Optional[int] = None) -> None:
+
+        if self.render_mode == "raster" or self.simplify or self.tile_grid or self.store_dir is not None:
+            raise ValueError(
+                "Plots with `render_mode` \"raster\", detail options or `store_dir` can not be bound to a document."
+            )
+
+        if self.live is not None:
+            raise ValueError("Plot is already bound to a document.")
+
+        with self._time("glyph"):
+            self._flush_batches()
+
+        self.batched = True
+        document.add_root(self.figure)
+        self.live = LiveUpdates(document, self.figure, rollover)
+
+    def patch_shapes(
+        self,
+        rows: Sequence[int],
+        shapes: Iterable[Union[str, bytes, BaseGeometry]],
+        data: Optional[Mapping[str, Sequence[Any]]] = None,
+        **style_kwargs: dict,
+    ) -> None:
+
+        if self.live is None:
+            raise ValueError("Shapes can only be patched once the plot is bound to a document, see `bind`.")
+
+        style_kwargs, columns = split_style_kwargs(style_kwargs, data, len(rows))
+        batch = self._get_batch(style_kwargs, columns=sorted(columns))
+        buffers = self._get_buffers(shapes)
+        columns = batch.check_columns(buffers, columns)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) != buffers.num_shapes:
+            raise ValueError(f"Given argument `rows` has {len(rows)} values for {buffers.num_shapes} shapes.")
+
+        for glyph, (shape_rows, glyph_data) in batch.get_glyph_rows(buffers, columns).items():
+            if glyph not in batch.sources:
+                raise ValueError(f"No `{glyph}` shapes with the given style are shown to patch.")
+            if len(np.unique(shape_rows)) != len(shape_rows):
+                raise ValueError("Patched shapes must each be drawn as one row, e.g. not a multi-point.")
+            self.live.patch(batch, glyph, rows[shape_rows], glyph_data)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+
+        with self._time("glyph"):
+            self._flush_batches(streamed=self._is_streamed())
+
+        with self._time("save"):
+            path = self._save_html(Path(path) if path is not None else self.filename)
+
+        if self.stats is not None:
+            output_bytes = path.stat().st_size
+            if self.output.sidecar:
+                output_bytes += path.with_suffix(".bin").stat().st_size
+            self.stats.set_counts(renderers=len(self.figure.renderers), output_bytes=output_bytes)
+
+        return path
+
+    async def save_async(self, path: Optional[Union[str, Path]] = None, executor: Optional[Executor] = None) -> Path:
+        return await asyncio.get_running_loop().run_in_executor(executor, self.save, path)
 
     def show(self) -> None:
+
+        with self._time("glyph"):
+            self._flush_batches()
+
+        plt.output_file(filename=self.filename, title=self.title, mode=self.output.resources)
         plt.show(self.figure)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -70,3 +389,189 @@ class WKTPlot(BasePlot):
         fig.toolbar.autohide = True
 
         return fig
+
+    def _get_batch(self, style_kwargs: Dict[str, Any], columns: Sequence[str] = ()) -> GlyphBatch:
+
+        # Style values may be unhashable (e.g. lists), so batches are keyed on their representation.
+        key = repr((sorted(style_kwargs.items()), tuple(columns)))
+        if key not in self.batches:
+            store = CoordinateStore(self.store_dir) if self.store_dir is not None else None
+            self.batches[key] = GlyphBatch(columns=columns, store=store, **style_kwargs)
+
+        return self.batches[key]
+
+    @staticmethod
+    def _count_shapes(shapes: Any) -> Optional[int]:
+
+        # Streams can't be counted up front, their style lists are then taken as per-shape values.
+        if isinstance(shapes, (str, bytes, BaseGeometry)):
+            return 1
+
+        return len(shapes) if hasattr(shapes, "__len__") else None
+
+    def _add_to_batch(
+        self,
+        batch: GlyphBatch,
+        shapes: Iterable[Any],
+        columns: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+    ) -> None:
+
+        if self.cache is None and self.stats is None and self.live is None:
+            self.mapper.add_shapes_to_batch(batch, shapes, columns)
+            return
+
+        self._add_buffers(batch, self._get_buffers(shapes, format), columns)
+
+    def _get_buffers(self, shapes: Iterable[Any], format: Optional[str] = None) -> GeometryBuffers:
+
+        if self.cache is not None:
+            with self._time("extract"):
+                return self.cache.get_buffers(self.mapper, shapes, format)
+
+        if self.stats is None:
+            return self.mapper.get_buffers(parse_shapes(shapes))
+
+        # Same steps as `get_buffers`, timed one by one.
+        with self.stats.time("parse"):
+            geoms = parse_shapes(shapes)
+        with self.stats.time("extract"):
+            buffers = GeometryBuffers.from_geometries(geoms)
+        with self.stats.time("project"):
+            return self.mapper.project_buffers(buffers)
+
+    def _add_buffers(
+        self,
+        batch: GlyphBatch,
+        buffers: GeometryBuffers,
+        columns: Optional[Dict[str, Any]] = None,
+    ) -> None:
+
+        self._count_buffers(buffers)
+        if self.live is None:
+            batch.add_buffers(buffers, columns)
+            return
+
+        with self._time("glyph"):
+            glyph_data = batch.get_glyph_data(buffers, batch.check_columns(buffers, columns))
+        self.live.stream(batch, glyph_data)
+
+    def _save_html(self, path: Path) -> Path:
+
+        if not self.output.encoded:
+            return self.renderer.save(self.figure, path, self.title)
+
+        # Encoded coordinates without a sidecar are embedded in the page, so it still works from a local file.
+        models = list(self.figure.references())
+        sidecar_path = path.with_suffix(".bin") if self.output.sidecar else None
+        streams = {}
+        if self._is_streamed():
+            streams = {
+                batch.sources[glyph].id: batch.iter_glyph_data(glyph)
+                for batch in self.batches.values() for glyph in batch.sources
+            }
+
+        manifest, originals = externalize_sources(
+            models, sidecar_path, self.output.quantize, self.output.topology, streams=streams,
+        )
+        try:
+            return self.renderer.save(self.figure, path, self.title, get_sidecar_template(manifest))
+        finally:
+            restore_sources(models, originals)
+
+    def _time(self, stage: str) -> ContextManager[None]:
+        return self.stats.time(stage) if self.stats is not None else nullcontext()
+
+    def _time_iter(self, stage: str, values: Iterable[T]) -> Iterator[T]:
+        return self.stats.time_iter(stage, values) if self.stats is not None else iter(values)
+
+    def _time_call(self, stage: str, func: Any, *args: Any) -> Any:
+        with self.stats.time(stage):
+            return func(*args)
+
+    def _count_buffers(self, buffers: GeometryBuffers) -> None:
+        if self.stats is not None:
+            self.stats.add_counts(shapes=buffers.num_shapes, parts=buffers.num_parts, vertices=buffers.num_vertices)
+
+    def _is_streamed(self) -> bool:
+
+        # Batches backed by a store are saved chunk by chunk, straight from their files into the sidecar.
+        detail = self.simplify or self.tile_grid
+        stored = self.store_dir is not None and self.render_mode == "vector"
+        return bool(stored and self.output.streamable and not detail)
+
+    def _flush_batches(self, streamed: bool = False) -> None:
+
+        # Bound plots stream their shapes into the document's sources as they're added.
+        if self.live is not None:
+            return
+
+        if self.render_mode == "raster":
+            self._flush_raster()
+            return
+
+        if not (self.simplify or self.tile_grid):
+            for batch in self.batches.values():
+                if streamed:
+                    batch.draw(self.figure, batch.get_empty_glyph_data())
+                else:
+                    batch.flush(self.figure)
+            return
+
+        batch_buffers = [batch.get_buffers() for batch in self.batches.values()]
+        bounds = GeometryBuffers.concat(batch_buffers).bounds
+
+        tolerance = 0.0
+        if self.simplify:
+            tolerance = get_tolerance(bounds, self.figure.width, self.figure.height, self.simplify)
+        tolerances = [tolerance / LOD_LEVEL_FACTOR ** level for level in range(self.lod_levels)]
+
+        vertices_in = vertices_out = 0
+        for batch, buffers in zip(self.batches.values(), batch_buffers):
+            levels = [simplify_buffers(buffers, level_tolerance) for level_tolerance in tolerances]
+
+            if self.lod_levels > 1:
+                flush_pyramid(self.figure, batch, levels, tolerances, self.simplify)
+            elif self.tile_grid:
+                flush_tiles(self.figure, batch, levels[0], bounds, self.tile_grid)
+            else:
+                batch.flush(self.figure, levels[0])
+
+            vertices_in += buffers.num_vertices
+            vertices_out += levels[0].num_vertices
+
+        if self.simplify:
+            self.simplify_stats = {
+                "tolerance": tolerance,
+                "vertices_in": vertices_in,
+                "vertices_out": vertices_out,
+                "vertices_dropped": vertices_in - vertices_out,
+            }
+
+    def _flush_raster(self) -> None:
+
+        bounds = join_bounds(batch.bounds for batch in self.batches.values())
+        if np.isnan(bounds[0]):
+            return
+
+        # Shapes are counted chunk by chunk, so batches backed by a store are never read into memory whole.
+        grid = np.zeros((self.figure.height, self.figure.width))
+        for batch in self.batches.values():
+            for buffers, _ in batch.iter_chunks():
+                if buffers.num_vertices:
+                    grid += rasterize_buffers(buffers, bounds, self.figure.width, self.figure.height)
+
+        data = {
+            "image": [to_rgba(grid, RASTER_PALETTE)],
+            "x": [bounds[0]],
+            "y": [bounds[1]],
+            "dw": [(bounds[2] - bounds[0]) or 1.0],
+            "dh": [(bounds[3] - bounds[1]) or 1.0],
+        }
+
+        if self.raster_source is not None:
+            self.raster_source.data = data
+            return
+
+        self.raster_source = ColumnDataSource(data=data)
+        self.figure.image_rgba(image="image", x="x", y="y", dw="dw", dh="dh", source=self.raster_source)
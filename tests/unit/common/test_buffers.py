@@ -0,0 +1,208 @@
+from shapely import wkt
+from wktplot.common.buffers import GeometryBuffers, flatten_geometries
+
+import numpy as np
+
+
+def make_line_buffers() -> GeometryBuffers:
+    return GeometryBuffers.from_parts(lines=[([10, 20, 10], [10, 20, 40]), ([40, 30], [40, 30])])
+
+
+def make_polygon_buffers() -> GeometryBuffers:
+    return GeometryBuffers.from_parts(polygons=[
+        ([[30, 45, 10]], [[20, 40, 40]]),
+        ([[20, 10, 10], [30, 20, 20]], [[35, 30, 10], [20, 15, 25]]),
+    ])
+
+
+class TestFromParts:
+
+    def test_when_given_points_returns_flat_buffers(self) -> None:
+
+        buffers = GeometryBuffers.from_parts(points=[(1.0, 2.0), (3.0, 4.0)])
+        assert buffers.num_shapes == 1
+        assert buffers.point_x.tolist() == [1.0, 3.0]
+        assert buffers.point_y.tolist() == [2.0, 4.0]
+        assert buffers.point_index.tolist() == [0, 0]
+        assert buffers.num_vertices == 2
+
+    def test_when_given_polygons_returns_ring_offsets(self) -> None:
+
+        buffers = make_polygon_buffers()
+        assert buffers.ring_offsets.tolist() == [0, 3, 6, 9]
+        assert buffers.ring_index.tolist() == [0, 1, 1]
+        assert buffers.poly_index.tolist() == [0, 0]
+
+
+class TestFlattenGeometries:
+
+    def test_nested_collections_flattened_depth_first(self) -> None:
+
+        geoms = np.array([
+            wkt.loads("GEOMETRYCOLLECTION (POINT (1 1), GEOMETRYCOLLECTION (LINESTRING (0 0, 1 1), POINT (2 2)))"),
+            wkt.loads("POINT EMPTY"),
+            None,
+            wkt.loads("MULTIPOINT (3 3, 4 4)"),
+        ], dtype=object)
+        parts, index = flatten_geometries(geoms)
+
+        assert [part.wkt for part in parts] == [
+            "POINT (1 1)",
+            "LINESTRING (0 0, 1 1)",
+            "POINT (2 2)",
+            "POINT (3 3)",
+            "POINT (4 4)",
+        ]
+        assert index.tolist() == [0, 0, 0, 3, 3]
+
+
+class TestFromGeometries:
+
+    def test_when_given_geometries_returns_buffers_per_glyph_type(self) -> None:
+
+        geoms = np.array([
+            wkt.loads("MULTIPOINT (1 2, 3 4)"),
+            wkt.loads("LINESTRING (30 10, 10 30, 40 40)"),
+            wkt.loads("POLYGON ((35 10, 45 45, 15 40, 10 20, 35 10), (20 30, 35 35, 30 20, 20 30))"),
+        ], dtype=object)
+        buffers = GeometryBuffers.from_geometries(geoms)
+
+        assert buffers.num_shapes == 3
+        assert buffers.point_x.tolist() == [1, 3]
+        assert buffers.point_index.tolist() == [0, 0]
+        assert buffers.line_offsets.tolist() == [0, 3]
+        assert buffers.line_index.tolist() == [1]
+        assert buffers.poly_x.tolist() == [35, 45, 15, 10, 20, 35, 30]
+        assert buffers.ring_offsets.tolist() == [0, 4, 7]
+        assert buffers.ring_index.tolist() == [0, 0]
+        assert buffers.poly_index.tolist() == [2]
+
+
+class TestConcat:
+
+    def test_when_given_multiple_buffers_renumbers_indexes(self) -> None:
+
+        buffers = GeometryBuffers.concat([make_line_buffers(), GeometryBuffers.empty(2), make_line_buffers()])
+        assert buffers.num_shapes == 4
+        assert buffers.line_offsets.tolist() == [0, 3, 5, 8, 10]
+        assert buffers.line_index.tolist() == [0, 0, 3, 3]
+
+    def test_when_given_polygon_buffers_renumbers_polygons(self) -> None:
+
+        buffers = GeometryBuffers.concat([make_polygon_buffers(), make_polygon_buffers()])
+        assert buffers.ring_index.tolist() == [0, 1, 1, 2, 3, 3]
+        assert buffers.poly_index.tolist() == [0, 0, 1, 1]
+        assert buffers.ring_offsets.tolist() == [0, 3, 6, 9, 12, 15, 18]
+
+
+class TestSplit:
+
+    def test_split_buffers_match_per_shape_buffers_and_concat_back(self) -> None:
+
+        geoms = np.array([
+            wkt.loads("POINT (1 2)"),
+            wkt.loads(
+                "GEOMETRYCOLLECTION (LINESTRING (0 0, 1 1), "
+                "POLYGON ((0 0, 4 0, 4 4, 0 0), (1 1, 2 1, 2 2, 1 1)))"
+            ),
+            wkt.loads("POINT EMPTY"),
+            wkt.loads("MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))"),
+        ], dtype=object)
+        buffers = GeometryBuffers.from_geometries(geoms)
+        parts = buffers.split()
+
+        assert len(parts) == 4
+        for geom, part in zip(geoms, parts):
+            expected = GeometryBuffers.from_geometries(np.array([geom], dtype=object))
+            for name in GeometryBuffers.ARRAYS:
+                assert getattr(part, name).tolist() == getattr(expected, name).tolist()
+
+        joined = GeometryBuffers.concat(parts)
+        for name in GeometryBuffers.ARRAYS:
+            assert getattr(joined, name).tolist() == getattr(buffers, name).tolist()
+
+
+class TestTake:
+
+    def test_taken_shapes_match_concat_of_split_shapes(self) -> None:
+
+        geoms = np.array([
+            wkt.loads("POINT (1 2)"),
+            wkt.loads(
+                "GEOMETRYCOLLECTION (LINESTRING (0 0, 1 1), "
+                "POLYGON ((0 0, 4 0, 4 4, 0 0), (1 1, 2 1, 2 2, 1 1)))"
+            ),
+            wkt.loads("POINT EMPTY"),
+            wkt.loads("MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))"),
+        ], dtype=object)
+        buffers = GeometryBuffers.from_geometries(geoms)
+        parts = buffers.split()
+
+        order = [3, 1, 1, 2, 0]
+        taken = buffers.take(order)
+        expected = GeometryBuffers.concat([parts[shape] for shape in order])
+
+        assert taken.num_shapes == 5
+        for name in GeometryBuffers.ARRAYS:
+            assert getattr(taken, name).tolist() == getattr(expected, name).tolist()
+
+        assert buffers.take(range(4)) is buffers
+
+
+class TestMapCoords:
+
+    def test_transform_applied_in_single_call(self) -> None:
+
+        calls = []
+
+        def double(x, y):
+            calls.append(len(x))
+            return x * 2, y * 2
+
+        buffers = GeometryBuffers.concat([
+            GeometryBuffers.from_parts(points=[(1.0, 1.0)]),
+            make_line_buffers(),
+        ]).map_coords(double)
+
+        assert calls == [6]
+        assert buffers.point_x.tolist() == [2.0]
+        assert buffers.line_x.tolist() == [20, 40, 20, 80, 60]
+
+
+class TestToGeometries:
+
+    def test_lines_and_polygons_rebuilt(self) -> None:
+
+        shapes = [
+            "LINESTRING (30 10, 10 30, 40 40)",
+            "POLYGON ((35 10, 45 45, 15 40, 10 20, 35 10), (20 30, 35 35, 30 20, 20 30))",
+        ]
+        buffers = GeometryBuffers.from_geometries(np.array([wkt.loads(shape) for shape in shapes], dtype=object))
+
+        assert [line.wkt for line in buffers.line_geometries()] == [shapes[0]]
+        assert [polygon.wkt for polygon in buffers.polygon_geometries()] == [shapes[1]]
+        assert buffers.bounds == (10, 10, 45, 45)
+
+
+class TestLineRows:
+
+    def test_lines_of_a_shape_separated_by_nan(self) -> None:
+
+        buffers = GeometryBuffers.concat([make_line_buffers(), make_line_buffers()])
+        rows, xs, ys = buffers.line_rows()
+
+        assert rows.tolist() == [0, 1]
+        np.testing.assert_array_equal(xs[0], [10, 20, 10, np.nan, 40, 30])
+        np.testing.assert_array_equal(ys[1], [10, 20, 40, np.nan, 40, 30])
+
+
+class TestPolygonRows:
+
+    def test_polygons_grouped_per_shape(self) -> None:
+
+        rows, xs, ys = make_polygon_buffers().polygon_rows()
+
+        assert rows.tolist() == [0]
+        assert len(xs[0]) == 2
+        assert [ring.tolist() for ring in xs[0][1]] == [[20, 10, 10], [30, 20, 20]]
+        assert ys[0][0][0].tolist() == [20, 40, 40]
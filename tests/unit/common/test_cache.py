@@ -0,0 +1,147 @@
+from pathlib import Path
+from shapely import wkt
+from threading import Barrier, Thread
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common import cache as cache_module
+from wktplot.common.cache import ENTRY_OVERHEAD_BYTES, SHAPE_OVERHEAD_BYTES, GeometryCache
+from wktplot.mappers.osm import OpenStreetMapper
+from wktplot.mappers.standard import StandardMapper
+
+import pytest
+
+
+SHAPES = [
+    "POINT (30 10)",
+    "LINESTRING (30 10, 10 30, 40 40)",
+    "POLYGON ((30 10, 40 40, 20 40, 10 20, 30 10))",
+]
+
+
+class TestGeometryCache:
+
+    def test_when_given_invalid_max_bytes_raises_ValueError(self) -> None:
+
+        with pytest.raises(ValueError):
+            GeometryCache(max_bytes=0)
+
+    def test_repeated_shapes_served_from_cache(self, mocker) -> None:
+
+        cache = GeometryCache()
+        first = cache.get_buffers(StandardMapper, SHAPES)
+
+        spy = mocker.spy(StandardMapper, "get_buffers")
+        second = cache.get_buffers(StandardMapper, SHAPES[::-1])
+
+        spy.assert_not_called()
+        assert (cache.hits, cache.misses, len(cache)) == (3, 3, 3)
+        assert second.point_index.tolist() == [2]
+        assert second.line_x.tolist() == first.line_x.tolist()
+        assert second.poly_index.tolist() == [0]
+
+    def test_keys_differ_by_mapper(self) -> None:
+
+        cache = GeometryCache()
+        standard = cache.get_buffers(StandardMapper, SHAPES[:1])
+        mercator = cache.get_buffers(OpenStreetMapper, SHAPES[:1])
+
+        assert cache.misses == 2
+        assert standard.point_x[0] != mercator.point_x[0]
+
+    def test_geometries_not_cached(self) -> None:
+
+        cache = GeometryCache()
+        buffers = cache.get_buffers(StandardMapper, [wkt.loads(SHAPES[0]), SHAPES[0]])
+
+        assert buffers.point_x.tolist() == [30, 30]
+        assert len(cache) == 1
+
+    def test_least_recently_used_entries_evicted(self) -> None:
+
+        entry_bytes = GeometryCache().get_buffers(StandardMapper, ["POINT (0 0)", "POINT (1 1)"]).nbytes
+        entry_bytes += ENTRY_OVERHEAD_BYTES + 2 * SHAPE_OVERHEAD_BYTES
+        cache = GeometryCache(max_bytes=2 * entry_bytes)
+        cache.get_buffers(StandardMapper, ["POINT (0 0)", "POINT (1 1)"])
+        cache.get_buffers(StandardMapper, ["POINT (2 2)", "POINT (3 3)"])
+        cache.get_buffers(StandardMapper, ["POINT (0 0)"])
+        cache.get_buffers(StandardMapper, ["POINT (4 4)", "POINT (5 5)"])
+
+        assert len(cache) == 4 and cache.nbytes == 2 * entry_bytes
+        assert cache.get(cache.get_key("POINT (1 1)", StandardMapper)) is not None
+        assert cache.get(cache.get_key("POINT (2 2)", StandardMapper)) is None
+
+    def test_shapes_cached_together_served_as_one_entry(self, mocker) -> None:
+
+        cache = GeometryCache()
+        first = cache.get_buffers(StandardMapper, SHAPES)
+
+        spy = mocker.spy(GeometryBuffers, "concat")
+        second = cache.get_buffers(StandardMapper, SHAPES)
+
+        spy.assert_not_called()
+        assert second is first
+        assert cache.nbytes == first.nbytes + ENTRY_OVERHEAD_BYTES + 3 * SHAPE_OVERHEAD_BYTES
+
+    def test_cached_and_uncached_shapes_kept_in_given_order(self) -> None:
+
+        cache = GeometryCache()
+        cache.get_buffers(StandardMapper, SHAPES[:2])
+        buffers = cache.get_buffers(StandardMapper, [SHAPES[2], SHAPES[0], "POINT (1 2)", SHAPES[1], SHAPES[0]])
+
+        assert (cache.hits, cache.misses) == (3, 4)
+        assert buffers.point_x.tolist() == [30, 1, 30]
+        assert buffers.point_index.tolist() == [1, 2, 4]
+        assert buffers.line_index.tolist() == [3]
+        assert buffers.poly_index.tolist() == [0]
+
+    def test_entries_persisted_to_path(self, tmp_path: Path) -> None:
+
+        path = tmp_path / "cache.npz"
+        cache = GeometryCache(path=path)
+        expected = cache.get_buffers(OpenStreetMapper, SHAPES)
+        cache.save()
+
+        loaded = GeometryCache(path=path)
+        buffers = loaded.get_buffers(OpenStreetMapper, SHAPES)
+
+        assert loaded.stats["hits"] == 3 and loaded.stats["misses"] == 0
+        assert buffers.poly_x.tolist() == expected.poly_x.tolist()
+
+    def test_entries_persisted_to_path_without_suffix(self, tmp_path: Path) -> None:
+
+        path = tmp_path / "cache"
+        cache = GeometryCache(path=path)
+        cache.get_buffers(StandardMapper, SHAPES)
+        cache.save()
+
+        assert path.is_file()
+        loaded = GeometryCache(path=path)
+        loaded.get_buffers(StandardMapper, SHAPES)
+        assert (loaded.hits, loaded.misses) == (3, 0)
+
+    def test_threads_extract_uncached_shapes_concurrently(self, mocker) -> None:
+
+        # Both threads must be extracting at once to pass the barrier, which times out if extraction is serialized.
+        barrier = Barrier(2, timeout=5)
+        extract = cache_module.extract_buffers
+
+        def extract_together(*args):
+            barrier.wait()
+            return extract(*args)
+
+        mocker.patch.object(cache_module, "extract_buffers", side_effect=extract_together)
+        cache = GeometryCache()
+        inputs = [[f"POINT ({i} {i})" for i in range(5)], [f"POINT ({i} {i})" for i in range(5, 10)]]
+        results = [None, None]
+
+        def run(index: int) -> None:
+            results[index] = cache.get_buffers(StandardMapper, inputs[index])
+
+        threads = [Thread(target=run, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results[0].point_x.tolist() == list(range(5))
+        assert results[1].point_x.tolist() == list(range(5, 10))
+        assert (cache.hits, cache.misses, len(cache)) == (0, 10, 10)
@@ -0,0 +1,53 @@
+from wktplot.common.parallel import aiter_chunks, iter_chunks, iter_extract_buffers
+from wktplot.mappers.osm import OpenStreetMapper
+from wktplot.mappers.standard import StandardMapper
+
+import asyncio
+import numpy as np
+import pytest
+
+
+class TestIterChunks:
+
+    def test_when_given_generator_yields_object_arrays(self) -> None:
+
+        chunks = list(iter_chunks((f"POINT ({i} {i})" for i in range(5)), chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert all(chunk.dtype == object for chunk in chunks)
+
+
+class TestAiterChunks:
+
+    def test_when_given_async_generator_yields_object_arrays(self) -> None:
+
+        async def feed():
+            for i in range(5):
+                yield f"POINT ({i} {i})"
+
+        async def collect(values):
+            return [chunk async for chunk in aiter_chunks(values, chunk_size=2)]
+
+        for values in (feed(), [f"POINT ({i} {i})" for i in range(5)]):
+            chunks = asyncio.run(collect(values))
+
+            assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+            assert all(chunk.dtype == object for chunk in chunks)
+
+
+class TestIterExtractBuffers:
+
+    def test_results_yielded_in_input_order(self) -> None:
+
+        chunks = [(np.array([f"POINT ({i} {i})"], dtype=object), i) for i in range(6)]
+        results = list(iter_extract_buffers(StandardMapper, chunks, workers=2))
+
+        assert [extra for _, extra in results] == list(range(6))
+        assert [buffers.point_x[0] for buffers, _ in results] == list(range(6))
+
+    def test_when_given_format_parses_raw_values_with_mapper(self) -> None:
+
+        chunks = [(np.array(["010100000000000000000024400000000000002440"], dtype=object), None)]
+        (buffers, _), = iter_extract_buffers(OpenStreetMapper, chunks, workers=1, format="wkb")
+
+        assert buffers.point_x[0] == pytest.approx(1113194.90793)
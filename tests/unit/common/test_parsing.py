@@ -0,0 +1,44 @@
+from shapely import wkb, wkt
+from shapely.geometry import Point
+from wktplot.common.parsing import parse_shapes
+
+import numpy as np
+import pytest
+
+
+class TestParseShapes:
+
+    def test_when_given_mixed_inputs_returns_geometries(self) -> None:
+
+        shapes = [
+            "POINT (1 2)",
+            Point(3, 4),
+            wkb.dumps(wkt.loads("LINESTRING (0 0, 1 1)")),
+            None,
+        ]
+        geoms = parse_shapes(shapes)
+
+        assert geoms.dtype == object
+        assert [g.wkt if g is not None else None for g in geoms] == [
+            "POINT (1 2)",
+            "POINT (3 4)",
+            "LINESTRING (0 0, 1 1)",
+            None,
+        ]
+
+    def test_when_given_generator_or_array_returns_geometries(self) -> None:
+
+        from_generator = parse_shapes(f"POINT ({i} {i})" for i in range(3))
+        from_array = parse_shapes(np.array(["POINT (0 0)", "POINT (1 1)"], dtype=object))
+
+        assert len(from_generator) == 3
+        assert len(from_array) == 2
+
+    def test_when_given_single_shape_returns_one_geometry(self) -> None:
+
+        assert len(parse_shapes("POINT (1 2)")) == 1
+
+    def test_when_given_unsupported_type_raises_TypeError(self) -> None:
+
+        with pytest.raises(TypeError):
+            parse_shapes(["POINT (1 2)", 5])
@@ -0,0 +1,51 @@
+from wktplot.common.quantize import dequantize_coords, quantize_coords
+
+import numpy as np
+
+
+class TestQuantizeCoords:
+
+    def test_round_trip_error_within_half_a_step(self) -> None:
+
+        values = np.random.default_rng(0).uniform(-180, 180, 1000)
+
+        deltas, origin, scale, nan_index = quantize_coords(values, 10 ** 6)
+        decoded = dequantize_coords(deltas, origin, scale, nan_index)
+
+        assert np.abs(decoded - values).max() <= scale / 2
+
+    def test_when_deltas_fit_int16_returns_int16(self) -> None:
+
+        values = np.array([10.0, 10.5, 11.0, 10.0])
+
+        deltas, origin, scale, nan_index = quantize_coords(values, 3)
+
+        assert deltas.dtype == np.int16
+        assert deltas.tolist() == [0, 1, 1, -2]
+        assert (origin, scale) == (10.0, 0.5)
+        assert nan_index.tolist() == []
+
+    def test_when_deltas_overflow_int16_returns_int32(self) -> None:
+
+        deltas, *_ = quantize_coords(np.array([0.0, 1.0]), 10 ** 6)
+
+        assert deltas.dtype == np.int32
+
+    def test_when_given_equal_values_uses_unit_scale(self) -> None:
+
+        deltas, origin, scale, _ = quantize_coords(np.array([5.0, 5.0]), 100)
+
+        assert deltas.tolist() == [0, 0]
+        assert (origin, scale) == (5.0, 1.0)
+
+    def test_nan_coordinates_kept_with_zero_delta(self) -> None:
+
+        values = np.array([0.0, 2.0, np.nan, 4.0])
+
+        deltas, origin, scale, nan_index = quantize_coords(values, 5)
+        decoded = dequantize_coords(deltas, origin, scale, nan_index)
+
+        assert deltas.tolist() == [0, 2, 0, 2]
+        assert nan_index.tolist() == [2]
+        assert np.isnan(decoded[2])
+        assert decoded[[0, 1, 3]].tolist() == [0, 2, 4]
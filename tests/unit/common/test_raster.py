@@ -0,0 +1,54 @@
+from shapely import wkt
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.raster import rasterize_buffers, to_rgba
+
+import numpy as np
+
+
+class TestRasterizeBuffers:
+
+    def test_points_binned_by_pixel(self) -> None:
+
+        buffers = GeometryBuffers.from_parts(points=[(0.5, 0.5), (0.6, 0.7), (3.5, 1.5)])
+        grid = rasterize_buffers(buffers, (0, 0, 4, 2), width=4, height=2)
+
+        assert grid.tolist() == [[2, 0, 0, 0], [0, 0, 0, 1]]
+
+    def test_lines_cover_each_crossed_pixel_once(self) -> None:
+
+        buffers = GeometryBuffers.from_parts(lines=[([0, 4], [0, 4])])
+        grid = rasterize_buffers(buffers, (0, 0, 4, 4), width=4, height=4)
+
+        assert np.array_equal(grid, np.eye(4))
+
+    def test_polygons_filled_leaving_holes_empty(self) -> None:
+
+        polygon = wkt.loads("POLYGON ((0 0, 4 0, 4 4, 0 4, 0 0), (1 1, 3 1, 3 3, 1 3, 1 1))")
+        buffers = GeometryBuffers.from_geometries(np.array([polygon], dtype=object))
+        grid = rasterize_buffers(buffers, (0, 0, 4, 4), width=4, height=4)
+
+        assert grid.tolist() == [
+            [1, 1, 1, 1],
+            [1, 0, 0, 1],
+            [1, 0, 0, 1],
+            [1, 1, 1, 1],
+        ]
+
+    def test_when_given_empty_buffers_returns_zeros(self) -> None:
+
+        grid = rasterize_buffers(GeometryBuffers.empty(), (0, 0, 1, 1), width=3, height=2)
+
+        assert grid.shape == (2, 3)
+        assert not grid.any()
+
+
+class TestToRgba:
+
+    def test_empty_pixels_transparent_and_peak_gets_last_color(self) -> None:
+
+        grid = np.array([[0, 1], [15, 15]], dtype=np.float64)
+        rgba = to_rgba(grid, ["#000000", "#ff0000"]).view(np.uint8).reshape(2, 2, 4)
+
+        assert rgba[0, 0].tolist() == [0, 0, 0, 0]
+        assert rgba[0, 1].tolist() == [0, 0, 0, 255]
+        assert rgba[1, 1].tolist() == [255, 0, 0, 255]
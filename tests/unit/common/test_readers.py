@@ -0,0 +1,97 @@
+from pathlib import Path
+from shapely import wkb, wkt
+from wktplot.common.readers import read_shape_chunks
+
+import numpy as np
+import pytest
+
+
+def write_lines(path: Path, lines) -> Path:
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestReadShapeChunks:
+
+    def test_when_given_wkt_file_yields_fixed_size_chunks(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.wkt", [f"POINT ({i} {i})" for i in range(5)] + [""])
+        chunks = list(read_shape_chunks(path, format="wkt", chunk_size=2))
+
+        assert [len(geoms) for geoms, _ in chunks] == [2, 2, 1]
+        assert chunks[2][0][0].wkt == "POINT (4 4)"
+        assert chunks[0][1] == {}
+
+    def test_when_given_hex_wkb_file_yields_geometries(self, tmp_path: Path) -> None:
+
+        shape = wkt.loads("LINESTRING (0 0, 1 1)")
+        path = write_lines(tmp_path / "shapes.wkb", [wkb.dumps(shape, hex=True)])
+        (geoms, _), = read_shape_chunks(path, format="wkb")
+
+        assert geoms[0].equals(shape)
+
+    def test_when_given_geojsonl_file_yields_geometries(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.geojsonl", [
+            '{"type": "Point", "coordinates": [1, 2]}',
+            '{"type": "Feature", "properties": {}, "geometry": {"type": "Point", "coordinates": [3, 4]}}',
+        ])
+        (geoms, _), = read_shape_chunks(path, format="geojsonl")
+
+        assert [geom.wkt for geom in geoms] == ["POINT (1 2)", "POINT (3 4)"]
+
+    def test_when_given_csv_file_yields_geometries_and_columns(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.csv", [
+            "name,width,geometry",
+            'a,1,POINT (1 2)',
+            'b,2.5,"LINESTRING (0 0, 1 1)"',
+        ])
+        (geoms, columns), = read_shape_chunks(path, format="csv")
+
+        assert [geom.wkt for geom in geoms] == ["POINT (1 2)", "LINESTRING (0 0, 1 1)"]
+        assert columns["name"].tolist() == ["a", "b"]
+        assert columns["width"].tolist() == [1.0, 2.5]
+
+    def test_csv_column_types_fixed_by_first_chunk(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.csv", [
+            "code,width,geometry",
+            "a,1,POINT (1 2)",
+            "2,,POINT (3 4)",
+            "3,4,POINT (5 6)",
+        ])
+        chunks = [columns for _, columns in read_shape_chunks(path, format="csv", chunk_size=2)]
+
+        assert [columns["code"].dtype.kind for columns in chunks] == ["U", "U"]
+        assert chunks[1]["code"].tolist() == ["3"]
+        assert [columns["width"].dtype for columns in chunks] == [np.float64, np.float64]
+        assert np.isnan(chunks[0]["width"][1])
+
+    def test_when_csv_row_has_wrong_number_of_fields_raises_ValueError(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.csv", ["name,geometry", "a,POINT (1 2)", "b,POINT (3 4),extra"])
+        with pytest.raises(ValueError, match="Line 3 "):
+            list(read_shape_chunks(path, format="csv"))
+
+    def test_when_later_chunk_has_non_numeric_value_raises_ValueError(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.csv", [
+            "width,geometry",
+            "1,POINT (1 2)",
+            "2,POINT (3 4)",
+            "x,POINT (5 6)",
+        ])
+        with pytest.raises(ValueError, match="Line 4 .*`width`"):
+            list(read_shape_chunks(path, format="csv", chunk_size=2))
+
+    def test_when_csv_missing_geometry_column_raises_ValueError(self, tmp_path: Path) -> None:
+
+        path = write_lines(tmp_path / "shapes.csv", ["name,wkt", "a,POINT (1 2)"])
+        with pytest.raises(ValueError):
+            list(read_shape_chunks(path, format="csv"))
+
+    def test_when_given_unsupported_format_raises_ValueError(self, tmp_path: Path) -> None:
+
+        with pytest.raises(ValueError):
+            list(read_shape_chunks(tmp_path / "shapes.shp", format="shp"))
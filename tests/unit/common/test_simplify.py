@@ -0,0 +1,43 @@
+from shapely import wkt
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.simplify import get_tolerance, simplify_buffers
+
+import numpy as np
+import pytest
+
+
+class TestGetTolerance:
+
+    def test_tolerance_scaled_by_largest_pixel_size(self) -> None:
+
+        assert get_tolerance((0, 0, 6000, 300), width=600, height=300, pixel_tolerance=0.5) == pytest.approx(5.0)
+
+    def test_when_given_empty_bounds_returns_zero(self) -> None:
+
+        assert get_tolerance((np.nan,) * 4, width=600, height=600) == 0.0
+
+
+class TestSimplifyBuffers:
+
+    def test_lines_and_polygons_simplified_keeping_shape_index(self) -> None:
+
+        geoms = np.array([
+            wkt.loads("POINT (0 0)"),
+            wkt.loads("LINESTRING (0 0, 1 0.001, 2 0, 3 0.001, 4 0)"),
+            wkt.loads("POLYGON ((0 0, 5 0, 10 0.001, 10 10, 0 10, 0 0), (2 2, 3 2, 3 3, 2 2))"),
+        ], dtype=object)
+        buffers = GeometryBuffers.from_geometries(geoms)
+        simplified = simplify_buffers(buffers, tolerance=0.1)
+
+        assert simplified.point_x.tolist() == [0]
+        assert simplified.line_x.tolist() == [0, 4]
+        assert simplified.line_index.tolist() == [1]
+        assert simplified.poly_x.tolist() == [0, 10, 10, 0, 2, 3, 3]
+        assert simplified.ring_index.tolist() == [0, 0]
+        assert simplified.poly_index.tolist() == [2]
+        assert buffers.num_vertices - simplified.num_vertices == 4
+
+    def test_when_tolerance_zero_returns_same_buffers(self) -> None:
+
+        buffers = GeometryBuffers.from_parts(lines=[([0, 1, 2], [0, 0, 0])])
+        assert simplify_buffers(buffers, 0.0) is buffers
@@ -0,0 +1,61 @@
+from wktplot.common.stats import STAGES, PipelineStats
+
+import logging
+
+
+class TestPipelineStats:
+
+    def test_stage_times_and_calls_accumulate(self) -> None:
+
+        stats = PipelineStats()
+        for _ in range(2):
+            with stats.time("parse"):
+                pass
+
+        assert stats.calls["parse"] == 2
+        assert stats.timings["parse"] > 0
+        assert stats.calls["save"] == 0
+
+    def test_callback_called_after_each_stage(self) -> None:
+
+        calls = []
+        stats = PipelineStats(callback=lambda stage, seconds: calls.append(stage))
+        with stats.time("glyph"):
+            pass
+        list(stats.time_iter("extract", [1, 2]))
+
+        # Each value, and the final exhausted step, counts as one run.
+        assert calls == ["glyph", "extract", "extract", "extract"]
+
+    def test_as_dict_includes_every_stage_and_counter(self) -> None:
+
+        stats = PipelineStats()
+        stats.add_counts(shapes=2, vertices=10)
+        stats.add_counts(shapes=1)
+        stats.set_counts(renderers=3)
+
+        result = stats.as_dict()
+
+        assert list(result["timings"]) == list(STAGES)
+        assert result["counts"] == {"shapes": 3, "parts": 0, "vertices": 10, "renderers": 3, "output_bytes": 0}
+        assert result["total_seconds"] == 0
+
+    def test_reset_zeroes_stats(self) -> None:
+
+        stats = PipelineStats()
+        stats.add_counts(shapes=2)
+        stats.add_time("parse", 1.0)
+        stats.reset()
+
+        assert stats.as_dict()["counts"]["shapes"] == 0
+        assert stats.as_dict()["total_seconds"] == 0
+
+    def test_log_writes_one_summary_line(self, caplog) -> None:
+
+        stats = PipelineStats()
+        stats.add_counts(shapes=5)
+        with caplog.at_level(logging.INFO, logger="wktplot.common.stats"):
+            stats.log()
+
+        assert len(caplog.records) == 1
+        assert "shapes=5" in caplog.text
@@ -0,0 +1,66 @@
+from pathlib import Path
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.store import CoordinateStore, NpyArrayFile
+
+import gc
+import numpy as np
+
+
+class TestNpyArrayFile:
+
+    def test_appended_values_loadable_as_npy_file(self, tmp_path: Path) -> None:
+
+        array = NpyArrayFile(tmp_path / "x.npy", np.float64)
+        assert array.append(np.array([1.0, 2.0])) == (0, 2)
+        assert array.append([3]) == (2, 3)
+
+        assert len(array) == 3
+        assert np.load(tmp_path / "x.npy").tolist() == [1, 2, 3]
+        assert array.load().tolist() == [1, 2, 3]
+        assert array[1:].tolist() == [2, 3]
+
+    def test_when_empty_loads_empty_array(self, tmp_path: Path) -> None:
+
+        array = NpyArrayFile(tmp_path / "index.npy", np.int64)
+
+        assert array.load().dtype == np.int64
+        assert len(array.load()) == 0
+        assert len(np.load(tmp_path / "index.npy")) == 0
+
+
+class TestCoordinateStore:
+
+    def test_chunks_read_back_in_order(self, tmp_path: Path) -> None:
+
+        first = GeometryBuffers.from_parts(points=[(1, 2)], lines=[([0, 1], [0, 1])])
+        second = GeometryBuffers.from_parts(polygons=[([np.array([0.0, 4.0, 4.0])], [np.array([0.0, 0.0, 3.0])])])
+
+        store = CoordinateStore(tmp_path)
+        store.append(first)
+        store.append(GeometryBuffers.empty(num_shapes=1))
+        store.append(second)
+
+        assert store.directory.parent == tmp_path
+        assert (store.num_shapes, store.num_chunks, store.num_vertices) == (3, 3, 6)
+        assert store.bounds == (0, 0, 4, 3)
+
+        chunks = list(store.iter_buffers())
+        assert [chunk.num_shapes for chunk in chunks] == [1, 1, 1]
+        assert chunks[2].poly_x.tolist() == [0, 4, 4]
+        assert chunks[2].ring_offsets.tolist() == [0, 3]
+
+        expected = GeometryBuffers.concat([first, GeometryBuffers.empty(num_shapes=1), second])
+        joined = store.get_buffers()
+        for name in GeometryBuffers.ARRAYS:
+            assert getattr(joined, name).tolist() == getattr(expected, name).tolist()
+
+    def test_files_deleted_when_closed_or_collected(self, tmp_path: Path) -> None:
+
+        store = CoordinateStore(tmp_path)
+        store.append(GeometryBuffers.from_parts(points=[(1, 2)]))
+        store.close()
+        assert not store.directory.exists()
+
+        directory = CoordinateStore(tmp_path).directory
+        gc.collect()
+        assert not directory.exists()
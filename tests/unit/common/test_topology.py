@@ -0,0 +1,75 @@
+from wktplot.common.topology import decode_arcs, encode_arcs
+
+import numpy as np
+
+
+def get_rings(rings: list) -> tuple:
+    return (
+        np.concatenate([np.array(ring, dtype=float)[:, 0] for ring in rings]),
+        np.concatenate([np.array(ring, dtype=float)[:, 1] for ring in rings]),
+        np.array([len(ring) for ring in rings]),
+    )
+
+
+def rotate_to(ring: list, first: tuple) -> list:
+    index = ring.index(first)
+    return ring[index:] + ring[:index]
+
+
+class TestEncodeArcs:
+
+    def test_shared_border_stored_once(self) -> None:
+
+        # Two unit squares sharing the side from (1, 0) to (1, 1).
+        x, y, lengths = get_rings([
+            [(0, 0), (1, 0), (1, 1), (0, 1)],
+            [(1, 0), (2, 0), (2, 1), (1, 1)],
+        ])
+
+        _, _, arc_lengths, refs, counts = encode_arcs(x, y, lengths)
+
+        assert sorted(arc_lengths.tolist()) == [2, 4, 4]
+        assert counts.tolist() == [2, 2]
+        assert refs.tolist().count(0) == 3
+        assert (refs < 0).sum() == 1
+
+    def test_filled_hole_stored_once(self) -> None:
+
+        hole = [(1, 1), (2, 1), (2, 2), (1, 2)]
+        x, y, lengths = get_rings([
+            [(0, 0), (3, 0), (3, 3), (0, 3)],
+            hole,
+            hole[::-1],
+        ])
+
+        _, _, arc_lengths, refs, counts = encode_arcs(x, y, lengths)
+
+        assert len(arc_lengths) == 2
+        assert counts.tolist() == [1, 1, 1]
+        assert refs.tolist() == [0, 0, ~1]
+
+    def test_when_given_no_rings_returns_empty_arrays(self) -> None:
+
+        arc_x, arc_y, arc_lengths, refs, counts = encode_arcs(np.empty(0), np.empty(0), np.empty(0))
+
+        assert len(arc_x) == len(arc_y) == len(arc_lengths) == len(refs) == len(counts) == 0
+
+
+class TestDecodeArcs:
+
+    def test_round_trip_keeps_every_ring_up_to_rotation(self) -> None:
+
+        # Side by side strips, each zigzag border between two strips shared by both.
+        borders = [[(x + 0.25 * (k % 2), k) for k in range(10)] for x in range(5)]
+        rings = [borders[x + 1] + borders[x][::-1] for x in range(4)]
+        x, y, lengths = get_rings(rings)
+
+        encoded = encode_arcs(x, y, lengths)
+        decoded_x, decoded_y, decoded_lengths = decode_arcs(*encoded)
+
+        assert decoded_lengths.tolist() == lengths.tolist()
+        assert len(encoded[0]) < len(x)
+        starts = np.cumsum(lengths) - lengths
+        for ring, start, length in zip(rings, starts, lengths):
+            decoded = list(zip(decoded_x[start:start + length], decoded_y[start:start + length]))
+            assert rotate_to(ring, decoded[0]) == decoded
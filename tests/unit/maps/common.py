@@ -1,4 +1,19 @@
+import numpy as np
+
+
 STYLE_KWARGS = {
     "fill_color": "green",
     "fill_alpha": 0.69,
 }
+
+
+def assert_coords_equal(actual, expected) -> None:
+    """ Compare nested coordinate arrays against nested lists of expected values.
+    """
+
+    if isinstance(expected, (list, tuple)) and expected and isinstance(expected[0], (list, tuple)):
+        assert len(actual) == len(expected)
+        for actual_item, expected_item in zip(actual, expected):
+            assert_coords_equal(actual_item, expected_item)
+    else:
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,135 @@
+from .common import STYLE_KWARGS
+from pathlib import Path
+from unittest.mock import MagicMock
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.common.store import CoordinateStore
+from wktplot.mappers.batch import GlyphBatch, split_style_kwargs
+
+import numpy as np
+import pytest
+
+
+class TestSplitStyleKwargs:
+
+    def test_lists_arrays_and_data_columns_split_out(self) -> None:
+
+        shared, columns = split_style_kwargs(
+            {
+                "fill_alpha": 0.5,
+                "fill_color": (50, 205, 50, 0.25),
+                "line_color": ["red", "blue"],
+                "line_alpha": np.array([0.1, 0.2]),
+                "line_width": "width",
+                "line_dash": "dashed",
+            },
+            data={"width": [1, 2]},
+        )
+
+        assert shared == {"fill_alpha": 0.5, "fill_color": (50, 205, 50, 0.25), "line_dash": "dashed"}
+        assert sorted(columns) == ["line_alpha", "line_color", "line_width"]
+        assert columns["line_width"].tolist() == [1, 2]
+
+    def test_list_valued_styles_and_mismatched_lists_shared(self) -> None:
+
+        shared, columns = split_style_kwargs(
+            {"line_dash": [4, 4], "hover_line_dash": [2, 6], "fill_color": [50, 205, 50], "line_alpha": [0.1, 0.2]},
+            num_shapes=2,
+        )
+
+        assert shared == {"line_dash": [4, 4], "hover_line_dash": [2, 6], "fill_color": [50, 205, 50]}
+        assert columns["line_alpha"].tolist() == [0.1, 0.2]
+
+
+class TestFlush:
+
+    def test_when_batch_empty_no_renderers_created(self, mock_figure: MagicMock) -> None:
+
+        GlyphBatch(**STYLE_KWARGS).flush(mock_figure)
+        mock_figure.scatter.assert_not_called()
+        mock_figure.multi_line.assert_not_called()
+        mock_figure.multi_polygons.assert_not_called()
+
+    def test_one_renderer_created_per_glyph_type(self, mock_figure: MagicMock) -> None:
+
+        batch = GlyphBatch(**STYLE_KWARGS)
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2), (3, 4)], lines=[([1, 2], [3, 4])]))
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(5, 6)], lines=[([5, 6], [7, 8])]))
+        batch.flush(mock_figure)
+
+        mock_figure.scatter.assert_called_once_with("x", "y", source=batch.sources["scatter"], **STYLE_KWARGS)
+        mock_figure.multi_line.assert_called_once_with(
+            "xs", "ys", source=batch.sources["multi_line"], **STYLE_KWARGS,
+        )
+        mock_figure.multi_polygons.assert_not_called()
+        assert batch.num_shapes == 2
+        assert batch.sources["scatter"].data["x"].tolist() == [1, 3, 5]
+        assert len(batch.sources["multi_line"].data["xs"]) == 2
+
+    def test_repeated_flush_updates_existing_source(self, mock_figure: MagicMock) -> None:
+
+        batch = GlyphBatch(**STYLE_KWARGS)
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2)]))
+        batch.flush(mock_figure)
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(3, 4)]))
+        batch.flush(mock_figure)
+
+        mock_figure.scatter.assert_called_once()
+        assert batch.sources["scatter"].data["x"].tolist() == [1, 3]
+
+
+class TestStyleColumns:
+
+    def test_columns_stored_per_row_and_bound_as_fields(self, mock_figure: MagicMock) -> None:
+
+        batch = GlyphBatch(columns=["fill_color"], fill_alpha=0.69)
+        buffers = GeometryBuffers.concat([
+            GeometryBuffers.from_parts(points=[(1, 2), (3, 4)]),
+            GeometryBuffers.from_parts(points=[(5, 6)]),
+        ])
+        batch.add_buffers(buffers, {"fill_color": np.array(["red", "blue"])})
+        batch.flush(mock_figure)
+
+        assert batch.sources["scatter"].data["fill_color"].tolist() == ["red", "red", "blue"]
+        assert mock_figure.scatter.call_args.kwargs["fill_color"] == {"field": "fill_color"}
+
+    def test_when_column_length_mismatched_raises_ValueError(self) -> None:
+
+        batch = GlyphBatch(columns=["fill_color"])
+        with pytest.raises(ValueError):
+            batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2)]), {"fill_color": np.array(["a", "b"])})
+
+    def test_when_columns_missing_raises_ValueError(self) -> None:
+
+        batch = GlyphBatch(columns=["fill_color"])
+        with pytest.raises(ValueError):
+            batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2)]))
+
+
+class TestCoordinateStore:
+
+    def test_store_backed_batch_drawn_like_in_memory_batch(self, mock_figure: MagicMock, tmp_path: Path) -> None:
+
+        store = CoordinateStore(tmp_path)
+        batches = [GlyphBatch(columns=["line_color"]), GlyphBatch(columns=["line_color"], store=store)]
+        for batch in batches:
+            batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2)]), {"line_color": np.array(["red"])})
+            batch.add_buffers(GeometryBuffers.from_parts(lines=[([0, 1], [2, 3])]), {"line_color": np.array(["blue"])})
+
+        memory, stored = (batch.get_glyph_data() for batch in batches)
+        assert batches[1].num_shapes == 2
+        assert batches[1].bounds == batches[0].bounds == (0, 2, 1, 3)
+        assert stored["scatter"]["x"].tolist() == memory["scatter"]["x"].tolist() == [1]
+        assert stored["multi_line"]["line_color"].tolist() == ["blue"]
+
+    def test_chunks_iterated_with_their_columns(self, tmp_path: Path) -> None:
+
+        batch = GlyphBatch(columns=["line_color"], store=CoordinateStore(tmp_path))
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 2)]), {"line_color": np.array(["red"])})
+        batch.add_buffers(GeometryBuffers.from_parts(lines=[([0, 1], [2, 3])]), {"line_color": np.array(["blue"])})
+
+        assert [columns["line_color"].tolist() for _, columns in batch.iter_chunks()] == [["red"], ["blue"]]
+        assert [data["line_color"].tolist() for data in batch.iter_glyph_data("multi_line")] == [["blue"]]
+        assert batch.get_empty_glyph_data() == {
+            "scatter": {"x": [], "y": [], "line_color": []},
+            "multi_line": {"xs": [], "ys": [], "line_color": []},
+        }
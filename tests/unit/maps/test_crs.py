@@ -0,0 +1,130 @@
+from pytest_mock import MockFixture
+from shapely import wkt
+from unittest.mock import MagicMock
+from wktplot.common.cache import GeometryCache
+from wktplot.mappers.crs import (
+    TRANSFORMS,
+    WEB_MERCATOR,
+    WGS84,
+    _create_crs_mapper,
+    get_crs_mapper,
+    get_transform,
+    normalize_crs,
+    register_transform,
+)
+from wktplot.mappers.osm import OpenStreetMapper
+
+import numpy as np
+import pickle
+import pytest
+import sys
+
+
+def shift_x(x: np.ndarray, y: np.ndarray) -> tuple:
+    return x + 1, y
+
+
+class TestNormalizeCrs:
+
+    def test_when_given_epsg_code_or_lowercase_name_returns_canonical_name(self) -> None:
+
+        assert normalize_crs(32633) == "EPSG:32633"
+        assert normalize_crs(" epsg:4326") == WGS84
+        assert normalize_crs("+proj=utm +zone=33") == "+proj=utm +zone=33"
+
+
+class TestGetTransform:
+
+    def test_when_given_same_crs_returns_identity(self) -> None:
+
+        x = np.array([1.0])
+        assert get_transform("EPSG:27700", 27700)(x, x) == (x, x)
+
+    def test_web_mercator_transforms_are_inverse(self) -> None:
+
+        x, y = np.array([10.0, 45.0]), np.array([30.0, -120.0])
+
+        merc_x, merc_y = get_transform(WGS84, WEB_MERCATOR)(x, y)
+        actual_x, actual_y = get_transform(WEB_MERCATOR, WGS84)(merc_x, merc_y)
+
+        assert merc_x[0] == pytest.approx(3339584.72380)
+        assert merc_y[0] == pytest.approx(1118889.97486)
+        assert actual_x == pytest.approx(x)
+        assert actual_y == pytest.approx(y)
+
+    def test_when_pair_not_registered_builds_pyproj_transformer(self, mocker: MockFixture) -> None:
+
+        pyproj = MagicMock()
+        mocker.patch.dict(sys.modules, {"pyproj": pyproj})
+
+        transform = get_transform(32633, WEB_MERCATOR)
+
+        pyproj.Transformer.from_crs.assert_called_once_with("EPSG:32633", WEB_MERCATOR)
+        assert transform is pyproj.Transformer.from_crs.return_value.transform
+
+    def test_when_pyproj_missing_raises_ImportError(self, mocker: MockFixture) -> None:
+
+        mocker.patch.dict(sys.modules, {"pyproj": None})
+
+        with pytest.raises(ImportError):
+            get_transform("EPSG:32633", WEB_MERCATOR)
+
+    def test_registered_transform_used_instead_of_pyproj(self, mocker: MockFixture) -> None:
+
+        def shift(x: np.ndarray, y: np.ndarray) -> tuple:
+            return x + 1, y
+
+        mocker.patch.dict(TRANSFORMS)
+        register_transform("epsg:1234", 4326, shift)
+
+        assert get_transform("EPSG:1234", WGS84) is shift
+
+
+class TestGetCrsMapper:
+
+    def test_mapper_created_once_per_crs_pair(self) -> None:
+
+        mapper = get_crs_mapper(4326)
+
+        assert get_crs_mapper("epsg:4326", "EPSG:3857") is mapper
+        assert mapper.__qualname__ == "CRSMapper[EPSG:4326->EPSG:3857]"
+
+    def test_mapper_reads_wgs84_latitude_first_like_default_mapper(self) -> None:
+
+        mapper = get_crs_mapper(WGS84)
+        shape = wkt.loads("LINESTRING (30 10, 10 30)")
+
+        x, y = mapper._get_line_string_coords(shape)
+        expected_x, expected_y = OpenStreetMapper._get_line_string_coords(shape)
+
+        assert x == pytest.approx(expected_x)
+        assert y == pytest.approx(expected_y)
+
+    def test_mapper_pickled_by_crs_pair(self) -> None:
+
+        mapper = get_crs_mapper(WEB_MERCATOR, WGS84)
+
+        assert pickle.loads(pickle.dumps(mapper)) is mapper
+
+    def test_registered_transform_pickled_with_mapper(self, mocker: MockFixture) -> None:
+
+        mocker.patch.dict(TRANSFORMS)
+        mocker.patch("wktplot.mappers.crs._REGISTERED", set())
+        register_transform("EPSG:1234", WGS84, shift_x)
+        mapper = get_crs_mapper("EPSG:1234", WGS84)
+        data = pickle.dumps(mapper)
+
+        # A worker process starts with an empty registry.
+        del TRANSFORMS["EPSG:1234", WGS84]
+        _create_crs_mapper.cache_clear()
+        restored = pickle.loads(data)
+
+        assert restored._transform is shift_x
+        assert restored._project_coords(np.array([1.0]), np.array([2.0]))[0].tolist() == [2]
+
+    def test_cache_keys_differ_per_crs_pair(self) -> None:
+
+        to_mercator = GeometryCache.get_key("POINT (1 2)", get_crs_mapper(WGS84))
+        to_wgs84 = GeometryCache.get_key("POINT (1 2)", get_crs_mapper(WEB_MERCATOR, WGS84))
+
+        assert to_mercator != to_wgs84
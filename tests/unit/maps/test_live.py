@@ -0,0 +1,66 @@
+from bokeh.document import Document
+from bokeh.plotting import figure
+from wktplot.common.parsing import parse_shapes
+from wktplot.mappers.batch import GlyphBatch
+from wktplot.mappers.live import LiveUpdates, join_glyph_data
+from wktplot.mappers.standard import StandardMapper
+
+import numpy as np
+
+
+def get_glyph_data(batch: GlyphBatch, shapes: list) -> dict:
+    buffers = StandardMapper.get_buffers(parse_shapes(shapes))
+    return batch.get_glyph_data(buffers, {})
+
+
+class TestLiveUpdates:
+
+    def test_updates_sent_once_per_tick(self, mocker) -> None:
+
+        document = Document()
+        live = LiveUpdates(document, figure())
+        batch = GlyphBatch()
+        spy = mocker.spy(document, "add_next_tick_callback")
+
+        live.stream(batch, get_glyph_data(batch, ["POINT (1 2)"]))
+        live.stream(batch, get_glyph_data(batch, ["POINT (3 4)"]))
+        live.flush()
+
+        spy.assert_called_once_with(live.flush)
+        assert batch.sources["scatter"].data["x"].tolist() == [1, 3]
+
+    def test_streamed_rows_rolled_over(self) -> None:
+
+        live = LiveUpdates(Document(), figure(), rollover=2)
+        batch = GlyphBatch()
+
+        for shapes in (["POINT (1 1)", "POINT (2 2)", "POINT (3 3)"], ["POINT (4 4)"]):
+            live.stream(batch, get_glyph_data(batch, shapes))
+            live.flush()
+
+        assert batch.sources["scatter"].data["x"].tolist() == [3, 4]
+
+    def test_patched_rows_replaced(self) -> None:
+
+        live = LiveUpdates(Document(), figure())
+        batch = GlyphBatch()
+        live.stream(batch, get_glyph_data(batch, ["LINESTRING (0 0, 1 1)", "LINESTRING (2 2, 3 3)"]))
+        live.flush()
+
+        live.patch(batch, "multi_line", [1], get_glyph_data(batch, ["LINESTRING (5 5, 6 6)"])["multi_line"])
+        live.flush()
+
+        assert [xs.tolist() for xs in batch.sources["multi_line"].data["xs"]] == [[0, 1], [5, 6]]
+
+
+class TestJoinGlyphData:
+
+    def test_arrays_concatenated_and_lists_extended(self) -> None:
+
+        joined = join_glyph_data([
+            {"x": np.array([1.0]), "xs": [np.array([1.0, 2.0])]},
+            {"x": np.array([2.0]), "xs": [np.array([3.0])]},
+        ])
+
+        assert joined["x"].tolist() == [1, 2]
+        assert [xs.tolist() for xs in joined["xs"]] == [[1, 2], [3]]
@@ -1,9 +1,74 @@
+from pytest_mock import MockFixture
 from shapely import wkt
-from wktplot.mappers.osm import OpenStreetMapper
+from unittest.mock import MagicMock
+from wktplot.mappers.osm import MAX_LATITUDE, OpenStreetMapper, geographic_to_mercator, mercator_to_geographic
 
+import numpy as np
 import pytest
 
 
+class TestGeographicToMercator:
+
+    def test_when_given_poles_returns_finite_coords(self) -> None:
+
+        merc_lng, merc_lat = geographic_to_mercator(np.array([90.0, -90.0, 89.9999]), np.zeros(3))
+
+        assert np.isfinite(merc_lat).all()
+        assert merc_lat.tolist() == pytest.approx([20037508.34279, -20037508.34279, 20037508.34279])
+        assert merc_lng.tolist() == [0, 0, 0]
+
+    def test_when_given_scalars_returns_scalars(self) -> None:
+
+        merc_lng, merc_lat = geographic_to_mercator(10.0, 30.0)
+
+        assert np.ndim(merc_lng) == np.ndim(merc_lat) == 0
+        assert (merc_lng, merc_lat) == pytest.approx((3339584.72380, 1118889.97486))
+
+    def test_chunked_result_matches_single_chunk(self, mocker: MockFixture) -> None:
+
+        lat = np.linspace(-80, 80, 1001)
+        lng = np.linspace(-180, 180, 1001)
+        expected = geographic_to_mercator(lat, lng)
+
+        mocker.patch("wktplot.mappers.osm.PROJECTION_CHUNK_SIZE", 64)
+        actual = geographic_to_mercator(lat, lng)
+
+        assert np.array_equal(actual[0], expected[0])
+        assert np.array_equal(actual[1], expected[1])
+
+    def test_when_given_out_writes_in_place(self) -> None:
+
+        lat = np.array([10.0, 40.0])
+        lng = np.array([30.0, 40.0])
+        expected = geographic_to_mercator(lat, lng)
+
+        merc_lng, merc_lat = geographic_to_mercator(lat, lng, out=(lat, lng))
+
+        assert merc_lng is lat and merc_lat is lng
+        assert merc_lng.tolist() == expected[0].tolist()
+        assert merc_lat.tolist() == expected[1].tolist()
+
+    def test_when_given_float32_dtype_returns_float32(self) -> None:
+
+        merc_lng, merc_lat = geographic_to_mercator(np.array([10.0]), np.array([30.0]), dtype=np.float32)
+
+        assert merc_lng.dtype == merc_lat.dtype == np.float32
+        assert merc_lat[0] == pytest.approx(1118889.97486)
+
+
+class TestMercatorToGeographic:
+
+    def test_round_trip_returns_given_coords(self) -> None:
+
+        lat = np.linspace(-MAX_LATITUDE, MAX_LATITUDE, 101)
+        lng = np.linspace(-180, 180, 101)
+
+        actual_lat, actual_lng = mercator_to_geographic(*geographic_to_mercator(lat, lng))
+
+        assert actual_lat == pytest.approx(lat)
+        assert actual_lng == pytest.approx(lng)
+
+
 class TestGetPointCoords:
 
     def test_when_given_valid_point_returns_expected_coords(self):
@@ -61,3 +126,26 @@ class TestGetPolygonCoords:
             expected_coords
         ):
             assert actual[0] == pytest.approx(expected[0])
+
+    def test_all_rings_projected_in_single_call(self, mocker: MockFixture):
+
+        spy = mocker.spy(OpenStreetMapper, "_project_coords")
+        shape = wkt.loads("POLYGON ((35 10, 45 45, 15 40, 10 20, 35 10), (20 30, 35 35, 30 20, 20 30))")
+        x, y = OpenStreetMapper._get_polygon_coords(shape)
+
+        spy.assert_called_once()
+        assert [len(ring) for ring in x] == [4, 3]
+        assert all(isinstance(ring, np.ndarray) for ring in x + y)
+
+
+class TestAddShapesToBatch:
+
+    def test_when_given_shapes_projects_coords(self):
+
+        batch = MagicMock()
+        OpenStreetMapper.add_shapes_to_batch(batch, ["POINT (30 10)", "LINESTRING (30 10, 10 30, 40 40)"])
+
+        buffers = batch.add_buffers.call_args.args[0]
+        assert buffers.point_x[0] == pytest.approx(1113194.90793)
+        assert buffers.point_y[0] == pytest.approx(3503549.84350)
+        assert buffers.line_y == pytest.approx([3503549.84350, 1118889.97486, 4865942.27950])
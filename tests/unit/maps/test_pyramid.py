@@ -0,0 +1,44 @@
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.mappers.batch import GlyphBatch
+from wktplot.mappers.pyramid import flush_pyramid
+
+
+def make_levels():
+    return [
+        GeometryBuffers.from_parts(points=[(0, 0)], lines=[([0, 4], [0, 0])]),
+        GeometryBuffers.from_parts(points=[(0, 0)], lines=[([0, 2, 4], [0, 0.01, 0])]),
+    ]
+
+
+class TestFlushPyramid:
+
+    def test_coarsest_level_drawn_with_level_sources(self) -> None:
+
+        fig = figure()
+        batch = GlyphBatch(columns=["line_color"])
+        batch.add_buffers(make_levels()[1], {"line_color": ["red"]})
+
+        level_sources = flush_pyramid(fig, batch, make_levels(), [1.0, 0.25], 0.5)
+
+        assert list(level_sources) == ["multi_line"]
+        assert [len(source.data["xs"][0]) for source in level_sources["multi_line"]] == [2, 3]
+        assert level_sources["multi_line"][1].data["line_color"].tolist() == ["red"]
+        assert batch.sources["multi_line"].data["xs"][0].tolist() == [0, 4]
+        assert level_sources["multi_line"][0] is batch.sources["multi_line"]
+        assert sum(isinstance(model, ColumnDataSource) for model in fig.references()) == 3
+        assert len(fig.x_range.js_property_callbacks["change:start"]) == 1
+        assert len(fig.y_range.js_property_callbacks["change:end"]) == 1
+
+    def test_repeated_flush_updates_levels_without_new_callbacks(self) -> None:
+
+        fig = figure()
+        batch = GlyphBatch()
+        batch.add_buffers(make_levels()[1])
+
+        first = flush_pyramid(fig, batch, make_levels(), [1.0, 0.25], 0.5)["multi_line"]
+        second = flush_pyramid(fig, batch, make_levels(), [1.0, 0.25], 0.5)["multi_line"]
+
+        assert first == second
+        assert len(fig.x_range.js_property_callbacks["change:start"]) == 1
@@ -0,0 +1,199 @@
+from bokeh.embed import file_html
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+from bokeh.resources import CDN
+from pathlib import Path
+from wktplot.common.quantize import dequantize_coords
+from wktplot.common.topology import decode_arcs
+from wktplot.mappers.sidecar import externalize_sources, flatten_column, get_sidecar_template, restore_sources
+
+import base64
+import gzip
+import numpy as np
+import pytest
+
+
+class TestFlattenColumn:
+
+    def test_when_given_flat_array_returns_it_without_counts(self) -> None:
+
+        values = np.array([1.0, 2.0])
+        flat, counts = flatten_column(values)
+
+        assert flat is values
+        assert counts == []
+
+    def test_when_given_nested_arrays_returns_counts_per_level(self) -> None:
+
+        xs = [[[np.array([0.0, 1.0, 1.0]), np.array([0.2, 0.5])]], [[np.array([5.0, 6.0, 6.0])]]]
+        flat, counts = flatten_column(xs)
+
+        assert flat.tolist() == [0, 1, 1, 0.2, 0.5, 5, 6, 6]
+        assert [count.tolist() for count in counts] == [[1, 1], [2, 1], [3, 2, 3]]
+
+
+class TestExternalizeSources:
+
+    def test_coordinates_written_to_sidecar_and_restored(self, tmp_path: Path) -> None:
+
+        points = ColumnDataSource(data={"x": np.array([1.0, 3.0]), "y": np.array([2.0, 4.0]), "color": ["red", "blue"]})
+        lines = ColumnDataSource(data={
+            "xs": [np.array([0.0, 1.0]), np.array([2.0])],
+            "ys": [np.array([5.0, 6.0]), np.array([7.0])],
+        })
+        other = ColumnDataSource(data={"image": [np.zeros((2, 2))]})
+        path = tmp_path / "plot.bin"
+
+        manifest, originals = externalize_sources([points, lines, other], path)
+
+        assert manifest["url"] == "plot.bin"
+        assert [entry["id"] for entry in manifest["sources"]] == [points.id, lines.id]
+        assert manifest["sources"][0]["columns"]["color"] == {"values": ["red", "blue"]}
+        assert points.data == {"x": [], "y": [], "color": []}
+        assert "image" in other.data and len(other.data["image"]) == 1
+
+        data = gzip.decompress(path.read_bytes())
+        offset, length, dtype = manifest["sources"][1]["columns"]["xs"]["array"]
+        assert np.frombuffer(data, dtype=dtype, count=length, offset=offset).tolist() == [0, 1, 2]
+        (offset, length, dtype), = manifest["sources"][1]["columns"]["xs"]["counts"]
+        assert np.frombuffer(data, dtype=dtype, count=length, offset=offset).tolist() == [2, 1]
+
+        restore_sources([points, lines], originals)
+        assert points.data["x"].tolist() == [1, 3]
+        assert len(lines.data["xs"]) == 2
+
+    def test_image_sources_kept_in_page(self, tmp_path: Path) -> None:
+
+        image = np.arange(600, dtype=np.uint32).reshape(20, 30)
+        source = ColumnDataSource(data={"image": [image], "x": [0.0], "y": [0.0], "dw": [1.0], "dh": [1.0]})
+        path = tmp_path / "plot.bin"
+
+        manifest, originals = externalize_sources([source], path)
+
+        assert manifest["sources"] == []
+        assert originals == {}
+        assert source.data["image"][0] is image
+        assert gzip.decompress(path.read_bytes()) == b""
+
+    def test_column_dtypes_kept(self, tmp_path: Path) -> None:
+
+        source = ColumnDataSource(data={
+            "x": np.array([1.5]),
+            "y": np.array([2], dtype=np.int64),
+            "alpha": np.array([7], dtype=np.uint8),
+            "visible": np.array([True]),
+        })
+        path = tmp_path / "plot.bin"
+
+        manifest, originals = externalize_sources([source], path)
+
+        columns = manifest["sources"][0]["columns"]
+        assert columns["visible"] == {"values": [True]}
+
+        data = gzip.decompress(path.read_bytes())
+        decoded = {}
+        for name in ("x", "y", "alpha"):
+            offset, length, dtype = columns[name]["array"]
+            decoded[name] = (dtype, np.frombuffer(data, dtype=dtype, count=length, offset=offset).tolist())
+        assert decoded == {"x": ("float64", [1.5]), "y": ("int32", [2]), "alpha": ("uint8", [7])}
+
+        restore_sources([source], originals)
+        assert source.data["x"].tolist() == [1.5]
+
+    def test_when_column_dtype_unsupported_raises_ValueError(self, tmp_path: Path) -> None:
+
+        for values in (np.array([2 ** 40]), np.array([1.0], dtype=np.float16)):
+            source = ColumnDataSource(data={"x": values, "y": np.array([0.0])})
+            with pytest.raises(ValueError):
+                externalize_sources([source], tmp_path / "plot.bin")
+
+    def test_when_quantized_without_path_embeds_delta_encoded_coordinates(self) -> None:
+
+        lines = ColumnDataSource(data={
+            "xs": [np.array([0.0, 1.0]), np.array([2.0, np.nan, 4.0])],
+            "ys": [np.array([5.0, 6.0]), np.array([7.0, np.nan, 8.0])],
+            "line_width": np.array([1.5, 2.5]),
+        })
+
+        manifest, _ = externalize_sources([lines], None, quantize=5)
+
+        assert "url" not in manifest
+        data = gzip.decompress(base64.b64decode(manifest["data"]))
+
+        def read(location: list) -> np.ndarray:
+            offset, length, dtype = location
+            return np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+
+        xs = manifest["sources"][0]["columns"]["xs"]
+        assert xs["array"][2] == "int16"
+        assert read(xs["array"]).tolist() == [0, 1, 1, 0, 2]
+        decoded = dequantize_coords(read(xs["array"]), xs["origin"], xs["scale"], read(xs["nan"]))
+        assert np.array_equal(decoded, [0, 1, 2, np.nan, 4], equal_nan=True)
+        assert "scale" not in manifest["sources"][0]["columns"]["line_width"]
+
+    def test_when_given_topology_polygon_rings_written_as_shared_arcs(self, tmp_path: Path) -> None:
+
+        # Two unit squares sharing a side, each one polygon of one ring.
+        polygons = ColumnDataSource(data={
+            "xs": [[[np.array([0.0, 1.0, 1.0, 0.0])]], [[np.array([1.0, 2.0, 2.0, 1.0])]]],
+            "ys": [[[np.array([0.0, 0.0, 1.0, 1.0])]], [[np.array([0.0, 0.0, 1.0, 1.0])]]],
+        })
+        path = tmp_path / "plot.bin"
+
+        manifest, _ = externalize_sources([polygons], path, topology=True)
+
+        entry, = manifest["sources"]
+        assert entry["columns"]["xs"]["arcs"] == "x"
+        assert entry["columns"]["ys"]["arcs"] == "y"
+        assert len(entry["columns"]["xs"]["counts"]) == 2
+
+        data = gzip.decompress(path.read_bytes())
+
+        def read(location: list) -> np.ndarray:
+            offset, length, dtype = location
+            return np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+
+        arcs = entry["arcs"]
+        x, y, lengths = decode_arcs(
+            read(arcs["x"]["array"]),
+            read(arcs["y"]["array"]),
+            read(arcs["lengths"]),
+            read(arcs["refs"]),
+            read(arcs["counts"]),
+        )
+        assert len(read(arcs["lengths"])) == 3
+        assert lengths.tolist() == [4, 4]
+        assert sorted(zip(x[:4], y[:4])) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+    def test_when_given_streams_chunks_written_instead_of_source_data(self, tmp_path: Path) -> None:
+
+        lines = ColumnDataSource(data={"xs": [], "ys": [], "line_color": []})
+        chunks = [
+            {"xs": [np.array([0.0, 1.0])], "ys": [np.array([5.0, 6.0])], "line_color": np.array(["red"])},
+            {"xs": [np.array([2.0])], "ys": [np.array([7.0])], "line_color": np.array(["blue"])},
+        ]
+        path = tmp_path / "plot.bin"
+
+        manifest, _ = externalize_sources([lines], path, streams={lines.id: iter(chunks)})
+
+        columns = manifest["sources"][0]["columns"]
+        assert columns["line_color"] == {"values": ["red", "blue"]}
+        assert sorted(item.name for item in tmp_path.iterdir()) == ["plot.bin"]
+
+        data = gzip.decompress(path.read_bytes())
+        offset, length, dtype = columns["ys"]["array"]
+        assert np.frombuffer(data, dtype=dtype, count=length, offset=offset).tolist() == [5, 6, 7]
+        (offset, length, dtype), = columns["ys"]["counts"]
+        assert np.frombuffer(data, dtype=dtype, count=length, offset=offset).tolist() == [2, 1]
+
+
+class TestGetSidecarTemplate:
+
+    def test_template_extends_bokeh_file_template_with_loader(self) -> None:
+
+        template = get_sidecar_template({"url": "plot.bin", "sources": []})
+        html = file_html(figure(), CDN, title="Plot", template=template)
+
+        assert "<title>Plot</title>" in html
+        assert '"url": "plot.bin"' in html
+        assert "DecompressionStream" in html
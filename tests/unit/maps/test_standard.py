@@ -1,10 +1,12 @@
-from .common import STYLE_KWARGS
+from .common import STYLE_KWARGS, assert_coords_equal
 from shapely import wkt
 from shapely.geometry.base import BaseGeometry
 from unittest.mock import call, MagicMock
 from wktplot.mappers.standard import StandardMapper
 
+import numpy as np
 import pytest
+import sys
 
 
 class FakeShape(BaseGeometry):
@@ -31,7 +33,10 @@ class TestGetLineStringCoords:
 
         expected_coords = ([30, 10, 40], [10, 30, 40])
         shape = wkt.loads("LINESTRING (30 10, 10 30, 40 40)")
-        assert StandardMapper._get_line_string_coords(shape) == expected_coords
+        x, y = StandardMapper._get_line_string_coords(shape)
+
+        assert_coords_equal((x, y), expected_coords)
+        assert x.dtype == np.float64 and x.flags["C_CONTIGUOUS"] and y.flags["C_CONTIGUOUS"]
 
 
 class TestGetPolygonCoords:
@@ -43,7 +48,15 @@ class TestGetPolygonCoords:
             [[10.0, 40.0, 40.0, 20.0]],
         )
         shape = wkt.loads("POLYGON ((30 10, 40 40, 20 40, 10 20, 30 10))")
-        assert StandardMapper._get_polygon_coords(shape) == expected_coords
+        assert_coords_equal(StandardMapper._get_polygon_coords(shape), expected_coords)
+
+    def test_rings_are_views_into_one_buffer(self) -> None:
+
+        shape = wkt.loads("POLYGON ((35 10, 45 45, 15 40, 10 20, 35 10), (20 30, 35 35, 30 20, 20 30))")
+        x, _ = StandardMapper._get_polygon_coords(shape)
+
+        assert [ring.tolist() for ring in x] == [[35, 45, 15, 10], [20, 35, 30]]
+        assert x[0].base is x[1].base
 
 
 class TestAddShape:
@@ -70,31 +83,28 @@ class TestAddShape:
 
         shape = wkt.loads("LINESTRING (30 10, 10 30, 40 40)")
         StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
-        mock_figure.line.assert_called_once_with(
-            [30, 10, 40],
-            [10, 30, 40],
-            **STYLE_KWARGS,
-        )
+        mock_figure.line.assert_called_once()
+        assert_coords_equal(mock_figure.line.call_args.args, ([30, 10, 40], [10, 30, 40]))
+        assert mock_figure.line.call_args.kwargs == STYLE_KWARGS
 
     def test_when_given_valid_linearring_calls_expected_methods(self, mock_figure: MagicMock) -> None:
 
         shape = wkt.loads("LINEARRING (10 20, 20 25, 35 50, 10 20)")
         StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
-        mock_figure.line.assert_called_once_with(
-            [10, 20, 35, 10],
-            [20, 25, 50, 20],
-            **STYLE_KWARGS,
-        )
+        mock_figure.line.assert_called_once()
+        assert_coords_equal(mock_figure.line.call_args.args, ([10, 20, 35, 10], [20, 25, 50, 20]))
+        assert mock_figure.line.call_args.kwargs == STYLE_KWARGS
 
     def test_when_given_valid_polygon_calls_expected_methods(self, mock_figure: MagicMock) -> None:
 
         shape = wkt.loads("POLYGON ((30 10, 40 40, 20 40, 10 20, 30 10))")
         StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
-        mock_figure.multi_polygons.assert_called_once_with(
-            [[[[30.0, 40.0, 20.0, 10.0]]]],
-            [[[[10.0, 40.0, 40.0, 20.0]]]],
-            **STYLE_KWARGS,
+        mock_figure.multi_polygons.assert_called_once()
+        assert_coords_equal(
+            mock_figure.multi_polygons.call_args.args,
+            ([[[[30.0, 40.0, 20.0, 10.0]]]], [[[[10.0, 40.0, 40.0, 20.0]]]]),
         )
+        assert mock_figure.multi_polygons.call_args.kwargs == STYLE_KWARGS
 
     def test_when_given_valid_multipoint_calls_expected_methods(self, mock_figure: MagicMock) -> None:
 
@@ -111,16 +121,92 @@ class TestAddShape:
 
         shape = wkt.loads("MULTILINESTRING ((10 10, 20 20, 10 40), (40 40, 30 30, 40 20, 30 10))")
         StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
-        mock_figure.line.assert_has_calls([
-            call([10, 20, 10], [10, 20, 40], **STYLE_KWARGS),
-            call([40, 30, 40, 30], [40, 30, 20, 10], **STYLE_KWARGS),
-        ])
+        assert mock_figure.line.call_count == 2
+        assert_coords_equal(
+            [line_call.args for line_call in mock_figure.line.call_args_list],
+            [([10, 20, 10], [10, 20, 40]), ([40, 30, 40, 30], [40, 30, 20, 10])],
+        )
 
     def test_when_given_valid_multipolygon_calls_expected_methods(self, mock_figure: MagicMock) -> None:
 
         shape = wkt.loads("MULTIPOLYGON (((30 20, 45 40, 10 40, 30 20)), ((15 5, 40 10, 10 20, 5 10, 15 5)))")
         StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
-        mock_figure.multi_polygons.assert_has_calls([
-            call([[[[30.0, 45.0, 10.0]]]], [[[[20.0, 40.0, 40.0]]]], **STYLE_KWARGS),
-            call([[[[15.0, 40.0, 10.0, 5.0]]]], [[[[5.0, 10.0, 20.0, 10.0]]]], **STYLE_KWARGS),
-        ])
+        assert mock_figure.multi_polygons.call_count == 2
+        assert_coords_equal(
+            [polygon_call.args for polygon_call in mock_figure.multi_polygons.call_args_list],
+            [
+                ([[[[30.0, 45.0, 10.0]]]], [[[[20.0, 40.0, 40.0]]]]),
+                ([[[[15.0, 40.0, 10.0, 5.0]]]], [[[[5.0, 10.0, 20.0, 10.0]]]]),
+            ],
+        )
+
+    def test_when_batched_multipoint_calls_scatter_once(self, mock_figure: MagicMock) -> None:
+
+        shape = wkt.loads("MULTIPOINT ((10 40), (40 30), (20 20), (30 10))")
+        StandardMapper.add_shape(mock_figure, shape, batched=True, **STYLE_KWARGS)
+        mock_figure.circle.assert_not_called()
+        mock_figure.scatter.assert_called_once()
+
+    def test_when_batched_collection_calls_each_glyph_once(self, mock_figure: MagicMock) -> None:
+
+        shape = wkt.loads(
+            "GEOMETRYCOLLECTION (POINT (40 10), MULTILINESTRING ((10 10, 20 20), (40 40, 30 30)), "
+            "MULTIPOLYGON (((30 20, 45 40, 10 40, 30 20)), ((15 5, 40 10, 10 20, 5 10, 15 5))))"
+        )
+        StandardMapper.add_shape(mock_figure, shape, batched=True, **STYLE_KWARGS)
+        mock_figure.scatter.assert_called_once()
+        mock_figure.multi_line.assert_called_once()
+        mock_figure.multi_polygons.assert_called_once()
+
+    def test_when_given_collection_calls_each_glyph_once(self, mock_figure: MagicMock) -> None:
+
+        shape = wkt.loads(
+            "GEOMETRYCOLLECTION (POINT (40 10), GEOMETRYCOLLECTION (LINESTRING (10 10, 20 20), "
+            "POLYGON ((30 20, 45 40, 10 40, 30 20)), POINT (1 2)))"
+        )
+        StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
+        mock_figure.circle.assert_not_called()
+        mock_figure.scatter.assert_called_once()
+        mock_figure.multi_line.assert_called_once()
+        mock_figure.multi_polygons.assert_called_once()
+        assert mock_figure.scatter.call_args.kwargs["source"].data["x"].tolist() == [40, 1]
+
+    def test_when_given_collection_deeper_than_recursion_limit_draws_every_part(self, mock_figure: MagicMock) -> None:
+
+        shape = "POINT (0 0)"
+        for depth in range(1, sys.getrecursionlimit() + 100):
+            shape = f"GEOMETRYCOLLECTION (POINT ({depth} {depth}), {shape})"
+
+        StandardMapper.add_shape(mock_figure, shape, **STYLE_KWARGS)
+        assert len(mock_figure.scatter.call_args.kwargs["source"].data["x"]) == sys.getrecursionlimit() + 100
+
+
+class TestAddToBatch:
+
+    def test_when_given_unsupported_shape_raises_TypeError(self) -> None:
+
+        with pytest.raises(TypeError):
+            StandardMapper.add_to_batch(MagicMock(), 1)
+
+    def test_when_given_wkt_adds_single_shape(self) -> None:
+
+        batch = MagicMock()
+        StandardMapper.add_to_batch(batch, "MULTILINESTRING ((10 10, 20 20, 10 40), (40 40, 30 30, 40 20, 30 10))")
+
+        buffers = batch.add_buffers.call_args.args[0]
+        assert buffers.num_shapes == 1
+        assert buffers.line_offsets.tolist() == [0, 3, 7]
+
+
+class TestAddShapesToBatch:
+
+    def test_when_given_shapes_adds_buffers_once(self) -> None:
+
+        batch = MagicMock()
+        StandardMapper.add_shapes_to_batch(batch, ["POINT (30 10)", "LINESTRING (30 10, 10 30, 40 40)", None])
+
+        batch.add_buffers.assert_called_once()
+        buffers = batch.add_buffers.call_args.args[0]
+        assert buffers.num_shapes == 3
+        assert buffers.point_x.tolist() == [30]
+        assert buffers.line_x.tolist() == [30, 10, 40]
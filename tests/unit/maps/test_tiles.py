@@ -0,0 +1,57 @@
+from bokeh.plotting import figure
+from wktplot.common.buffers import GeometryBuffers
+from wktplot.mappers.batch import GlyphBatch
+from wktplot.mappers.tiles import flush_tiles, get_tile_order
+
+import numpy as np
+
+
+class TestGetTileOrder:
+
+    def test_rows_grouped_by_cell_with_tile_bounds(self) -> None:
+
+        row_bounds = np.array([
+            [90, 90, 95, 95],
+            [1, 1, 2, 2],
+            [80, 1, 99, 3],
+            [3, 3, 4, 4],
+        ], dtype=float)
+        order, offsets, tile_bounds = get_tile_order(row_bounds, (0, 0, 100, 100), grid_size=2)
+
+        assert order.tolist() == [1, 3, 2, 0]
+        assert offsets.tolist() == [0, 2, 3, 4]
+        assert tile_bounds.tolist() == [[1, 1, 4, 4], [80, 1, 99, 3], [90, 90, 95, 95]]
+
+
+class TestFlushTiles:
+
+    def test_sources_sorted_by_tile_and_filtered_by_callback(self) -> None:
+
+        fig = figure()
+        batch = GlyphBatch(columns=["line_color"])
+        buffers = GeometryBuffers.concat([
+            GeometryBuffers.from_parts(lines=[([90, 95], [90, 95])]),
+            GeometryBuffers.from_parts(lines=[([1, 2], [1, 2])]),
+        ])
+        batch.add_buffers(buffers, {"line_color": ["red", "blue"]})
+
+        tile_bounds = flush_tiles(fig, batch, buffers, (0, 0, 100, 100), grid_size=2)
+
+        assert tile_bounds["multi_line"].tolist() == [[1, 1, 2, 2], [90, 90, 95, 95]]
+        assert batch.sources["multi_line"].data["line_color"].tolist() == ["blue", "red"]
+        assert batch.tile_callbacks["multi_line"].args["offsets"] == [0, 1, 2]
+        assert batch.renderers["multi_line"].view.filters == [batch.tile_callbacks["multi_line"].args["filter"]]
+        assert len(fig.x_range.js_property_callbacks["change:start"]) == 1
+
+    def test_repeated_flush_updates_existing_callback(self) -> None:
+
+        fig = figure()
+        batch = GlyphBatch()
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(1, 1)]))
+        flush_tiles(fig, batch, batch.get_buffers(), (0, 0, 100, 100), grid_size=2)
+
+        batch.add_buffers(GeometryBuffers.from_parts(points=[(99, 99)]))
+        flush_tiles(fig, batch, batch.get_buffers(), (0, 0, 100, 100), grid_size=2)
+
+        assert batch.tile_callbacks["scatter"].args["offsets"] == [0, 1, 2]
+        assert len(fig.x_range.js_property_callbacks["change:start"]) == 1
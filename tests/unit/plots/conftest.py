@@ -8,6 +8,7 @@ import pytest
 
 @pytest.fixture()
 def mock_bokeh(mocker) -> MagicMock:
+    mocker.patch("wktplot.plots.standard.HTMLRenderer")
     mock_bokeh: MagicMock = mocker.patch("wktplot.plots.standard.plt")
     return mock_bokeh
 
@@ -0,0 +1,27 @@
+from pathlib import Path
+from wktplot.plots.batch import PlotSpec, iter_render_plots, render_plots
+from wktplot.plots.options import OutputOptions
+from wktplot.plots.osm import OpenStreetMapsPlot
+
+
+class TestRenderPlots:
+
+    def test_plots_rendered_in_input_order(self, temp_dir: str) -> None:
+
+        output = OutputOptions(resources="cdn")
+        specs = [
+            PlotSpec(f"Plot {i}", [([f"POINT ({i} {i})"], {"color": "red"})], save_dir=temp_dir, output=output)
+            for i in range(5)
+        ]
+        paths = render_plots(specs, workers=3)
+
+        assert paths == [Path(temp_dir) / f"plot_{i}.html" for i in range(5)]
+        assert all(path.is_file() for path in paths)
+
+    def test_spec_path_and_plot_class_used(self, temp_dir: str) -> None:
+
+        path = Path(temp_dir) / "custom.html"
+        spec = PlotSpec("OSM", [(["POINT (30 10)"], {})], path=path, plot_class=OpenStreetMapsPlot, save_dir=temp_dir)
+
+        assert list(iter_render_plots([spec], workers=1)) == [path]
+        assert "tile.openstreetmap.org" in path.read_text()
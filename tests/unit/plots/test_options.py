@@ -0,0 +1,31 @@
+from wktplot.plots.options import OutputOptions
+
+import pytest
+
+
+class TestOutputOptions:
+
+    def test_when_given_invalid_resources_raises_ValueError(self) -> None:
+
+        with pytest.raises(ValueError):
+            OutputOptions(resources="embedded")
+
+    def test_when_given_invalid_quantize_raises_ValueError(self) -> None:
+
+        for quantize in (1, 2 ** 31):
+            with pytest.raises(ValueError):
+                OutputOptions(quantize=quantize)
+
+    def test_encoded_when_coordinates_moved_or_encoded(self) -> None:
+
+        assert not OutputOptions(resources="cdn").encoded
+        assert OutputOptions(sidecar=True).encoded
+        assert OutputOptions(quantize=10 ** 5).encoded
+        assert OutputOptions(topology=True).encoded
+
+    def test_streamable_only_with_plain_sidecar(self) -> None:
+
+        assert OutputOptions(sidecar=True).streamable
+        assert not OutputOptions(quantize=10 ** 5).streamable
+        assert not OutputOptions(sidecar=True, quantize=10 ** 5).streamable
+        assert not OutputOptions(sidecar=True, topology=True).streamable
@@ -2,9 +2,12 @@ from .common import PLOT_TITLE, STYLE_KWARGS
 from bokeh.tile_providers import Vendors
 from pytest_mock import MockFixture
 from unittest.mock import MagicMock
+from wktplot.mappers.crs import get_crs_mapper
 from wktplot.mappers.standard import StandardMapper
 from wktplot.plots.osm import OpenStreetMapsPlot
 
+import pytest
+
 
 class TestConstructor:
 
@@ -15,7 +18,7 @@ class TestConstructor:
         mock_bokeh: MagicMock,
     ) -> None:
 
-        mock_get_provider = mocker.patch("wktplot.plots.osm.get_provider")
+        mock_get_provider = mocker.patch("bokeh.tile_providers.get_provider")
 
         plot = OpenStreetMapsPlot(title=PLOT_TITLE, save_dir=temp_dir, **STYLE_KWARGS)
 
@@ -34,3 +37,32 @@ class TestConstructor:
 
         plot = OpenStreetMapsPlot(disable_mercator=True)
         assert plot.mapper == StandardMapper
+
+    def test_when_crs_set_mapper_transforms_to_web_mercator(self) -> None:
+
+        plot = OpenStreetMapsPlot(crs=4326)
+        assert plot.mapper is get_crs_mapper("EPSG:4326", "EPSG:3857")
+
+    def test_when_crs_combined_with_disable_mercator_raises_ValueError(self) -> None:
+
+        with pytest.raises(ValueError):
+            OpenStreetMapsPlot(crs=4326, disable_mercator=True)
+
+    def test_when_given_mapper_keeps_it(self) -> None:
+
+        mapper = get_crs_mapper("EPSG:3857", "EPSG:3857")
+        plot = OpenStreetMapsPlot(mapper=mapper)
+        assert plot.mapper is mapper
+
+    def test_when_crs_is_wgs84_shapes_drawn_as_without_crs(self) -> None:
+
+        shapes = ["POINT (10 50)", "LINESTRING (10 50, 20 -30)"]
+        plots = [OpenStreetMapsPlot(crs=4326), OpenStreetMapsPlot()]
+        for plot in plots:
+            plot.add_shapes(shapes)
+
+        with_crs, without_crs = (plot.batches[next(iter(plot.batches))].get_buffers() for plot in plots)
+        assert with_crs.point_x == pytest.approx(without_crs.point_x)
+        assert with_crs.point_y == pytest.approx(without_crs.point_y)
+        assert with_crs.line_x == pytest.approx(without_crs.line_x)
+        assert with_crs.line_y == pytest.approx(without_crs.line_y)
@@ -0,0 +1,33 @@
+from bokeh.plotting import figure
+from pathlib import Path
+from wktplot.plots.renderer import HTMLRenderer
+
+
+class TestHTMLRenderer:
+
+    def test_shared_renderer_per_resources_mode(self) -> None:
+
+        assert HTMLRenderer.get("cdn") is HTMLRenderer.get("cdn")
+        assert HTMLRenderer.get("cdn") is not HTMLRenderer.get("inline")
+
+    def test_figure_saved_without_output_file(self, temp_dir: str) -> None:
+
+        fig = figure()
+        fig.scatter([1, 2], [3, 4])
+        path = HTMLRenderer("cdn").save(fig, Path(temp_dir) / "plot.html", "Renderer Plot")
+
+        html = path.read_text()
+        assert "<title>Renderer Plot</title>" in html
+        assert "cdn.bokeh.org" in html
+
+    def test_bundle_reused_for_same_kinds_of_models(self, mocker) -> None:
+
+        renderer = HTMLRenderer("cdn")
+        spy = mocker.spy(renderer, "_get_bundle")
+        for _ in range(2):
+            fig = figure()
+            fig.scatter([1], [2])
+            renderer.render(fig, "Plot")
+
+        assert spy.call_count == 2
+        assert len(renderer._bundles) == 1
@@ -1,9 +1,21 @@
 from .common import PLOT_TITLE, PLOT_FILE, STYLE_KWARGS
+from bokeh.document import Document
+from bokeh.plotting import figure
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock
+from wktplot.common.cache import GeometryCache
+from wktplot.common.stats import PipelineStats
+from wktplot.mappers.crs import get_crs_mapper
+from wktplot.mappers.sidecar import get_sidecar_template
+from wktplot.plots.options import OutputOptions
 from wktplot.plots.standard import WKTPlot
 
+import asyncio
+import json
+import numpy as np
 import pytest
+import re
 
 
 class TestConstructor:
@@ -43,6 +55,31 @@ class TestConstructor:
             with pytest.raises(ValueError):
                 WKTPlot(title=title)
 
+    def test_when_given_mapper_uses_it(self) -> None:
+
+        mapper = get_crs_mapper("EPSG:3857", "EPSG:4326")
+        assert WKTPlot(mapper=mapper).mapper is mapper
+
+    def test_when_tile_grid_combined_with_lod_levels_raises_ValueError(self) -> None:
+
+        with pytest.raises(ValueError):
+            WKTPlot(tile_grid=8, lod_levels=2)
+
+    def test_batch_only_options_imply_batched(self, temp_dir: str) -> None:
+
+        assert not WKTPlot(save_dir=temp_dir).batched
+        for kwargs in (
+            {"simplify": 1.0},
+            {"lod_levels": 2},
+            {"tile_grid": 8},
+            {"cache": GeometryCache()},
+            {"store_dir": temp_dir, "render_mode": "raster"},
+        ):
+            plot = WKTPlot(save_dir=temp_dir, **kwargs)
+            plot.add_shape("POINT (1 2)")
+
+            assert plot.batched and len(plot.batches) == 1
+
     def test_when_given_valid_arguments_figure_class_var_set(
         self,
         mock_bokeh: MagicMock,
@@ -51,11 +88,8 @@ class TestConstructor:
     ) -> None:
 
         expected_path = Path(temp_dir) / PLOT_FILE
-        mock_bokeh.output_file.assert_called_once_with(
-            filename=expected_path,
-            title=PLOT_TITLE,
-            mode="inline",
-        )
+        assert mock_plot.filename == expected_path
+        mock_bokeh.output_file.assert_not_called()
         mock_bokeh.figure.assert_called_once_with(
             title=PLOT_TITLE,
             x_axis_label="Longitude",
@@ -70,7 +104,14 @@ class TestSave:
     def test_verify_plot_saved(self, mock_bokeh: MagicMock, mock_plot: WKTPlot) -> None:
 
         mock_plot.save()
-        mock_bokeh.save.assert_called_once_with(mock_plot.figure)
+        mock_plot.renderer.save.assert_called_once_with(mock_plot.figure, mock_plot.filename, PLOT_TITLE)
+        mock_bokeh.save.assert_not_called()
+
+    def test_when_given_path_plot_saved_to_path(self, mock_plot: WKTPlot, temp_dir: str) -> None:
+
+        path = Path(temp_dir) / "other.html"
+        mock_plot.save(path)
+        mock_plot.renderer.save.assert_called_once_with(mock_plot.figure, path, PLOT_TITLE)
 
 
 class TestShow:
@@ -78,6 +119,11 @@ class TestShow:
     def test_verify_plot_shown(self, mock_bokeh: MagicMock, mock_plot: WKTPlot) -> None:
 
         mock_plot.show()
+        mock_bokeh.output_file.assert_called_once_with(
+            filename=mock_plot.filename,
+            title=PLOT_TITLE,
+            mode="inline",
+        )
         mock_bokeh.show.assert_called_once_with(mock_plot.figure)
 
 
@@ -92,3 +138,469 @@ class TestAddShape:
             mock_shape,
             **STYLE_KWARGS,
         )
+
+
+class TestBatchedAddShape:
+
+    def test_shapes_with_same_style_share_batch(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, batched=True)
+        plot.add_shape("POINT (1 2)", **STYLE_KWARGS)
+        plot.add_shape("POINT (3 4)", **STYLE_KWARGS)
+        plot.add_shape("POINT (5 6)", color="red")
+
+        assert len(plot.batches) == 2
+        plot.figure.circle.assert_not_called()
+
+    def test_batches_flushed_on_save(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, batched=True)
+        plot.add_shape("MULTIPOINT (1 2, 3 4)", **STYLE_KWARGS)
+        plot.save()
+
+        plot.figure.scatter.assert_called_once()
+        plot.renderer.save.assert_called_once_with(plot.figure, plot.filename, PLOT_TITLE)
+
+
+class TestAddShapes:
+
+    def test_verify_mapper_called_with_batch(self, mock_plot: WKTPlot) -> None:
+
+        shapes = ["POINT (1 2)", "POINT (3 4)"]
+        mock_plot.add_shapes(shapes, **STYLE_KWARGS)
+
+        batch = mock_plot._get_batch(STYLE_KWARGS)
+        assert batch.style_kwargs == STYLE_KWARGS
+        mock_plot.mapper.add_shapes_to_batch.assert_called_once_with(batch, shapes, {})
+
+    def test_per_shape_styles_passed_as_columns(self, mock_plot: WKTPlot) -> None:
+
+        shapes = ["POINT (1 2)", "POINT (3 4)"]
+        mock_plot.add_shapes(shapes, data={"width": [1, 2]}, color=["red", "blue"], line_width="width")
+
+        batch, = mock_plot.batches.values()
+        assert batch.columns == ("color", "line_width")
+        assert batch.style_kwargs == {}
+        columns = mock_plot.mapper.add_shapes_to_batch.call_args.args[2]
+        assert columns["color"].tolist() == ["red", "blue"]
+        assert columns["line_width"].tolist() == [1, 2]
+
+    def test_shared_list_valued_styles_drawn_on_every_shape(self, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, batched=True)
+        shapes = ["LINESTRING (0 0, 1 1)", "LINESTRING (1 1, 2 0)", "LINESTRING (2 0, 3 1)"]
+        plot.add_shapes(shapes, line_dash=[4, 4], line_color=[50, 205, 50, 0.5], line_width=[1, 2, 3])
+        plot._flush_batches()
+
+        batch, = plot.batches.values()
+        assert batch.columns == ("line_width",)
+        assert batch.style_kwargs == {"line_dash": [4, 4], "line_color": [50, 205, 50, 0.5]}
+        assert batch.renderers["multi_line"].glyph.line_dash == {"value": [4, 4]}
+        assert batch.sources["multi_line"].data["line_width"].tolist() == [1, 2, 3]
+
+
+class TestAddFile:
+
+    def test_verify_each_chunk_added(self, mock_plot: WKTPlot, temp_dir: str) -> None:
+
+        path = Path(temp_dir) / "shapes.csv"
+        path.write_text("width,geometry\n1,POINT (1 2)\n2,POINT (3 4)\n3,POINT (5 6)\n")
+        mock_plot.add_file(path, format="csv", chunk_size=2, line_width="width", color="red")
+
+        assert mock_plot.mapper.add_shapes_to_batch.call_count == 2
+        batch, geoms, columns = mock_plot.mapper.add_shapes_to_batch.call_args.args
+        assert batch.columns == ("line_width",)
+        assert len(geoms) == 1
+        assert columns["line_width"].tolist() == [3.0]
+
+
+class TestParallelIngest:
+
+    def test_add_shapes_with_workers_matches_serial(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        shapes = [f"LINESTRING ({i} 0, {i} 1)" for i in range(10)]
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        plot.add_shapes(shapes, workers=2, color=["red"] * 10)
+
+        batch, = plot.batches.values()
+        buffers = batch.get_buffers()
+        assert buffers.num_shapes == 10
+        assert buffers.line_x.tolist() == [i for i in range(10) for _ in range(2)]
+        assert len(batch.get_columns()["color"]) == 10
+
+    def test_add_file_with_workers_adds_each_chunk(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        path = Path(temp_dir) / "shapes.wkt"
+        path.write_text("\n".join(f"POINT ({i} {i})" for i in range(5)))
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        plot.add_file(path, chunk_size=2, workers=2)
+
+        batch, = plot.batches.values()
+        assert batch.get_buffers().point_x.tolist() == [0, 1, 2, 3, 4]
+
+
+class TestSimplify:
+
+    def test_batches_simplified_on_save(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, simplify=1.0)
+        plot.figure.width = plot.figure.height = 100
+        plot.add_shapes(["LINESTRING (0 0, 50 0.01, 100 0, 100 100)"])
+        plot.save()
+
+        assert plot.simplify_stats == {
+            "tolerance": 1.0,
+            "vertices_in": 4,
+            "vertices_out": 3,
+            "vertices_dropped": 1,
+        }
+        batch, = plot.batches.values()
+        assert batch.sources["multi_line"].data["xs"][0].tolist() == [0, 100, 100]
+
+    def test_lod_levels_builds_pyramid(self, mocker, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        mock_flush_pyramid = mocker.patch("wktplot.plots.standard.flush_pyramid")
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, lod_levels=3)
+        plot.figure.width = plot.figure.height = 100
+        plot.add_shapes(["LINESTRING (0 0, 50 0.01, 100 0, 100 100)"])
+        plot.save()
+
+        _, batch, levels, tolerances, pixel_tolerance = mock_flush_pyramid.call_args.args
+        assert len(levels) == 3
+        assert tolerances == [0.5, 0.125, 0.03125]
+        assert pixel_tolerance == 0.5
+
+
+class TestTileGrid:
+
+    def test_batches_tiled_on_save(self, mocker, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        mock_flush_tiles = mocker.patch("wktplot.plots.standard.flush_tiles")
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, tile_grid=8)
+        plot.add_shapes(["POINT (0 0)", "POINT (10 20)"])
+        plot.save()
+
+        _, batch, buffers, bounds, grid_size = mock_flush_tiles.call_args.args
+        assert buffers.num_shapes == 2
+        assert bounds == (0, 0, 10, 20)
+        assert grid_size == 8
+
+
+class TestRasterRenderMode:
+
+    def test_when_given_invalid_render_mode_raises_ValueError(self) -> None:
+
+        with pytest.raises(ValueError):
+            WKTPlot(render_mode="webgl")
+
+        with pytest.raises(ValueError):
+            WKTPlot(render_mode="raster", simplify=0.5)
+
+    def test_shapes_drawn_as_one_image_on_save(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, render_mode="raster")
+        plot.figure.width, plot.figure.height = 40, 30
+        plot.add_shape("POINT (0 0)", **STYLE_KWARGS)
+        plot.add_shapes(["LINESTRING (0 0, 10 20)", "POLYGON ((0 0, 10 0, 10 20, 0 0))"])
+        plot.save()
+        plot.save()
+
+        plot.figure.image_rgba.assert_called_once()
+        data = plot.raster_source.data
+        assert data["image"][0].shape == (30, 40)
+        assert (data["x"], data["y"], data["dw"], data["dh"]) == ([0], [0], [10], [20])
+
+    def test_store_backed_shapes_drawn_chunk_by_chunk(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        images = []
+        for store_dir in (None, temp_dir):
+            plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, render_mode="raster", store_dir=store_dir)
+            plot.figure.width, plot.figure.height = 40, 30
+            plot.add_shapes(["LINESTRING (0 0, 10 20)"])
+            plot.add_shapes(["POLYGON ((0 0, 10 0, 10 20, 0 0))", "POINT (0 0)"])
+            plot.save()
+            images.append(plot.raster_source.data["image"][0])
+
+        batch, = plot.batches.values()
+        assert batch.store.num_chunks == 2
+        assert np.array_equal(*images)
+
+
+class TestGeometryCache:
+
+    def test_batched_shapes_read_through_cache(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        cache = GeometryCache()
+        for _ in range(2):
+            plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, cache=cache)
+            plot.add_shapes(["POINT (1 2)", "LINESTRING (0 0, 1 1)"], **STYLE_KWARGS)
+            plot.save()
+
+        assert (cache.hits, cache.misses) == (2, 2)
+        batch, = plot.batches.values()
+        assert batch.get_buffers().point_x.tolist() == [1]
+
+
+class TestSidecar:
+
+    def test_resources_passed_to_renderer(self, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, output=OutputOptions(resources="cdn"))
+
+        assert plot.renderer.resources.mode == "cdn"
+
+    def test_coordinates_saved_to_sidecar_and_restored(self, mocker, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, output=OutputOptions(sidecar=True))
+        plot.figure = figure()
+        plot.add_shapes(["POINT (1 2)", "LINESTRING (0 0, 1 1)"], **STYLE_KWARGS)
+
+        saved_data = []
+        plot.renderer.save.side_effect = lambda fig, path, title, template: saved_data.extend(
+            dict(batch.sources["scatter"].data) for batch in plot.batches.values()
+        )
+        plot.save()
+
+        assert plot.renderer.save.call_args.args[3] is not None
+        assert saved_data == [{"x": [], "y": []}]
+        assert (Path(temp_dir) / PLOT_FILE).with_suffix(".bin").is_file()
+        batch, = plot.batches.values()
+        assert batch.sources["scatter"].data["x"].tolist() == [1]
+
+    def test_quantized_coordinates_embedded_in_page(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, output=OutputOptions(quantize=10 ** 4))
+        plot.figure = figure()
+        plot.add_shapes(["POINT (1 2)", "LINESTRING (0 0, 1 1)"], **STYLE_KWARGS)
+
+        plot.save()
+
+        template = plot.renderer.save.call_args.args[3]
+        assert template is not None
+        assert not (Path(temp_dir) / PLOT_FILE).with_suffix(".bin").exists()
+
+    def test_topology_passed_to_externalize_sources(self, mocker, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        externalize = mocker.patch("wktplot.plots.standard.externalize_sources", return_value=({"sources": []}, {}))
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, output=OutputOptions(topology=True))
+        plot.add_shapes(["POLYGON ((0 0, 1 0, 1 1, 0 0))"], **STYLE_KWARGS)
+
+        plot.save()
+
+        assert externalize.call_args.args[1:] == (None, None, True)
+
+    def test_raster_image_saved_in_page_with_sidecar(self, mocker, temp_dir: str) -> None:
+
+        get_template = mocker.patch("wktplot.plots.standard.get_sidecar_template", wraps=get_sidecar_template)
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, render_mode="raster", output=OutputOptions(sidecar=True))
+        plot.figure.width, plot.figure.height = 40, 30
+        plot.add_shapes(["LINESTRING (0 0, 10 20)", "POINT (2 3)"])
+
+        path = plot.save()
+
+        manifest, = get_template.call_args.args
+        assert manifest["sources"] == []
+
+        docs_json = re.search(r'<script type="application/json" id="[^"]*">(.*?)</script>', path.read_text(), re.S)
+        references = next(iter(json.loads(docs_json.group(1)).values()))["roots"]["references"]
+        data = next(model for model in references if model["id"] == plot.raster_source.id)["attributes"]["data"]
+        assert (data["x"], data["y"], data["dw"], data["dh"]) == ([0], [0], [10], [20])
+        assert data["image"][0]["shape"] == [30, 40]
+
+    def test_when_given_invalid_store_dir_raises_OSError(self, temp_dir: str) -> None:
+
+        with pytest.raises(OSError):
+            WKTPlot(save_dir=temp_dir, store_dir=Path(temp_dir) / "missing")
+
+    def test_when_store_dir_given_for_output_not_saved_chunk_by_chunk_raises_ValueError(self, temp_dir: str) -> None:
+
+        sidecar = OutputOptions(sidecar=True)
+        for kwargs in (
+            {},
+            {"output": sidecar, "simplify": 1.0},
+            {"output": sidecar, "lod_levels": 2},
+            {"output": OutputOptions(sidecar=True, quantize=10 ** 5)},
+            {"output": OutputOptions(sidecar=True, topology=True)},
+        ):
+            with pytest.raises(ValueError):
+                WKTPlot(save_dir=temp_dir, store_dir=temp_dir, **kwargs)
+
+        plot = WKTPlot(save_dir=temp_dir, store_dir=temp_dir, output=sidecar)
+        with pytest.raises(ValueError):
+            plot.bind(Document())
+
+    def test_store_backed_coordinates_streamed_to_sidecar(self, mocker, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        get_template = mocker.patch("wktplot.plots.standard.get_sidecar_template")
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, output=OutputOptions(sidecar=True), store_dir=temp_dir)
+        plot.figure = figure()
+        plot.add_shapes(["POINT (1 2)"], **STYLE_KWARGS)
+        plot.add_shapes(["POINT (3 4)", "LINESTRING (0 0, 1 1)"], **STYLE_KWARGS)
+
+        plot.save()
+
+        batch, = plot.batches.values()
+        assert batch.sources["scatter"].data == {"x": [], "y": []}
+        assert len(batch.sources["multi_line"].data["xs"]) == 0
+        manifest, = get_template.call_args.args
+        entries = {entry["id"]: entry for entry in manifest["sources"]}
+        assert entries[batch.sources["scatter"].id]["columns"]["x"]["array"][1] == 2
+        assert entries[batch.sources["multi_line"].id]["columns"]["xs"]["counts"][0][1] == 1
+        assert (Path(temp_dir) / PLOT_FILE).with_suffix(".bin").stat().st_size > 0
+
+
+class TestAsync:
+
+    def test_add_shapes_async_adds_chunks_in_order(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        async def feed():
+            for i in range(5):
+                yield f"POINT ({i} {i})"
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        asyncio.run(plot.add_shapes_async(feed(), chunk_size=2, color=["red", "blue", "red", "blue", "red"]))
+
+        batch, = plot.batches.values()
+        assert batch.get_buffers().point_x.tolist() == [0, 1, 2, 3, 4]
+        assert batch.get_columns()["color"].tolist() == ["red", "blue", "red", "blue", "red"]
+
+    def test_add_shapes_async_applies_backpressure(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        pulled = []
+
+        async def feed():
+            for i in range(10):
+                pulled.append(i)
+                yield f"POINT ({i} {i})"
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        batch = plot._get_batch(STYLE_KWARGS)
+        added = []
+        batch.add_buffers = lambda buffers, columns: added.append(len(pulled))
+        asyncio.run(plot.add_shapes_async(feed(), chunk_size=2, max_pending=2, **STYLE_KWARGS))
+
+        # The first chunk is only added once a second one is pulled, and no further chunk is pulled before that.
+        assert added == [4, 6, 8, 10, 10]
+
+    def test_concurrent_add_shapes_async_share_cache(self, mock_bokeh: MagicMock, temp_dir: str) -> None:
+
+        cache = GeometryCache()
+        plots = [WKTPlot(title=f"{PLOT_TITLE} {i}", save_dir=temp_dir, cache=cache) for i in range(3)]
+        shapes = [[f"POINT ({i} {j})" for j in range(4)] for i in range(3)]
+
+        async def add_all() -> None:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                await asyncio.gather(*(
+                    plot.add_shapes_async(plot_shapes, chunk_size=2, executor=executor, **STYLE_KWARGS)
+                    for plot, plot_shapes in zip(plots, shapes)
+                ))
+
+        asyncio.run(add_all())
+        assert (cache.hits, cache.misses, len(cache)) == (0, 12, 12)
+
+        asyncio.run(add_all())
+        assert (cache.hits, cache.misses, len(cache)) == (12, 12, 12)
+
+        for i, plot in enumerate(plots):
+            batch, = plot.batches.values()
+            buffers = batch.get_buffers()
+            assert buffers.point_x.tolist() == [i] * 8
+            assert buffers.point_y.tolist() == [0, 1, 2, 3] * 2
+
+    def test_save_async_saves_plot(self, mock_plot: WKTPlot) -> None:
+
+        path = asyncio.run(mock_plot.save_async())
+
+        mock_plot.renderer.save.assert_called_once_with(mock_plot.figure, mock_plot.filename, PLOT_TITLE)
+        assert path == mock_plot.renderer.save.return_value
+
+
+class TestPipelineStats:
+
+    def test_batched_stages_timed_and_counted(self, temp_dir: str) -> None:
+
+        stats = PipelineStats()
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, stats=stats)
+        plot.add_shapes(["POINT (1 2)", "POLYGON ((0 0, 1 0, 1 1, 0 0), (0.1 0.1, 0.2 0.1, 0.1 0.2, 0.1 0.1))"])
+        path = plot.save()
+
+        result = stats.as_dict()
+        assert all(result["calls"][stage] == 1 for stage in ("parse", "extract", "project", "glyph", "save"))
+        assert result["counts"] == {
+            "shapes": 2,
+            "parts": 2,
+            "vertices": 7,
+            "renderers": 2,
+            "output_bytes": path.stat().st_size,
+        }
+
+    def test_single_shapes_stages_timed_and_counted(self, temp_dir: str) -> None:
+
+        stats = PipelineStats()
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, stats=stats)
+        plot.add_shape("MULTIPOINT (1 2, 3 4)")
+        plot.add_shape("LINESTRING (0 0, 1 1)")
+        plot.add_shape("GEOMETRYCOLLECTION (POINT (1 2), MULTILINESTRING ((0 0, 1 1), (2 2, 3 3)), POINT EMPTY)")
+
+        assert stats.calls["parse"] == stats.calls["glyph"] == 3
+        assert stats.counts["shapes"] == 3
+        assert stats.counts["parts"] == 6
+        assert stats.counts["vertices"] == 9
+
+    def test_cached_shapes_timed_as_extract(self, temp_dir: str) -> None:
+
+        stats = PipelineStats()
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, cache=GeometryCache(), stats=stats)
+        plot.add_shapes(["POINT (1 2)"])
+
+        assert stats.calls["extract"] == 1
+        assert stats.calls["parse"] == 0
+        assert stats.counts["shapes"] == 1
+
+
+class TestLive:
+
+    def test_shapes_added_before_and_after_bind_streamed(self, temp_dir: str) -> None:
+
+        document = Document()
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        plot.add_shapes(["POINT (1 2)"], color="red")
+        plot.bind(document, rollover=2)
+        plot.add_shape("POINT (3 4)", color="red")
+        plot.add_shapes(["POINT (5 6)", "LINESTRING (0 0, 1 1)"], color="red")
+        plot.live.flush()
+
+        batch, = plot.batches.values()
+        assert plot.figure in document.roots
+        assert batch.sources["scatter"].data["x"].tolist() == [3, 5]
+        assert len(batch.sources["multi_line"].data["xs"]) == 1
+        assert len(plot.figure.renderers) == 2
+
+    def test_patch_shapes_replaces_rows(self, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        plot.add_shapes(["POINT (1 2)", "POINT (3 4)"], color=["red", "blue"])
+        plot.bind(Document())
+        plot.patch_shapes([1], ["POINT (7 8)"], color=["green"])
+        plot.live.flush()
+
+        batch, = plot.batches.values()
+        assert batch.sources["scatter"].data["x"].tolist() == [1, 7]
+        assert batch.sources["scatter"].data["color"].tolist() == ["red", "green"]
+
+    def test_when_patching_unbound_plot_or_multipart_rows_raises_ValueError(self, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir)
+        plot.add_shapes(["POINT (1 2)"])
+        with pytest.raises(ValueError):
+            plot.patch_shapes([0], ["POINT (7 8)"])
+
+        plot.bind(Document())
+        with pytest.raises(ValueError):
+            plot.patch_shapes([0], ["MULTIPOINT (7 8, 9 9)"])
+
+    def test_when_binding_raster_plot_raises_ValueError(self, temp_dir: str) -> None:
+
+        plot = WKTPlot(title=PLOT_TITLE, save_dir=temp_dir, render_mode="raster")
+        with pytest.raises(ValueError):
+            plot.bind(Document())
@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+
+import pytest
+import wktplot
+
+
+# Modules `import wktplot` must not load, so start-up stays fast without timing it here. The start-up time itself
+# is tracked by the `ImportSuite` benchmark.
+HEAVY_MODULES = ("asyncio", "bokeh", "concurrent", "jinja2", "numpy", "pandas", "pyproj", "shapely")
+
+
+def run_fresh(code: str) -> dict:
+    """ Run the given code in a new interpreter, so imports aren't already cached, and load the JSON it prints.
+    """
+
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def get_loaded_modules(statement: str) -> list:
+    return run_fresh(
+        f"import json, sys; {statement}; "
+        f"print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    )
+
+
+def get_imported_modules(statement: str) -> list:
+    return run_fresh(
+        f"import json, sys; loaded = set(sys.modules); {statement}; "
+        f"print(json.dumps(sorted(set(sys.modules) - loaded)))"
+    )
+
+
+class TestLazyImports:
+
+    def test_import_loads_only_package_root_and_light_modules(self) -> None:
+
+        imported = get_imported_modules("import wktplot")
+
+        # Submodules are only imported on first access, e.g. of `wktplot.WKTPlot`.
+        assert [name for name in imported if name.split(".")[0] == "wktplot"] == ["wktplot"]
+        assert [name for name in imported if name.split(".")[0] in HEAVY_MODULES] == []
+
+    def test_import_does_not_load_heavy_modules(self) -> None:
+
+        loaded = get_loaded_modules("import wktplot")
+
+        assert not set(HEAVY_MODULES) & set(loaded)
+
+    def test_coordinate_extraction_does_not_load_bokeh(self) -> None:
+
+        loaded = get_loaded_modules("import wktplot.common.parallel, wktplot.mappers.osm")
+
+        assert "bokeh" not in loaded
+
+    def test_WKTPlot_loaded_on_first_access(self) -> None:
+
+        from wktplot.plots.standard import WKTPlot
+
+        assert wktplot.WKTPlot is WKTPlot
+        assert "WKTPlot" in dir(wktplot)
+
+    def test_when_given_unknown_attribute_raises_AttributeError(self) -> None:
+
+        with pytest.raises(AttributeError):
+            wktplot.NotAPlot